@@ -0,0 +1 @@
+"""Benchmarks do pyvidesk (não fazem parte da suíte de testes)."""
@@ -0,0 +1,37 @@
+"""
+Benchmarks (asv) de ponta a ponta com o servidor falso do Movidesk (pyvidesk.fake), no
+próprio processo: medem o custo da biblioteca (e do servidor falso), sem a rede.
+"""
+
+from pyvidesk.fake import FakeMovidesk
+from pyvidesk.tickets import Tickets
+
+from .fixtures import make_tickets
+
+
+class FakeServerQuery:
+    """Obtenção de uma página de 1000 tickets, com e sem ações expandidas"""
+
+    params = [0, 5]
+    param_names = ["actions"]
+
+    def setup(self, actions):
+        fake = FakeMovidesk(
+            tickets=make_tickets(1000, actions=actions), persons=0, services=0
+        )
+        tickets = Tickets(token="token", transport=fake)
+        self.query = tickets.query.top(1000)
+        if actions:
+            self.query = self.query.expand("actions")
+
+    def time_all(self, actions):
+        # pylint: disable=unused-argument
+        self.query.all()
+
+    def time_stream(self, actions):
+        # pylint: disable=unused-argument
+        list(self.query.stream())
+
+    def time_records(self, actions):
+        # pylint: disable=unused-argument
+        list(self.query.records())
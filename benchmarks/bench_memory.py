@@ -0,0 +1,28 @@
+"""
+Benchmarks (asv) de memória: as mesmas medidas de benchmarks/memory.py, acompanhadas
+entre os commits (bytes por item).
+"""
+
+from . import memory
+
+
+class MemoryFootprint:
+    """Memória de 1000 tickets com 5 ações expandidas cada"""
+
+    unit = "bytes"
+    timeout = 300
+
+    def setup_cache(self):
+        return memory.run(tickets=1000, actions=5)
+
+    def track_model_bytes(self, results):
+        return results["model_bytes"]
+
+    def track_complex_model_bytes(self, results):
+        return results["complex_model_bytes"]
+
+    def track_all_peak_bytes(self, results):
+        return results["all_peak_bytes"]
+
+    def track_stream_peak_bytes(self, results):
+        return results["stream_peak_bytes"]
@@ -0,0 +1,89 @@
+"""
+Benchmarks (asv) da construção de modelos e registros, da desserialização das propriedades
+e da serialização das alterações (PATCH).
+"""
+
+from datetime import date
+
+from pyvidesk.codec import get_codec
+from pyvidesk.model import Model
+from pyvidesk.records import create_record
+from pyvidesk.tickets import Tickets
+
+from .fixtures import make_tickets
+
+
+class ModelConstruction:
+    """Criação de 1000 modelos (ou registros) de tickets, com e sem ações expandidas"""
+
+    params = [0, 5]
+    param_names = ["actions"]
+
+    def setup(self, actions):
+        self.tickets = Tickets(token="token")
+        self.payloads = make_tickets(1000, actions=actions)
+        Model(self.tickets, **self.payloads[0])  # aquece os caches das classes
+
+    def time_models(self, actions):
+        # pylint: disable=unused-argument
+        [Model(self.tickets, **data) for data in self.payloads]
+
+    def time_records(self, actions):
+        # pylint: disable=unused-argument
+        [create_record(self.tickets, data) for data in self.payloads]
+
+
+class Deserialization:
+    """Decodificação de uma página de tickets e desserialização de datas"""
+
+    def setup(self):
+        tickets = Tickets(token="token")
+        self.datetime_property = tickets.get_properties()["createdDate"]
+        payloads = make_tickets(10000)
+        self.dates = [data["createdDate"] for data in payloads]
+        self.codec = get_codec()
+        self.page = self.codec.dumps(make_tickets(1000, actions=5))
+
+    def time_datetime_deserialize(self):
+        deserialize = self.datetime_property.deserialize
+        for value in self.dates:
+            deserialize(value)
+
+    def time_decode_page(self):
+        self.codec.loads(self.page)
+
+
+class ChangeSerialization:
+    """Serialização das alterações de 100 tickets com 10 ações cada"""
+
+    # cada chamada consome as alterações, então os modelos são recriados a cada medida
+    number = 1
+    repeat = 20
+
+    def setup(self):
+        tickets = Tickets(token="token")
+        self.models = [Model(tickets, **data) for data in make_tickets(100, actions=10)]
+        for model in self.models:
+            model.subject = "Novo assunto"
+            model.tags = ["tag1", "tag3"]
+            model.actions[0].description = "Nova descrição"
+            model.actions[-1].timeAppointments[0].date = date(2021, 1, 1)
+
+    def time_serialize_all_changes(self):
+        for model in self.models:
+            model._serialize_all_changes()
+
+
+class EntitySchema:
+    """Obtenção das propriedades da entidade, com e sem o cache da classe"""
+
+    def setup(self):
+        self.tickets = Tickets(token="token")
+        self.tickets.get_properties()
+
+    def time_get_properties(self):
+        self.tickets.get_properties()
+
+    def time_get_properties_uncached(self):
+        del Tickets._schema
+        self.tickets.get_properties()
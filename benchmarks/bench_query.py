@@ -0,0 +1,62 @@
+"""
+Benchmarks (asv) da construção de consultas e das suas URLs (Query.as_url()).
+"""
+
+from datetime import date
+
+from pyvidesk.lambdas import Any
+from pyvidesk.query import Q
+from pyvidesk.tickets import Tickets
+
+
+class QueryBuilding:
+    """Encadeamento dos métodos de Query e montagem da URL"""
+
+    def setup(self):
+        self.tickets = Tickets(token="token")
+        self.properties = self.tickets.get_properties()
+        self.query = self._build()
+        self.query.as_url()
+
+    def _build(self):
+        properties = self.properties
+        return (
+            self.tickets.query.select("id", "subject", "createdDate")
+            .filter(properties["createdDate"] >= date(2020, 1, 1))
+            .filter(
+                Q(properties["status"] == "Resolvido")
+                | Q(properties["urgency"] == "Alta")
+            )
+            .filter(Any(properties["clients"].id == "1234"))
+            .expand(
+                properties["clients"],
+                select=properties["clients"].id,
+                inner=properties["clients"].organization,
+            )
+            .order_by(properties["id"].desc())
+            .skip(1000)
+            .top(500)
+        )
+
+    def time_builder_chain(self):
+        self._build()
+
+    def time_as_url(self):
+        self._build().as_url()
+
+    def time_as_url_cached(self):
+        self.query.as_url()
+
+
+class LongFilter:
+    """URL de uma consulta com 200 IDs numa disjunção ('or')"""
+
+    def setup(self):
+        self.tickets = Tickets(token="token")
+        self.id_property = self.tickets.get_properties()["id"]
+
+    def time_as_url(self):
+        ids_filter = Q(self.id_property == 0)
+        for ticket_id in range(1, 200):
+            ids_filter |= Q(self.id_property == ticket_id)
+        self.tickets.query.select("id").filter(ids_filter).max_url_length(None).as_url()
@@ -0,0 +1,142 @@
+"""
+Módulo que gera respostas sintéticas da API do Movidesk para os benchmarks.
+
+Os dados são determinísticos (dependem apenas do id), assim diferentes execuções
+medem exatamente o mesmo trabalho.
+"""
+
+from datetime import datetime, timedelta
+
+_BASE_DATE = datetime(2020, 1, 1, 12, 0, 0)
+
+
+def make_person(person_id):
+    return {
+        "id": str(person_id),
+        "businessName": f"Pessoa {person_id}",
+        "email": f"pessoa{person_id}@example.com",
+        "phone": f"5511{person_id:08d}",
+        "personType": 1,
+        "profileType": 1 + person_id % 3,
+    }
+
+
+def make_time_appointment(appointment_id):
+    return {
+        "id": appointment_id,
+        "activity": "Desenvolvimento",
+        "date": _isoformat(_BASE_DATE + timedelta(minutes=appointment_id % 100000)),
+        "periodStart": "08:00:00",
+        "periodEnd": "09:30:00",
+        "workTime": "01:30:00",
+        "workTypeName": "Normal",
+        "createdBy": make_person(appointment_id % 50),
+        "createdByTeam": {"id": 1, "name": "Suporte"},
+    }
+
+
+def make_action(action_id, time_appointments=2):
+    return {
+        "id": action_id,
+        "type": 2,
+        "origin": 1,
+        "description": f"Descrição da ação {action_id}. " * 5,
+        "htmlDescription": f"<p>Descrição da ação {action_id}.</p>" * 5,
+        "status": "Em atendimento",
+        "justification": None,
+        "createdDate": _isoformat(_BASE_DATE + timedelta(minutes=action_id % 100000)),
+        "createdBy": make_person(action_id % 50),
+        "isDeleted": False,
+        "tags": ["tag1", "tag2"],
+        "timeAppointments": [
+            make_time_appointment(action_id * 100 + i) for i in range(time_appointments)
+        ],
+        "expenses": [],
+        "attachments": [],
+    }
+
+
+def make_ticket(ticket_id, actions=0):
+    """
+    Funcao que gera um ticket como retornado pela API.
+
+    Args:
+        ticket_id (int): O id do ticket.
+        actions (int): O número de ações expandidas no ticket. Se 0, o ticket
+            não contém a propriedade 'actions'.
+
+    Returns:
+        (dict): O JSON do ticket.
+    """
+    created = _BASE_DATE + timedelta(hours=ticket_id)
+    ticket = {
+        "id": ticket_id,
+        "protocol": None,
+        "type": 2,
+        "subject": f"Assunto do ticket {ticket_id}",
+        "category": "Dúvida",
+        "urgency": "Média",
+        "status": "Resolvido",
+        "baseStatus": "Resolved",
+        "justification": None,
+        "origin": 3,
+        "createdDate": _isoformat(created),
+        "isDeleted": False,
+        "originEmailAccount": None,
+        "owner": make_person(ticket_id % 50),
+        "ownerTeam": "Suporte",
+        "createdBy": make_person(ticket_id % 70),
+        "serviceFull": ["Sistema", "Módulo"],
+        "serviceFirstLevelId": 190853,
+        "serviceFirstLevel": "Sistema",
+        "serviceSecondLevel": "Módulo",
+        "serviceThirdLevel": None,
+        "contactForm": None,
+        "tags": ["tag1"],
+        "cc": None,
+        "resolvedIn": _isoformat(created + timedelta(days=1)),
+        "closedIn": None,
+        "canceledIn": None,
+        "actionCount": actions,
+        "lifeTimeWorkingTime": 540,
+        "stoppedTime": 0,
+        "stoppedTimeWorkingTime": 0,
+        "resolvedInFirstCall": False,
+        "chatWidget": None,
+        "chatGroup": None,
+        "chatTalkTime": 0,
+        "chatWaitingTime": 0,
+        "sequence": None,
+        "slaAgreement": None,
+        "slaAgreementRule": None,
+        "slaSolutionTime": None,
+        "slaResponseTime": None,
+        "slaSolutionChangedByUser": False,
+        "slaSolutionChangedBy": None,
+        "slaSolutionDate": None,
+        "slaSolutionDateIsPaused": False,
+        "slaResponseDate": None,
+        "slaRealResponseDate": None,
+        "jiraIssueKey": None,
+        "redmineIssueId": None,
+        "movideskTicketNumber": None,
+        "linkedToIntegratedTicketNumber": None,
+        "reopenedIn": None,
+        "lastActionDate": _isoformat(created + timedelta(hours=2)),
+        "lastUpdate": _isoformat(created + timedelta(days=1)),
+        "clients": [make_person(ticket_id % 90 + 100)],
+    }
+    if actions:
+        ticket["actions"] = [make_action(ticket_id * 1000 + i) for i in range(actions)]
+    return ticket
+
+
+def make_tickets(count, actions=0, start=1):
+    return [
+        make_ticket(ticket_id, actions=actions)
+        for ticket_id in range(start, start + count)
+    ]
+
+
+def _isoformat(value):
+    return value.strftime("%Y-%m-%dT%H:%M:%S")
@@ -0,0 +1,48 @@
+"""
+Benchmark dos codecs JSON (pyvidesk.codec): decodificação de uma página de tickets com
+ações expandidas e codificação de um corpo de PATCH.
+
+Uso:
+
+    python -m benchmarks.json_codec --tickets 1000 --actions 5 --repeat 5
+"""
+
+import argparse
+import timeit
+
+from pyvidesk.codec import get_codec
+
+from .fixtures import make_tickets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=1000)
+    parser.add_argument("--actions", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tickets = make_tickets(args.tickets, actions=args.actions)
+    raw = get_codec("json").dumps(tickets)
+    print(f"{args.tickets} tickets, {args.actions} ações por ticket, {len(raw)} bytes")
+
+    for name in ("json", "ujson", "orjson"):
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            print(f"{name:8} não instalado")
+            continue
+        decode = min(
+            timeit.repeat(lambda: codec.loads(raw), number=1, repeat=args.repeat)
+        )
+        encode = min(
+            timeit.repeat(lambda: codec.dumps(tickets), number=1, repeat=args.repeat)
+        )
+        print(
+            f"{name:8} decodificação: {decode * 1000:8.1f} ms"
+            f"  codificação: {encode * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark da decodificação de uma página de tickets: inteira (json.loads) ou em
+"streaming" (pyvidesk.jsonstream), consumindo cada ticket e descartando-o em seguida.
+
+Uso:
+
+    python -m benchmarks.json_streaming --tickets 1000 --actions 5
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from pyvidesk.jsonstream import iter_array
+
+from .fixtures import make_tickets
+
+CHUNK_SIZE = 64 * 1024
+
+
+def decode_all(raw):
+    for ticket in json.loads(raw):
+        yield ticket
+
+
+def decode_stream(raw):
+    chunks = (raw[i : i + CHUNK_SIZE] for i in range(0, len(raw), CHUNK_SIZE))
+    yield from iter_array(chunks)
+
+
+def measure(decode, raw):
+    """
+    Returns:
+        (tuple): Tempo até o primeiro ticket, tempo total (segundos) e pico de memória
+            (bytes) da decodificação.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    for _ in decode(raw):
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first, total, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=1000)
+    parser.add_argument("--actions", type=int, default=5)
+    args = parser.parse_args()
+
+    raw = json.dumps(make_tickets(args.tickets, actions=args.actions)).encode()
+    print(f"{args.tickets} tickets, {args.actions} ações por ticket, {len(raw)} bytes")
+    for name, decode in (("json.loads", decode_all), ("streaming", decode_stream)):
+        first, total, peak = measure(decode, raw)
+        print(
+            f"{name:12} primeiro ticket: {first * 1000:8.2f} ms"
+            f"  total: {total * 1000:8.1f} ms  pico: {peak / 2 ** 20:6.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
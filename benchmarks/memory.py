@@ -0,0 +1,210 @@
+"""
+Benchmark de memória (tracemalloc) para grandes volumes de respostas, com orçamentos.
+
+Mede:
+    model_bytes: bytes retidos por Model de ticket (sem ações, com os seus 3 modelos
+        aninhados), sem o JSON cru.
+    complex_model_bytes: bytes retidos por modelo aninhado (_ComplexPropertyModel),
+        medidos nas ações expandidas dos tickets: cada ação tem 8 modelos aninhados (a
+        ação, o seu 'createdBy' e 2 'timeAppointments', cada um com 'createdBy' e
+        'createdByTeam').
+    all_peak_bytes: pico de memória por ticket de query.all() (todos os modelos retidos).
+    stream_peak_bytes: pico de memória por ticket ao iterar query.stream() sem reter os
+        modelos.
+
+As respostas das consultas são geradas pelo servidor falso (pyvidesk.fake), gravadas
+num cassete (pyvidesk.cassette) e reproduzidas durante a medida: o pico inclui o corpo
+das respostas, como numa requisição real, mas não a memória do servidor falso. Todos os
+valores são por item, para que os orçamentos não dependam do número de tickets.
+
+Os orçamentos (bytes) ficam em benchmarks/memory_budgets.json e podem ser trocados por
+outro arquivo (--budgets) ou sobrescritos (--budget nome=bytes). O comando termina com
+erro se alguma medida passar do orçamento, para ser usado na integração contínua.
+
+Uso:
+
+    python -m benchmarks.memory
+    python -m benchmarks.memory --tickets 5000 --actions 10
+    python -m benchmarks.memory --budget all_peak_bytes=200000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from pyvidesk.cassette import Cassette
+from pyvidesk.fake import FakeMovidesk
+from pyvidesk.model import Model, _ComplexPropertyModel
+from pyvidesk.tickets import Tickets
+
+from .fixtures import make_tickets
+from .model_memory import measure
+
+BUDGETS_PATH = os.path.join(os.path.dirname(__file__), "memory_budgets.json")
+
+
+def measure_models(tickets=1000, actions=5):
+    """
+    Funcao que mede os bytes retidos por Model de ticket e por modelo aninhado.
+
+    Os modelos aninhados são a diferença entre os tickets com e sem ações, dividida pela
+    diferença do número de modelos aninhados, contados nos próprios modelos
+    (count_nested_models()).
+
+    Returns:
+        (dict): model_bytes e complex_model_bytes.
+    """
+    entity = Tickets(token="token")
+    Model(entity, **make_tickets(1, actions=1)[0])  # aquece os caches das classes
+
+    payloads = make_tickets(tickets)
+    model_bytes, _ = measure(
+        lambda: [Model(entity, **data) for data in payloads], tickets
+    )
+    base_nested = count_nested_models([Model(entity, **data) for data in payloads])
+    payloads = make_tickets(tickets, actions=actions)
+    with_actions_bytes, _ = measure(
+        lambda: [Model(entity, **data) for data in payloads], tickets
+    )
+    # os tickets sem ações já têm modelos aninhados ('owner', 'clients'...)
+    nested = (
+        count_nested_models([Model(entity, **data) for data in payloads]) - base_nested
+    )
+    return {
+        "model_bytes": model_bytes,
+        "complex_model_bytes": (with_actions_bytes - model_bytes)
+        * tickets
+        / max(nested, 1),
+    }
+
+
+def count_nested_models(models):
+    """
+    Funcao que conta os modelos aninhados (_ComplexPropertyModel) de uma lista de
+    modelos, em todos os níveis.
+
+    Returns:
+        (int): O número de modelos aninhados.
+    """
+    count = 0
+    pending = list(models)
+    while pending:
+        model = pending.pop()
+        for value in model._state.values():  # pylint: disable=protected-access
+            for item in value if isinstance(value, list) else (value,):
+                if isinstance(item, _ComplexPropertyModel):
+                    count += 1
+                    pending.append(item)
+    return count
+
+
+def measure_queries(tickets=1000, actions=5):
+    """
+    Funcao que mede o pico de memória por ticket de query.all() e da iteração de
+    query.stream(), com as ações expandidas.
+
+    Returns:
+        (dict): all_peak_bytes e stream_peak_bytes.
+    """
+    fake = FakeMovidesk(
+        tickets=make_tickets(tickets, actions=actions), persons=0, services=0
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "memory.jsonl.gz")
+        with Cassette(path, mode="record", transport=fake) as cassette:
+            Tickets(token="token", transport=cassette).query.top(tickets).expand(
+                "actions"
+            ).all()
+        cassette = Cassette(path)
+
+    entity = Tickets(token="token", transport=cassette)
+    query = entity.query.top(tickets).expand("actions")
+    query.all()  # aquece os caches das classes
+
+    def consume():
+        for _ in query.stream():
+            pass
+
+    _, all_peak = measure(query.all, tickets)
+    _, stream_peak = measure(consume, tickets)
+    return {
+        "all_peak_bytes": all_peak / tickets,
+        "stream_peak_bytes": stream_peak / tickets,
+    }
+
+
+def run(tickets=1000, actions=5):
+    """
+    Funcao que executa todas as medidas.
+
+    Returns:
+        (dict): Os bytes de cada medida.
+    """
+    results = measure_models(tickets, actions)
+    results.update(measure_queries(tickets, actions))
+    return results
+
+
+def load_budgets(path=BUDGETS_PATH, overrides=None):
+    """
+    Funcao que lê os orçamentos de um arquivo JSON ({"nome": bytes, ...}).
+
+    Args:
+        path (str): O caminho do arquivo.
+        overrides (list): Orçamentos no formato "nome=bytes", que sobrescrevem os do
+            arquivo.
+
+    Returns:
+        (dict): O orçamento (bytes) de cada medida.
+    """
+    with open(path, encoding="utf-8") as file:
+        budgets = json.load(file)
+    for override in overrides or []:
+        name, _, value = override.partition("=")
+        budgets[name] = float(value)
+    return budgets
+
+
+def check_budgets(results, budgets):
+    """
+    Funcao que compara as medidas com os orçamentos.
+
+    Returns:
+        (list): As mensagens das medidas que passaram do orçamento.
+    """
+    return [
+        f"{name}: {results[name]:.0f} bytes > orçamento de {budget:.0f} bytes"
+        for name, budget in budgets.items()
+        if name in results and results[name] > budget
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--tickets", type=int, default=1000)
+    parser.add_argument("--actions", type=int, default=5)
+    parser.add_argument("--budgets", default=BUDGETS_PATH)
+    parser.add_argument("--budget", action="append", metavar="NOME=BYTES")
+    args = parser.parse_args()
+
+    budgets = load_budgets(args.budgets, args.budget)
+    results = run(args.tickets, args.actions)
+
+    print(f"{args.tickets} tickets, {args.actions} ações por ticket")
+    for name, value in results.items():
+        budget = budgets.get(name)
+        limit = f" (orçamento {budget:.0f})" if budget is not None else ""
+        print(f"{name + ':':22} {value:10.0f} bytes{limit}")
+
+    failures = check_budgets(results, budgets)
+    for failure in failures:
+        print(f"ACIMA DO ORÇAMENTO: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
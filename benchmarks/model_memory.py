@@ -0,0 +1,72 @@
+"""
+Benchmark de memória (tracemalloc) da construção de modelos e registros de tickets.
+
+A memória do Model não inclui o JSON cru que ele referencia (atributo _properties);
+a do registro é tudo o que ele ocupa, pois o JSON pode ser descartado.
+
+Uso:
+
+    python -m benchmarks.model_memory --tickets 10000 --actions 0
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from pyvidesk.model import Model
+from pyvidesk.records import create_record
+from pyvidesk.tickets import Tickets
+
+from .fixtures import make_tickets
+
+
+def measure(build, count):
+    """
+    Funcao que mede a memória retida pelos objetos criados por 'build'.
+
+    Returns:
+        (tuple): Bytes retidos por item e pico de memória (bytes) durante a construção.
+    """
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current / count, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=10000)
+    parser.add_argument("--actions", type=int, default=0)
+    args = parser.parse_args()
+
+    tickets = Tickets(token="")
+    Model(tickets, **make_tickets(1, actions=args.actions)[0])  # aquece os caches
+
+    payload_bytes, _ = measure(
+        lambda: make_tickets(args.tickets, actions=args.actions), args.tickets
+    )
+    payloads = make_tickets(args.tickets, actions=args.actions)
+    model_bytes, model_peak = measure(
+        lambda: [Model(tickets, **data) for data in payloads], args.tickets
+    )
+
+    record_bytes, _ = measure(
+        lambda: [create_record(tickets, data) for data in payloads], args.tickets
+    )
+
+    print(f"{args.tickets} tickets, {args.actions} ações por ticket")
+    print(f"JSON (dict) por ticket:   {payload_bytes:10.0f} bytes")
+    print(f"Model por ticket:         {model_bytes:10.0f} bytes")
+    print(f"Registro por ticket:      {record_bytes:10.0f} bytes (sem o JSON cru)")
+    print(
+        f"Model, {args.tickets} tickets: {model_bytes * args.tickets / 2 ** 20:8.1f} MiB "
+        f"(pico {model_peak / 2 ** 20:.1f} MiB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
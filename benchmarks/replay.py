@@ -0,0 +1,75 @@
+"""
+Benchmark de ponta a ponta que executa testes da suíte (por padrão, tests.test_model e
+tests.test_entity_getattr, os que fazem requisições à API) reproduzindo um cassete
+(pyvidesk.cassette), sem acesso à rede. Como as respostas são sempre as mesmas, variações
+no tempo medem apenas o custo da biblioteca. Módulos que apenas montam URLs (como
+tests.test_query) não gravam requisições e não medem nada.
+
+Para gravar o cassete (precisa do TOKEN e de acesso à API):
+
+    PYVIDESK_CASSETTE=tests.jsonl.gz PYVIDESK_CASSETTE_MODE=record \\
+        python -m pytest tests/test_model.py tests/test_entity_getattr.py
+
+Uso:
+
+    python -m benchmarks.replay tests.jsonl.gz --repeat 5
+    python -m benchmarks.replay tests.jsonl.gz tests.test_model --speed 1.0
+"""
+
+import argparse
+import io
+import os
+import time
+import unittest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("cassette")
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        default=["tests.test_model", "tests.test_entity_getattr"],
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--speed", type=float, default=None, help="1.0, para a duração original"
+    )
+    args = parser.parse_args()
+
+    os.environ["PYVIDESK_CASSETTE"] = args.cassette
+    os.environ["PYVIDESK_CASSETTE_MODE"] = "replay"
+    # o cassete é criado (e usado como transporte padrão) ao importar tests.config
+    from tests.config import CASSETTE  # pylint: disable=import-outside-toplevel
+
+    if len(CASSETTE) == 0:
+        raise SystemExit(
+            f"O cassete {args.cassette} não tem requisições: grave-o com testes que "
+            "acessam a API."
+        )
+
+    CASSETTE.speed = args.speed
+    times = []
+    for _ in range(args.repeat):
+        CASSETTE.rewind()
+        suite = unittest.defaultTestLoader.loadTestsFromNames(args.modules)
+        runner = unittest.TextTestRunner(stream=io.StringIO(), verbosity=0)
+        start = time.perf_counter()
+        result = runner.run(suite)
+        times.append(time.perf_counter() - start)
+
+    best = min(times)
+    print(
+        f"{result.testsRun} testes, {len(CASSETTE)} requisições gravadas, "
+        f"{len(result.failures) + len(result.errors)} falhas"
+    )
+    print(
+        f"melhor: {best * 1000:.1f} ms  pior: {max(times) * 1000:.1f} ms  "
+        f"({len(CASSETTE) / best:.0f} requisições/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
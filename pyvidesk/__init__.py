@@ -1,8 +1,11 @@
 """
 pyvidesk module
 """
+
 from .persons import Persons
+from .profiling import profile
 from .services import Services
+from .session import Session
 from .tickets import Tickets
 
 __version__ = "0.0.1"
@@ -11,23 +14,82 @@ __version__ = "0.0.1"
 class Pyvidesk:
     """Classe que permite chamar qualquer entity já desenvolvida nesta biblioteca"""
 
-    def __init__(self, token):
+    def __init__(
+        self,
+        token,
+        session=None,
+        transport=None,
+        hooks=None,
+        circuit_breaker=None,
+        timeout=None,
+        rate_limiter=None,
+    ):
+        """
+        Args:
+            token (str): O token que permitirá o acesso aos dados do Movidesk.
+            session (pyvidesk.session.Session): Sessão opcional compartilhada por todas
+                as entidades. Com ela, cada (entidade, id) corresponde a uma única
+                instância de Model.
+            transport (): Transporte opcional das requisições de todas as entidades
+                (veja pyvidesk.transport). Com pyvidesk.fake.FakeMovidesk, as
+                requisições são respondidas localmente, sem acesso à rede.
+            hooks (pyvidesk.hooks.Hooks): Eventos opcionais das requisições de todas as
+                entidades (veja pyvidesk.hooks e pyvidesk.metrics).
+            circuit_breaker (pyvidesk.circuit.CircuitBreaker): Disjuntor opcional
+                compartilhado por todas as entidades, com um circuito para cada uma.
+            timeout (tuple): Tempos máximos opcionais (segundos) de conexão e de cada
+                leitura das requisições. Por padrão, os definidos em
+                pyvidesk.config.TIMEOUT.
+            rate_limiter (pyvidesk.ratelimit.RateLimiter): Limitador opcional das
+                requisições do token, compartilhado por todas as entidades. Com
+                pyvidesk.ratelimit.SQLiteRateLimiter, a cota é dividida entre processos.
+        """
         self.token = token
+        self.session = session
+        self.transport = transport
+        self.hooks = hooks
+        self.circuit_breaker = circuit_breaker
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
 
     @property
     def tickets(self):
         """Retorna um objeto de tickets do pyvidesk"""
-        return Tickets(token=self.token)
+        return Tickets(
+            token=self.token,
+            session=self.session,
+            transport=self.transport,
+            hooks=self.hooks,
+            circuit_breaker=self.circuit_breaker,
+            timeout=self.timeout,
+            rate_limiter=self.rate_limiter,
+        )
 
     @property
     def persons(self):
         """Retorna um objeto de persons do pyvidesk"""
-        return Persons(token=self.token)
+        return Persons(
+            token=self.token,
+            session=self.session,
+            transport=self.transport,
+            hooks=self.hooks,
+            circuit_breaker=self.circuit_breaker,
+            timeout=self.timeout,
+            rate_limiter=self.rate_limiter,
+        )
 
     @property
     def services(self):
         """Retorna um objeto de services do pyvidesk"""
-        return Services(token=self.token)
+        return Services(
+            token=self.token,
+            session=self.session,
+            transport=self.transport,
+            hooks=self.hooks,
+            circuit_breaker=self.circuit_breaker,
+            timeout=self.timeout,
+            rate_limiter=self.rate_limiter,
+        )
 
     # TODO: questions and answers
     # @property
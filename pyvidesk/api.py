@@ -5,13 +5,35 @@ A classe API não deve ser utilizada diretamente, e sim apenas por meio das clas
 Query (requisição GET), Model (requisição PATCH) e EmptyModel (requisição POST).
 """
 
+from contextlib import closing
 from functools import wraps
 from re import findall
+from threading import Lock
+import time
 
 import requests
 from requests.exceptions import RequestException
-
-from .exceptions import PyvideskRequestsError, PyvideskBadResponseError
+from urllib3.util import make_headers
+
+from . import config
+from .codec import get_codec
+from .exceptions import (
+    PyvideskBadResponseError,
+    PyvideskCircuitOpenError,
+    PyvideskDeadlineError,
+    PyvideskRateLimitError,
+    PyvideskRequestsError,
+)
+from .hooks import Hooks
+from .jsonstream import iter_array
+from .transport import RequestsTransport, get_token, redact_url
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+# todas as compressões que o urllib3 sabe descomprimir (gzip e deflate; brotli e zstd,
+# se as bibliotecas estiverem instaladas)
+_GET_HEADERS = {
+    "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"]
+}
 
 
 def catch_requests_errors(func):
@@ -68,44 +90,205 @@ def handle_response_error(func):
                     f"Message: {message}",
                 ]
             )
-            raise PyvideskBadResponseError(msg) from HTTPError
+            raise PyvideskBadResponseError(
+                msg, status_code=response.status_code
+            ) from HTTPError
 
     return wrapper
 
 
+class TransferStats:
+    """
+    Classe que acumula os bytes transferidos pelas requisições: comprimidos (como
+    recebidos do servidor) e descomprimidos (após gzip/deflate/brotli).
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def __repr__(self):
+        return (
+            f"<TransferStats: {self.requests} requests, "
+            f"{self.compressed_bytes} compressed bytes, "
+            f"{self.uncompressed_bytes} uncompressed bytes>"
+        )
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def reset(self):
+        """Metodo que zera as estatísticas"""
+        with self._lock:
+            self.requests = 0
+            self.compressed_bytes = 0
+            self.uncompressed_bytes = 0
+            self.last = None
+
+    def record(self, compressed_bytes, uncompressed_bytes, encoding=None):
+        """
+        Metodo que registra os bytes de uma requisição.
+
+        Args:
+            compressed_bytes (int): Os bytes recebidos do servidor.
+            uncompressed_bytes (int): Os bytes após a descompressão.
+            encoding (str): A compressão usada pelo servidor (Content-Encoding), se houver.
+        """
+        with self._lock:
+            self.requests += 1
+            self.compressed_bytes += compressed_bytes
+            self.uncompressed_bytes += uncompressed_bytes
+            self.last = {
+                "compressed_bytes": compressed_bytes,
+                "uncompressed_bytes": uncompressed_bytes,
+                "encoding": encoding,
+            }
+
+    @property
+    def saved_bytes(self):
+        return self.uncompressed_bytes - self.compressed_bytes
+
+    @property
+    def ratio(self):
+        """A razão entre os bytes comprimidos e descomprimidos (1.0, sem compressão)"""
+        if not self.uncompressed_bytes:
+            return 1.0
+        return self.compressed_bytes / self.uncompressed_bytes
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "compressed_bytes": self.compressed_bytes,
+            "uncompressed_bytes": self.uncompressed_bytes,
+            "saved_bytes": self.saved_bytes,
+            "ratio": self.ratio,
+        }
+
+
 class Api:
     """Classe que faz as requisições ao servidor"""
 
-    def __init__(self, base_url):
+    def __init__(
+        self,
+        base_url,
+        codec=None,
+        transport=None,
+        hooks=None,
+        circuit_breaker=None,
+        timeout=None,
+        rate_limiter=None,
+    ):
         """
         Args:
             base_url (str): A URL base que usaremos em todas as consultas
+            codec (pyvidesk.codec.JsonCodec): O codec JSON das requisições. Por padrão,
+                o definido em pyvidesk.config.JSON_CODEC.
+            transport (): O transporte que envia as requisições (veja
+                pyvidesk.transport). Por padrão, o definido em pyvidesk.config.TRANSPORT
+                ou, se não houver, pyvidesk.transport.RequestsTransport.
+            hooks (pyvidesk.hooks.Hooks): Os eventos das requisições. Por padrão, os
+                definidos em pyvidesk.config.HOOKS ou, se não houver, novos eventos.
+            circuit_breaker (pyvidesk.circuit.CircuitBreaker): O disjuntor das
+                requisições, compartilhado entre as entidades. Por padrão, o definido em
+                pyvidesk.config.CIRCUIT_BREAKER (nenhum, se None).
+            timeout (tuple): Os tempos máximos (segundos) de conexão e de cada leitura
+                das requisições. Por padrão, os definidos em pyvidesk.config.TIMEOUT.
+                (None, None), para esperar indefinidamente.
+            rate_limiter (pyvidesk.ratelimit.RateLimiter): O limitador das requisições
+                por token, compartilhado entre as entidades (ou processos). Por padrão,
+                o definido em pyvidesk.config.RATE_LIMITER (nenhum, se None).
         """
         self.base_url = base_url
-
-    def get(self, options):
+        self.entity_name = base_url.split("?")[0].rstrip("/").rsplit("/", 1)[-1]
+        self.codec = codec or get_codec()
+        if transport is None:
+            transport = config.TRANSPORT
+        self.transport = transport if transport is not None else RequestsTransport()
+        if hooks is None:
+            hooks = config.HOOKS
+        self.hooks = hooks if hooks is not None else Hooks()
+        if circuit_breaker is None:
+            circuit_breaker = config.CIRCUIT_BREAKER
+        self.circuit_breaker = circuit_breaker
+        self.timeout = config.TIMEOUT if timeout is None else timeout
+        if rate_limiter is None:
+            rate_limiter = config.RATE_LIMITER
+        self.rate_limiter = rate_limiter
+        # False, se o servidor recusar o parâmetro '$count' (veja Query.count())
+        self.supports_count = True
+        self.transfer_stats = TransferStats()
+
+    def get(self, options, deadline=None):
         """
         Método que obtem a resposta de uma requisição GET ao servidor, se esta for bem sucedida.
 
         Args:
             options (dict): Dicionário com informações que serão passadas ao servidor na requisição
                 GET.
+            deadline (float): O prazo opcional da requisição (instante de time.monotonic()).
 
         Returns:
             (dict): Dicionário com informações da resposta.
+
+        Raises:
+            PyvideskDeadlineError: Se o prazo terminar antes da resposta.
         """
-        response = self._get(options=options)
+        response = self._get(options=options, deadline=deadline)
+        self._record_transfer(response, len(response.content))
         if response.status_code == requests.codes.no_content:
             return
-        return response.json()
+        return self.codec.loads(response.content)
+
+    def iter_get(self, options, deadline=None):
+        """
+        Método que obtem a resposta de uma requisição GET ao servidor em modo "streaming":
+        o corpo é lido aos poucos e cada elemento da lista da resposta é entregue assim
+        que é decodificado, sem esperar a resposta inteira.
+
+        Args:
+            options (dict): Dicionário com informações que serão passadas ao servidor na requisição
+                GET.
+            deadline (float): O prazo opcional da leitura (instante de time.monotonic()).
+
+        yields:
+            (dict): Dicionário com informações de cada elemento da resposta.
+
+        Raises:
+            PyvideskDeadlineError: Se o prazo terminar antes do fim da resposta.
+        """
+        response = self._get(options=options, stream=True, deadline=deadline)
+        sizes = [0]
+        try:
+            with closing(response):
+                if response.status_code == requests.codes.no_content:
+                    return
+                # a descompressão também é feita aos poucos, pedaço a pedaço
+                chunks = response.iter_content(chunk_size=config.STREAM_CHUNK_SIZE)
+                for data in iter_array(_iter_content(chunks, sizes, deadline)):
+                    if data is not None:
+                        yield data
+        finally:
+            self._record_transfer(response, sizes[0])
 
     @handle_response_error
     @catch_requests_errors
-    def _get(self, options):
+    def _get(self, options, stream=False, deadline=None):
         """
         Método que realiza a requisição GET de fato.
         """
-        return requests.get(url=self._get_url(options=options))
+        return self._request(
+            "GET",
+            self._get_url(options=options),
+            headers=_GET_HEADERS,
+            stream=stream,
+            deadline=deadline,
+        )
 
     def patch(self, changes, model_id):
         """
@@ -119,7 +302,8 @@ class Api:
             (dict): Dicionário com informações da resposta.
         """
         response = self._patch(changes=changes, model_id=model_id)
-        return response.json()
+        self._record_transfer(response, len(response.content))
+        return self.codec.loads(response.content)
 
     @handle_response_error
     @catch_requests_errors
@@ -127,7 +311,12 @@ class Api:
         """
         Método que realiza a requisição PATCH de fato.
         """
-        return requests.patch(self._get_url(options={"id": model_id}), json=changes)
+        return self._request(
+            "PATCH",
+            self._get_url(options={"id": model_id}),
+            data=self.codec.dumps(changes),
+            headers=_JSON_HEADERS,
+        )
 
     def post(self, infos):
         """
@@ -141,7 +330,8 @@ class Api:
             (int ou str): O ID do modelo criado no servidor.
         """
         response = self._post(infos=infos)
-        return response.json()["id"]
+        self._record_transfer(response, len(response.content))
+        return self.codec.loads(response.content)["id"]
 
     @handle_response_error
     @catch_requests_errors
@@ -149,7 +339,9 @@ class Api:
         """
         Método que realiza a requisição POST de fato.
         """
-        return requests.post(self.base_url, json=infos)
+        return self._request(
+            "POST", self.base_url, data=self.codec.dumps(infos), headers=_JSON_HEADERS
+        )
 
     def delete(self, model_id):
         """
@@ -168,7 +360,201 @@ class Api:
         """
         Método que realiza a requisição DELETE de fato.
         """
-        return requests.delete(self._get_url(options={"id": model_id}))
+        return self._request("DELETE", self._get_url(options={"id": model_id}))
+
+    def _request(
+        self, method, url, data=None, headers=None, stream=False, deadline=None
+    ):
+        """
+        Método que envia uma requisição pelo transporte, repetindo-a após erros
+        temporários (veja pyvidesk.config.RETRIES), e emite os eventos das requisições
+        (veja pyvidesk.hooks). Com um limitador (rate_limiter), cada tentativa espera a
+        sua vez na cota do token logo antes do envio (depois do disjuntor, para que um
+        circuito aberto falhe sem consumir a cota). Com um prazo (deadline), os tempos máximos de conexão
+        e leitura são limitados ao tempo que resta.
+
+        Returns:
+            (requests.Response): A resposta do servidor, bem sucedida ou não.
+
+        Raises:
+            RequestException: Se houver um erro de conexão na última tentativa.
+            PyvideskCircuitOpenError: Se o disjuntor da entidade estiver aberto.
+            PyvideskDeadlineError: Se o prazo terminar.
+            PyvideskRateLimitError: Se o limitador não conseguir reservar a vaga.
+        """
+        infos = {"entity": self.entity_name, "method": method, "url": redact_url(url)}
+        breaker = self.circuit_breaker
+        attempt = 0
+        while True:
+            timeout = _get_timeout(self.timeout, deadline)
+            if timeout is None:
+                error = PyvideskDeadlineError()
+                self.hooks.emit("on_error", attempt=attempt, error=error, **infos)
+                raise error
+            probe = None
+            if breaker is not None:
+                try:
+                    probe = breaker.before_request(self.entity_name)
+                except PyvideskCircuitOpenError as error:
+                    self.hooks.emit("on_error", attempt=attempt, error=error, **infos)
+                    raise
+            try:
+                response, error, latency = self._send(
+                    method,
+                    url,
+                    attempt,
+                    infos,
+                    data=data,
+                    headers=headers,
+                    stream=stream,
+                    timeout=timeout,
+                    deadline=deadline,
+                )
+            except BaseException as error:
+                # a tentativa foi interrompida antes do resultado (pelo limitador, por um
+                # evento, pela gravação, Ctrl+C...): a vaga de teste do disjuntor é
+                # devolvida
+                if breaker is not None:
+                    breaker.release(self.entity_name, probe)
+                if isinstance(error, (PyvideskDeadlineError, PyvideskRateLimitError)):
+                    self.hooks.emit("on_error", attempt=attempt, error=error, **infos)
+                raise
+            if breaker is not None:
+                failed = response is None or (
+                    response.status_code >= 500
+                    or response.status_code == requests.codes.too_many_requests
+                )
+                breaker.record(self.entity_name, failed, latency, probe=probe)
+
+            if error is not None:
+                if deadline is not None and time.monotonic() >= deadline:
+                    self.hooks.emit(
+                        "on_error",
+                        attempt=attempt,
+                        latency=latency,
+                        error=error,
+                        **infos,
+                    )
+                    raise PyvideskDeadlineError() from error
+                if not self._should_retry(method, attempt):
+                    self.hooks.emit(
+                        "on_error",
+                        attempt=attempt,
+                        latency=latency,
+                        error=error,
+                        **infos,
+                    )
+                    raise error
+                delay = _retry_delay(attempt)
+                self.hooks.emit(
+                    "on_retry",
+                    attempt=attempt,
+                    latency=latency,
+                    error=error,
+                    delay=delay,
+                    **infos,
+                )
+            else:
+                status = response.status_code
+                if self.hooks:
+                    self.hooks.emit(
+                        "after_response",
+                        attempt=attempt,
+                        status=status,
+                        latency=latency,
+                        bytes=_response_size(response, stream),
+                        **infos,
+                    )
+                if status < 400:
+                    return response
+                if status not in config.RETRY_STATUSES or not self._should_retry(
+                    method, attempt, status
+                ):
+                    self.hooks.emit(
+                        "on_error",
+                        attempt=attempt,
+                        status=status,
+                        latency=latency,
+                        **infos,
+                    )
+                    return response
+                delay = _retry_delay(attempt, response.headers.get("retry-after"))
+                response.close()
+                self.hooks.emit(
+                    "on_retry",
+                    attempt=attempt,
+                    status=status,
+                    latency=latency,
+                    delay=delay,
+                    **infos,
+                )
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                error = PyvideskDeadlineError()
+                self.hooks.emit("on_error", attempt=attempt, error=error, **infos)
+                raise error
+            time.sleep(delay)
+            attempt += 1
+
+    def _send(self, method, url, attempt, infos, deadline=None, **kwargs):
+        """
+        Método que envia uma tentativa de requisição pelo transporte, após esperar a vez
+        na cota do token (veja pyvidesk.ratelimit), se houver um limitador.
+
+        Returns:
+            (tuple): A resposta (None, após um erro de conexão), o erro de conexão (None,
+                se houver resposta) e a latência (segundos).
+
+        Raises:
+            PyvideskDeadlineError: Se o prazo terminar antes da vez na cota.
+            PyvideskRateLimitError: Se o limitador não conseguir reservar a vaga.
+        """
+        limiter = self.rate_limiter
+        if limiter is not None:
+            if limiter.acquire(get_token(self.base_url), deadline) is None:
+                raise PyvideskDeadlineError()
+            if deadline is not None:
+                # o tempo que resta, após a espera
+                kwargs["timeout"] = _get_timeout(self.timeout, deadline)
+                if kwargs["timeout"] is None:
+                    raise PyvideskDeadlineError()
+        self.hooks.emit("before_request", attempt=attempt, **infos)
+        start = time.perf_counter()
+        try:
+            response = self.transport.request(method, url, **kwargs)
+        except RequestException as error:
+            return None, error, time.perf_counter() - start
+        return response, None, time.perf_counter() - start
+
+    @staticmethod
+    def _should_retry(method, attempt, status=None):
+        """
+        Método que checa se uma requisição que falhou deve ser repetida. POST e PATCH
+        não são idempotentes (um PATCH com ações sem 'id' acrescenta as ações) e são
+        repetidos apenas após o código 429, quando o servidor não os processou.
+        """
+        if attempt >= config.RETRIES:
+            return False
+        return (
+            method not in ("POST", "PATCH")
+            or status == requests.codes.too_many_requests
+        )
+
+    def _record_transfer(self, response, uncompressed_bytes):
+        """
+        Método que registra os bytes transferidos numa resposta. Os bytes comprimidos
+        são os lidos da conexão (antes da descompressão).
+        """
+        try:
+            compressed_bytes = response.raw.tell()
+        except AttributeError:
+            compressed_bytes = None
+        if not isinstance(compressed_bytes, int):
+            compressed_bytes = uncompressed_bytes
+        self.transfer_stats.record(
+            compressed_bytes,
+            uncompressed_bytes,
+            encoding=response.headers.get("content-encoding"),
+        )
 
     def _get_url(self, options):
         """
@@ -190,6 +576,69 @@ class Api:
         return self.base_url + _format_options(options)
 
 
+def _retry_delay(attempt, retry_after=None):
+    """
+    Funcao que obtem a espera (segundos) antes de repetir uma requisição: a do cabeçalho
+    Retry-After (em segundos), se houver, ou um recuo exponencial.
+    """
+    try:
+        delay = float(retry_after)
+    except (TypeError, ValueError):
+        delay = config.RETRY_BACKOFF * 2**attempt
+    return max(0.0, min(delay, config.RETRY_MAX_DELAY))
+
+
+def _response_size(response, stream):
+    """
+    Funcao que obtem os bytes do corpo de uma resposta sem lê-lo, em modo "streaming"
+    (pelo cabeçalho Content-Length, se houver).
+    """
+    if not stream:
+        return len(response.content)
+    try:
+        return int(response.headers["content-length"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _get_timeout(timeout, deadline):
+    """
+    Funcao que obtem os tempos máximos de conexão e leitura de uma tentativa, limitados
+    ao tempo que resta até o prazo, se houver.
+
+    Returns:
+        (tuple): Os tempos máximos (segundos). None, se o prazo já terminou.
+    """
+    if deadline is None:
+        return timeout
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return None
+    if not isinstance(timeout, tuple):
+        timeout = (timeout, timeout)
+    return tuple(
+        remaining if value is None else min(value, remaining) for value in timeout
+    )
+
+
+def _iter_content(chunks, sizes, deadline=None):
+    """
+    Funcao que converte os erros da leitura de uma resposta em "streaming" para
+    PyvideskRequestsError (ou PyvideskDeadlineError, após o prazo) e soma os bytes
+    (descomprimidos) lidos em sizes[0].
+    """
+    try:
+        for chunk in chunks:
+            sizes[0] += len(chunk)
+            yield chunk
+            if deadline is not None and time.monotonic() >= deadline:
+                raise PyvideskDeadlineError()
+    except RequestException as error:
+        if deadline is not None and time.monotonic() >= deadline:
+            raise PyvideskDeadlineError() from error
+        raise PyvideskRequestsError(str(error)) from error
+
+
 def _format_options(options):
     """
     Funcao que obtem as opcoes formatadas da URL.
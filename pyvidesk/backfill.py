@@ -0,0 +1,333 @@
+"""
+Módulo que executa cargas históricas (backfills) em vários processos.
+
+A carga é dividida em partes (shards), por faixa de IDs ou por janela de datas. Cada parte
+é obtida por um processo, que grava as respostas num destino (sink) à medida que as
+páginas chegam. As partes concluídas são registradas num manifesto
+(pyvidesk.partition.Checkpoint), e uma nova execução processa apenas as partes que faltam.
+
+Exemplo de uso:
+
+>>> from datetime import date, timedelta
+>>> from pyvidesk.backfill import Backfill, JsonLinesSink, shards_by_window
+>>> from pyvidesk.partition import Checkpoint
+>>> from pyvidesk.tickets import Tickets
+
+>>> tickets = Tickets(token="my_token")
+>>> ticket_properties = tickets.get_properties()
+>>> partitioned_query = tickets.query.expand("actions").partition_by(
+...     ticket_properties["createdDate"], start=date(2015, 1, 1), end=date(2021, 1, 1)
+... )
+>>> backfill = Backfill(
+...     shards_by_window(partitioned_query),
+...     sink=JsonLinesSink("export/tickets"),
+...     manifest=Checkpoint("export/tickets.manifest.json"),
+...     max_workers=8,
+... )
+>>> backfill.run()
+... {'2015-01-01T00:00:00/2015-01-08T00:00:00': 132, ...}
+"""
+
+from collections import namedtuple
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+import copy
+import json
+import os
+import re
+import time
+
+from . import config
+from .exceptions import PyvideskDeadlineError, PyvideskPartitionError
+from .partition import query_fingerprint
+from .query import Query
+
+
+class Shard(namedtuple("Shard", ("key", "query"))):
+    """Parte de uma carga histórica: uma chave única e a consulta que a obtem"""
+
+    __slots__ = ()
+
+    @property
+    def fingerprint(self):
+        """Impressão digital da consulta da parte, conferida pelo manifesto"""
+        return query_fingerprint(self.query)
+
+
+def shards_by_window(partitioned_query):
+    """
+    Funcao que cria uma parte para cada janela de uma consulta particionada.
+
+    Args:
+        partitioned_query (pyvidesk.partition.PartitionedQuery): A consulta particionada.
+
+    Returns:
+        (list): As partes (pyvidesk.backfill.Shard).
+    """
+    return [Shard(window.key, window.query) for window in partitioned_query]
+
+
+def shards_by_id(query, start, end, size):
+    """
+    Funcao que divide uma consulta em faixas de IDs que não se sobrepõem
+    (``id >= início and id < fim``).
+
+    Args:
+        query (pyvidesk.query.Query): A consulta base.
+        start (int): O primeiro ID (inclusive).
+        end (int): O último ID (exclusive).
+        size (int): O número de IDs de cada faixa.
+
+    Returns:
+        (list): As partes (pyvidesk.backfill.Shard).
+    """
+    if size <= 0:
+        raise ValueError("O tamanho da faixa deve ser positivo.")
+
+    id_property = query.entity.get_properties()["id"]
+    shards = []
+    for shard_start in range(start, end, size):
+        shard_end = min(shard_start + size, end)
+        shard_query = query.filter(id_property >= shard_start).filter(
+            id_property < shard_end
+        )
+        shards.append(Shard(f"{shard_start}-{shard_end}", shard_query))
+    return shards
+
+
+class JsonLinesSink:
+    """
+    Destino que grava cada parte num arquivo JSON Lines (uma resposta por linha).
+    O arquivo só aparece com o nome final quando a parte é concluída, então partes
+    interrompidas nunca deixam arquivos incompletos.
+    """
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): O diretório dos arquivos. Se não existir, será criado.
+        """
+        self.directory = directory
+
+    def __repr__(self):
+        return f"<JsonLinesSink({self.directory})>"
+
+    def open(self, key):
+        """
+        Metodo que abre o arquivo de uma parte.
+
+        Args:
+            key (str): A chave da parte.
+
+        Returns:
+            (pyvidesk.backfill._JsonLinesWriter): Gerenciador de contexto com o método
+                write(data).
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, re.sub(r"[^\w.-]", "_", key) + ".jsonl")
+        return _JsonLinesWriter(path)
+
+
+class _JsonLinesWriter:
+    def __init__(self, path):
+        self.path = path
+        self._temp_path = path + ".tmp"
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self._temp_path, "w", encoding="utf-8")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._file.close()
+        if exc_type is None:
+            os.replace(self._temp_path, self.path)
+        else:
+            os.remove(self._temp_path)
+
+    def write(self, data):
+        self._file.write(json.dumps(data, ensure_ascii=False, default=str) + "\n")
+
+
+class Backfill:
+    """Classe que executa uma carga histórica, uma parte por processo"""
+
+    def __init__(
+        self,
+        shards,
+        sink,
+        manifest=None,
+        max_workers=None,
+        transform=None,
+        processes=True,
+    ):
+        """
+        Args:
+            shards (list): As partes (pyvidesk.backfill.Shard).
+            sink (): O destino das respostas, como pyvidesk.backfill.JsonLinesSink.
+                Deve ter um método open(key) que retorna um gerenciador de contexto com
+                o método write(data), e deve poder ser enviado a outro processo (pickle).
+            manifest (pyvidesk.partition.Checkpoint): Manifesto opcional com as partes
+                concluídas, que são ignoradas.
+            max_workers (int): O número de partes processadas ao mesmo tempo. Por padrão,
+                o número de CPUs.
+            transform (callable): Funcao opcional aplicada a cada resposta (dict) antes
+                da gravação. Deve ser definida no nível de um módulo (pickle).
+            processes (bool): True, para processar cada parte num processo. False, para
+                usar threads.
+        """
+        self.shards = list(shards)
+        self.sink = sink
+        self.manifest = manifest
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.transform = transform
+        self.processes = processes
+
+    def __repr__(self):
+        return f"<Backfill with {len(self.shards)} shards>"
+
+    def pending(self):
+        """
+        Metodo que obtem as partes ainda não concluídas.
+
+        Raises:
+            PyvideskCheckpointError: Se o manifesto registrar partes de outra consulta.
+        """
+        if self.manifest is None:
+            return list(self.shards)
+        return [
+            shard
+            for shard in self.shards
+            if not self.manifest.is_done(shard.key, shard.fingerprint)
+        ]
+
+    def run(self, deadline=None):
+        """
+        Metodo que processa as partes pendentes. Partes que falham não interrompem as
+        demais e não são registradas no manifesto.
+
+        Args:
+            deadline (float): O prazo (segundos) da carga. Quando termina, nenhuma parte
+                nova é iniciada e as partes em andamento são interrompidas (cada uma
+                recebe o tempo que resta como prazo da sua consulta). Com o manifesto,
+                basta executar a carga novamente para processar as que faltam.
+
+        Returns:
+            (dict): O número de respostas gravadas em cada parte processada.
+
+        Raises:
+            PyvideskCheckpointError: Se o manifesto registrar partes de outra consulta.
+            PyvideskDeadlineError: Se o prazo terminar antes de todas as partes serem
+                processadas. O atributo 'partial' do erro tem o número de respostas de
+                cada parte concluída.
+            PyvideskPartitionError: Se alguma parte falhar.
+        """
+        if deadline is not None and deadline <= 0:
+            raise ValueError("O prazo deve ser positivo.")
+
+        deadline_at = None if deadline is None else time.monotonic() + deadline
+        pending = iter(self.pending())
+        counts = dict()
+        errors = dict()
+        expired = []  # partes interrompidas pelo prazo
+        running = dict()
+        executor_class = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+
+        with executor_class(max_workers=self.max_workers) as executor:
+
+            def submit_next():
+                shard_deadline = None
+                if deadline_at is not None:
+                    shard_deadline = deadline_at - time.monotonic()
+                    if expired or shard_deadline <= 0:
+                        return
+                shard = next(pending, None)
+                if shard is not None:
+                    detached = _detach(shard)
+                    if shard_deadline is not None:
+                        detached = _with_deadline(detached, shard_deadline)
+                    future = executor.submit(
+                        _run_shard, detached, self.sink, self.transform
+                    )
+                    running[future] = shard
+
+            for _ in range(self.max_workers):
+                submit_next()
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    shard = running.pop(future)
+                    submit_next()
+                    try:
+                        counts[shard.key] = future.result()
+                    except PyvideskDeadlineError:
+                        expired.append(shard)
+                        continue
+                    except Exception as error:  # pylint: disable=broad-except
+                        # qualquer falha (do destino ou do 'transform', por exemplo)
+                        # fica restrita à sua parte
+                        errors[shard] = error
+                        continue
+                    if self.manifest is not None:
+                        self.manifest.mark_done(shard.key, shard.fingerprint)
+
+        not_started = sum(1 for _ in pending)
+        if expired or deadline_at is not None and not_started:
+            error = PyvideskDeadlineError(
+                progress={
+                    "completed": len(counts),
+                    "pending": len(expired) + not_started,
+                    "failed": len(errors),
+                }
+            )
+            error.partial = counts
+            raise error
+        if errors:
+            raise PyvideskPartitionError(errors)
+        return counts
+
+
+def _detach(shard):
+    """
+    Funcao que obtem uma cópia da parte sem a sessão da entidade, que não pode (e não
+    deve) ser compartilhada entre processos.
+    """
+    entity = shard.query.entity
+    if entity.session is None:
+        return shard
+    entity = copy.copy(entity)
+    entity.session = None
+    query = Query(
+        entity=entity, options=shard.query.options, settings=shard.query._settings
+    )
+    return Shard(shard.key, query)
+
+
+def _with_deadline(shard, seconds):
+    """
+    Funcao que limita o prazo da consulta de uma parte ao tempo que resta da carga.
+    """
+    query_deadline = shard.query._settings.get("deadline")
+    if query_deadline is not None:
+        seconds = min(seconds, query_deadline)
+    return Shard(shard.key, shard.query.deadline(seconds))
+
+
+def _run_shard(shard, sink, transform):
+    """
+    Funcao que grava as respostas de uma parte, página a página. Assim como nas demais
+    consultas, a consulta da parte é dividida se a URL for maior que o tamanho máximo.
+    """
+    count = 0
+    query = shard.query._start_deadline()
+    with sink.open(shard.key) as writer:
+        for page in query._iter_pages_data(config.PAGE_SIZE):
+            for data in page:
+                writer.write(data if transform is None else transform(data))
+                count += 1
+    return count
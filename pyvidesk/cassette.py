@@ -0,0 +1,231 @@
+"""
+Módulo com o transporte que grava e reproduz (cassete) as requisições ao servidor.
+
+No modo "record", as requisições são enviadas a outro transporte (por padrão, o servidor
+real) e cada troca (requisição, resposta e duração) é gravada num arquivo JSON Lines
+comprimido com gzip. O token é removido das URLs, dos corpos e das respostas antes da
+gravação. No modo "replay", as respostas são reproduzidas a partir do arquivo, sem acesso
+à rede, com a duração original (speed=1.0) ou o mais rápido possível (speed=None).
+
+Assim, testes e benchmarks de ponta a ponta rodam sem rede e sempre com as mesmas
+respostas: variações no tempo medem apenas o custo da biblioteca.
+
+Exemplo de uso:
+
+>>> from pyvidesk import Pyvidesk
+>>> from pyvidesk.cassette import Cassette
+
+>>> with Cassette("tickets.jsonl.gz", mode="record") as cassette:
+...     tickets = Pyvidesk(token="my_token", transport=cassette).tickets
+...     tickets.query.select("id").top(10).all()
+
+>>> cassette = Cassette("tickets.jsonl.gz")  # mode="replay"
+>>> tickets = Pyvidesk(token="any_token", transport=cassette).tickets
+>>> tickets.query.select("id").top(10).all()  # sem acesso à rede
+... [<Model for Ticket(id=1)>, ...]
+"""
+
+import base64
+import gzip
+import json
+import os
+from threading import Lock
+import time
+
+from .exceptions import PyvideskCassetteError
+from .transport import (
+    REDACTED_TOKEN,
+    RequestsTransport,
+    build_response,
+    get_token,
+    redact_url,
+)
+
+# Tokens mais curtos não são procurados nos corpos (removeriam trechos comuns do texto)
+_MIN_TOKEN_LENGTH = 8
+# Cabeçalhos da resposta que são gravados (os demais podem conter dados da sessão)
+_RECORDED_HEADERS = ("content-type", "retry-after")
+_MODES = ("record", "replay", "once")
+
+
+class Cassette:
+    """Transporte que grava ou reproduz as requisições a partir de um arquivo"""
+
+    def __init__(self, path, mode="replay", transport=None, speed=None):
+        """
+        Args:
+            path (str): O caminho do arquivo (JSON Lines comprimido com gzip).
+            mode (str): "record", para enviar e gravar as requisições; "replay", para
+                reproduzi-las; ou "once", para reproduzir se o arquivo existir e gravar,
+                do contrário.
+            transport (): O transporte que envia as requisições no modo "record". Por
+                padrão, pyvidesk.transport.RequestsTransport.
+            speed (float): No modo "replay", a velocidade da reprodução em relação à
+                duração gravada (1.0, a original; 2.0, o dobro). None, para responder
+                sem esperar.
+        """
+        if mode not in _MODES:
+            raise ValueError(
+                f"'{mode}' não é um modo válido. Modos válidos: {', '.join(_MODES)}"
+            )
+        if mode == "once":
+            mode = "replay" if os.path.exists(path) else "record"
+
+        self.path = path
+        self.mode = mode
+        self.transport = transport or RequestsTransport()
+        self.speed = speed
+        self.interactions = []
+        self._queues = dict()
+        self._lock = Lock()
+        if mode == "replay":
+            self._load()
+
+    def __repr__(self):
+        return f"<Cassette({self.path}, {self.mode}) with {len(self)} interactions>"
+
+    def __len__(self):
+        return len(self.interactions)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.save()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def request(self, method, url, data=None, headers=None, stream=False, timeout=None):
+        """
+        Metodo que envia (e grava) ou reproduz uma requisição (interface dos
+        transportes, veja pyvidesk.transport).
+
+        Returns:
+            (requests.Response): A resposta.
+
+        Raises:
+            PyvideskCassetteError: No modo "replay", se a requisição não foi gravada.
+        """
+        # pylint: disable=unused-argument
+        if self.mode == "record":
+            return self._record(method, url, data, headers, timeout)
+        return self._replay(method, url, data)
+
+    def _record(self, method, url, data, headers, timeout):
+        start = time.perf_counter()
+        response = self.transport.request(
+            method, url, data=data, headers=headers, timeout=timeout
+        )
+        body = response.content
+        elapsed = time.perf_counter() - start
+
+        token = get_token(url)
+        response_headers = {
+            header: value
+            for header, value in response.headers.items()
+            if header.lower() in _RECORDED_HEADERS
+        }
+        interaction = {
+            "method": method,
+            "url": redact_url(url),
+            "body": _redact(_decode(data), token),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": response_headers,
+            "elapsed": round(elapsed, 6),
+        }
+        text = _decode(body)
+        if text is None:
+            interaction["response_base64"] = base64.b64encode(body).decode("ascii")
+        else:
+            interaction["response"] = _redact(text, token)
+
+        with self._lock:
+            self.interactions.append(interaction)
+        return build_response(
+            response.status_code,
+            body,
+            headers=response_headers,
+            url=url,
+            reason=response.reason,
+        )
+
+    def _replay(self, method, url, data):
+        token = get_token(url)
+        key = (method, redact_url(url), _redact(_decode(data), token))
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                raise PyvideskCassetteError(
+                    f"A requisição {method} {key[1]} não foi gravada em {self.path}."
+                )
+            # requisições iguais recebem as respostas na ordem em que foram gravadas;
+            # a última é repetida
+            interaction = queue.pop(0) if len(queue) > 1 else queue[0]
+
+        if self.speed:
+            time.sleep(interaction["elapsed"] / self.speed)
+        if "response_base64" in interaction:
+            body = base64.b64decode(interaction["response_base64"])
+        else:
+            body = interaction["response"].encode("utf-8")
+        return build_response(
+            interaction["status"],
+            body,
+            headers=interaction["headers"],
+            url=url,
+            reason=interaction["reason"],
+        )
+
+    def rewind(self):
+        """Metodo que reinicia a reprodução, para que as respostas sejam repetidas"""
+        with self._lock:
+            self._queues = dict()
+            for interaction in self.interactions:
+                key = (interaction["method"], interaction["url"], interaction["body"])
+                self._queues.setdefault(key, []).append(interaction)
+
+    def save(self):
+        """
+        Metodo que grava as trocas no arquivo (apenas no modo "record"). O arquivo é
+        reescrito de forma atômica.
+        """
+        if self.mode != "record":
+            return
+        with self._lock:
+            lines = [
+                json.dumps(interaction, ensure_ascii=False) + "\n"
+                for interaction in self.interactions
+            ]
+        temp_path = self.path + ".tmp"
+        with gzip.open(temp_path, "wt", encoding="utf-8") as file:
+            file.writelines(lines)
+        os.replace(temp_path, self.path)
+
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as file:
+            self.interactions = [json.loads(line) for line in file if line.strip()]
+        self.rewind()
+
+
+def _redact(text, token):
+    """Funcao que remove o token de um texto (corpo da requisição ou resposta)"""
+    if not text or not token or len(token) < _MIN_TOKEN_LENGTH:
+        return text
+    return text.replace(token, REDACTED_TOKEN)
+
+
+def _decode(data):
+    if data is None or isinstance(data, str):
+        return data
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
@@ -0,0 +1,248 @@
+"""
+Módulo com o disjuntor (circuit breaker) das requisições, que interrompe as requisições
+a uma entidade enquanto o servidor está com problemas.
+
+Cada entidade (tickets, persons...) tem um circuito com três estados:
+    closed: as requisições são enviadas e os resultados, registrados numa janela de
+        tempo. Se a taxa de falhas (erros de conexão, códigos 429 e 5xx) ou de
+        requisições lentas passar do limite, o circuito abre.
+    open: as requisições falham imediatamente com PyvideskCircuitOpenError, sem acessar
+        o servidor, até o fim do tempo de espera.
+    half-open: algumas requisições de teste são enviadas. Se forem bem sucedidas, o
+        circuito fecha; do contrário, abre de novo.
+
+Exemplo de uso:
+
+>>> from pyvidesk import Pyvidesk
+>>> from pyvidesk.circuit import CircuitBreaker
+>>> from pyvidesk.exceptions import PyvideskCircuitOpenError
+
+>>> breaker = CircuitBreaker(failure_rate=0.5, min_requests=10, open_timeout=30.0)
+>>> pyvidesk = Pyvidesk(token="my_token", circuit_breaker=breaker)
+>>> try:
+...     pyvidesk.tickets.query.top(10).all()
+... except PyvideskCircuitOpenError as error:
+...     print(f"Movidesk indisponível, tente de novo em {error.retry_in:.0f} s")
+"""
+
+from collections import deque
+from threading import Lock
+import time
+
+from .exceptions import PyvideskCircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class _Circuit:
+    """Classe com o estado do circuito de uma entidade"""
+
+    __slots__ = ("state", "outcomes", "opened_at", "probes", "successes", "round")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.outcomes = deque()  # (instante, falhou, lenta) de cada requisição
+        self.opened_at = None
+        self.probes = 0  # requisições de teste em andamento (half-open)
+        self.successes = 0  # requisições de teste bem sucedidas (half-open)
+        self.round = 0  # quantas vezes o circuito passou a half-open
+
+
+class CircuitBreaker:
+    """Classe que mantém o circuito de cada entidade"""
+
+    def __init__(
+        self,
+        failure_rate=0.5,
+        min_requests=10,
+        window=60.0,
+        slow_request=None,
+        slow_rate=0.5,
+        open_timeout=30.0,
+        half_open_requests=1,
+    ):
+        """
+        Args:
+            failure_rate (float): A taxa de falhas (de 0 a 1) na janela que abre o
+                circuito.
+            min_requests (int): O número mínimo de requisições na janela para que as
+                taxas sejam avaliadas.
+            window (float): A duração (segundos) da janela de requisições.
+            slow_request (float): A latência (segundos) a partir da qual uma requisição é
+                considerada lenta. None, para não considerar a latência.
+            slow_rate (float): A taxa de requisições lentas (de 0 a 1) na janela que abre
+                o circuito.
+            open_timeout (float): O tempo (segundos) que o circuito fica aberto antes das
+                requisições de teste.
+            half_open_requests (int): O número de requisições de teste bem sucedidas
+                necessárias para fechar o circuito (e o máximo delas ao mesmo tempo).
+        """
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window = window
+        self.slow_request = slow_request
+        self.slow_rate = slow_rate
+        self.open_timeout = open_timeout
+        self.half_open_requests = half_open_requests
+        self._circuits = dict()
+        self._lock = Lock()
+
+    def __repr__(self):
+        states = ", ".join(
+            f"{entity}={circuit.state}" for entity, circuit in self._circuits.items()
+        )
+        return f"<CircuitBreaker: {states}>"
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def state(self, entity):
+        """
+        Metodo que obtem o estado do circuito de uma entidade.
+
+        Args:
+            entity (str): O nome da entidade (tickets, persons...).
+
+        Returns:
+            (str): "closed", "open" ou "half-open".
+        """
+        with self._lock:
+            return self._get(entity, time.monotonic()).state
+
+    def before_request(self, entity):
+        """
+        Metodo chamado antes de cada requisição (tentativa) a uma entidade. Cada chamada
+        bem sucedida deve ser seguida de record() ou, se a tentativa for interrompida
+        antes do resultado, de release(), com a vaga de teste retornada.
+
+        Returns:
+            (int): A vaga de teste ocupada pela requisição (a rodada half-open do
+                circuito). None, se o circuito estiver fechado.
+
+        Raises:
+            PyvideskCircuitOpenError: Se o circuito estiver aberto ou se o limite de
+                requisições de teste (half-open) foi atingido.
+        """
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._get(entity, now)
+            if circuit.state == CLOSED:
+                return None
+            if circuit.state == HALF_OPEN and circuit.probes < self.half_open_requests:
+                circuit.probes += 1
+                return circuit.round
+            retry_in = 0.0
+            if circuit.state == OPEN:
+                retry_in = circuit.opened_at + self.open_timeout - now
+        raise PyvideskCircuitOpenError(entity, circuit.state, retry_in)
+
+    def record(self, entity, failed, latency, probe=None):
+        """
+        Metodo que registra o resultado de uma requisição a uma entidade. Com o circuito
+        half-open, apenas os resultados das requisições de teste desta rodada contam.
+
+        Args:
+            entity (str): O nome da entidade.
+            failed (bool): True, se a requisição falhou (erro de conexão, 429 ou 5xx).
+            latency (float): A duração da requisição (segundos).
+            probe (int): A vaga de teste retornada por before_request().
+        """
+        slow = self.slow_request is not None and latency >= self.slow_request
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._get(entity, now)
+            if circuit.state == HALF_OPEN:
+                if probe != circuit.round:  # iniciada antes desta rodada de testes
+                    return
+                circuit.probes -= 1
+                if failed or slow:
+                    self._open(circuit, now)
+                    return
+                circuit.successes += 1
+                if circuit.successes >= self.half_open_requests:
+                    self._close(circuit)
+                return
+            if circuit.state == OPEN:
+                return
+
+            outcomes = circuit.outcomes
+            outcomes.append((now, failed, slow))
+            self._expire(outcomes, now)
+            if len(outcomes) < self.min_requests:
+                return
+            failures = sum(1 for _, failed_, _ in outcomes if failed_)
+            slows = sum(1 for _, _, slow_ in outcomes if slow_)
+            if (
+                failures / len(outcomes) >= self.failure_rate
+                or self.slow_request is not None
+                and slows / len(outcomes) >= self.slow_rate
+            ):
+                self._open(circuit, now)
+
+    def release(self, entity, probe):
+        """
+        Metodo que devolve a vaga de uma requisição de teste (half-open) interrompida
+        antes do resultado (por um erro que não é de conexão), sem registrá-la. Vagas de
+        rodadas anteriores (e requisições que não ocuparam vaga) são ignoradas.
+
+        Args:
+            entity (str): O nome da entidade.
+            probe (int): A vaga de teste retornada por before_request().
+        """
+        if probe is None:
+            return
+        with self._lock:
+            circuit = self._circuits.get(entity)
+            if (
+                circuit is not None
+                and circuit.state == HALF_OPEN
+                and circuit.round == probe
+            ):
+                circuit.probes -= 1
+
+    def reset(self, entity=None):
+        """
+        Metodo que fecha o circuito de uma entidade (ou de todas) e descarta os
+        resultados registrados.
+        """
+        with self._lock:
+            if entity is None:
+                self._circuits = dict()
+            else:
+                self._circuits.pop(entity, None)
+
+    def _get(self, entity, now):
+        """Metodo que obtem o circuito de uma entidade, passando de open a half-open"""
+        circuit = self._circuits.get(entity)
+        if circuit is None:
+            circuit = self._circuits[entity] = _Circuit()
+        if circuit.state == OPEN and now - circuit.opened_at >= self.open_timeout:
+            circuit.state = HALF_OPEN
+            circuit.probes = 0
+            circuit.successes = 0
+            circuit.round += 1
+        return circuit
+
+    def _expire(self, outcomes, now):
+        while outcomes and outcomes[0][0] <= now - self.window:
+            outcomes.popleft()
+
+    @staticmethod
+    def _open(circuit, now):
+        circuit.state = OPEN
+        circuit.opened_at = now
+        circuit.outcomes.clear()
+
+    @staticmethod
+    def _close(circuit):
+        circuit.state = CLOSED
+        circuit.opened_at = None
+        circuit.outcomes.clear()
@@ -0,0 +1,110 @@
+"""
+Módulo com os codecs JSON usados nas requisições ao servidor.
+
+O codec decodifica as respostas a partir dos bytes "crus" e codifica os corpos das
+requisições PATCH e POST. Por padrão (pyvidesk.config.JSON_CODEC = "auto"), é usado o
+orjson, se estiver instalado (``pip install pyvidesk[fast]``); do contrário, o módulo json
+da biblioteca padrão.
+
+Exemplo de uso:
+
+>>> from pyvidesk import Pyvidesk
+>>> from pyvidesk.codec import get_codec
+
+>>> get_codec()
+... <JsonCodec(orjson)>
+>>> tickets = Pyvidesk(token="my_token").tickets
+>>> tickets.api.codec = get_codec("json")  # força a biblioteca padrão
+"""
+
+import json
+
+from . import config
+
+
+class JsonCodec:
+    """Classe que agrupa as funções de decodificação e codificação de um codec"""
+
+    def __init__(self, name, loads, dumps):
+        """
+        Args:
+            name (str): O nome do codec.
+            loads (callable): Funcao que decodifica bytes (ou str) para objetos Python.
+            dumps (callable): Funcao que codifica objetos Python para bytes (UTF-8).
+        """
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self):
+        return f"<JsonCodec({self.name})>"
+
+    def __reduce__(self):
+        # para que o codec possa ser enviado a outros processos (pyvidesk.backfill)
+        return get_codec, (self.name,)
+
+
+def _create_json_codec():
+    def dumps(value):
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+    return JsonCodec("json", json.loads, dumps)
+
+
+def _create_orjson_codec():
+    import orjson  # pylint: disable=import-outside-toplevel
+
+    return JsonCodec("orjson", orjson.loads, orjson.dumps)
+
+
+def _create_ujson_codec():
+    import ujson  # pylint: disable=import-outside-toplevel
+
+    def dumps(value):
+        return ujson.dumps(value, ensure_ascii=False).encode("utf-8")
+
+    return JsonCodec("ujson", ujson.loads, dumps)
+
+
+_CODEC_FACTORIES = {
+    "orjson": _create_orjson_codec,
+    "ujson": _create_ujson_codec,
+    "json": _create_json_codec,
+}
+_CODECS = dict()
+
+
+def get_codec(name=None):
+    """
+    Funcao que obtem um codec JSON.
+
+    Args:
+        name (str): "orjson", "ujson", "json" ou "auto" (o mais rápido instalado, na
+            ordem anterior). Por padrão, pyvidesk.config.JSON_CODEC.
+
+    Returns:
+        (pyvidesk.codec.JsonCodec): O codec.
+
+    Raises:
+        ValueError: Se o codec não existir.
+        ImportError: Se a biblioteca do codec não estiver instalada.
+    """
+    name = name or config.JSON_CODEC
+    if name in _CODECS:
+        return _CODECS[name]
+
+    if name == "auto":
+        for factory in _CODEC_FACTORIES.values():
+            try:
+                codec = factory()
+                break
+            except ImportError:
+                continue
+    elif name in _CODEC_FACTORIES:
+        codec = _CODEC_FACTORIES[name]()
+    else:
+        raise ValueError(
+            f"'{name}' não é um codec válido. Codecs válidos: "
+            f"auto, {', '.join(_CODEC_FACTORIES)}"
+        )
+    return _CODECS.setdefault(name, codec)
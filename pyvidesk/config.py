@@ -6,6 +6,9 @@ from .properties import PropertyBase
 
 MAIN_URL = "https://api.movidesk.com/public/v1/"
 
+# Número de resultados por requisição quando a biblioteca precisa paginar uma consulta
+PAGE_SIZE = 1000
+
 QUERY_PARAMS = {
     "orderby": (str, tuple, list, PropertyBase),
     "top": int,
@@ -13,3 +16,56 @@ QUERY_PARAMS = {
     "select": (str, tuple, list, PropertyBase),
     "expand": (str, tuple, list, PropertyBase),
 }
+
+# Se True, vários 'eq' na mesma propriedade dentro de um 'or' são enviados como um único
+# 'in' (``id in (1, 2)``), o que encurta a URL. Desativado por padrão, pois o operador
+# 'in' do Odata 4.01 não é documentado pelo Movidesk.
+FILTER_FOLD_EQ_INTO_IN = False
+
+# Tamanho máximo (em caracteres, já codificada) da URL de uma consulta. Consultas com URLs
+# maiores têm a maior disjunção ('or') do filtro dividida em várias consultas menores.
+# None, para nunca dividir. Pode ser alterado por consulta com Query.max_url_length().
+MAX_URL_LENGTH = 2000
+
+# Número de consultas menores (da divisão acima) feitas simultaneamente.
+SPLIT_MAX_WORKERS = 1
+
+# Tamanho (em bytes) de cada pedaço lido das respostas em modo "streaming" (Query.stream())
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Transporte padrão das requisições (veja pyvidesk.transport), usado quando nenhum
+# transporte é passado às entidades. None, para requisições HTTP com a biblioteca requests.
+TRANSPORT = None
+
+# Tempo máximo (segundos) para conectar ao servidor e para cada leitura da resposta, em
+# todas as requisições. Pode ser alterado por entidade (Pyvidesk(timeout=...)). None, para
+# esperar indefinidamente.
+TIMEOUT = (10.0, 120.0)
+
+# Eventos padrão das requisições (pyvidesk.hooks.Hooks), usados quando nenhum é passado às
+# entidades. None, para que cada entidade tenha os seus.
+HOOKS = None
+
+# Número de vezes que uma requisição é repetida após um erro de conexão ou uma resposta
+# com um dos códigos abaixo. Requisições POST e PATCH são repetidas apenas após o código
+# 429, pois o servidor não as processou: após um erro de conexão ou 5xx, elas podem ter
+# sido aplicadas, e repeti-las criaria modelos (POST) ou ações (PATCH de um ticket com
+# ações sem 'id') duplicados. A espera entre as tentativas é a do cabeçalho Retry-After,
+# se houver, ou RETRY_BACKOFF * 2 ** tentativa, limitada a RETRY_MAX_DELAY (segundos).
+RETRIES = 0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_BACKOFF = 0.5
+RETRY_MAX_DELAY = 30.0
+
+# Disjuntor padrão das requisições (pyvidesk.circuit.CircuitBreaker), usado quando nenhum
+# é passado às entidades. None, para nunca interromper as requisições.
+CIRCUIT_BREAKER = None
+
+# Limitador padrão das requisições por token (pyvidesk.ratelimit.RateLimiter ou, entre
+# processos, pyvidesk.ratelimit.SQLiteRateLimiter), usado quando nenhum é passado às
+# entidades. None, para não limitar as requisições.
+RATE_LIMITER = None
+
+# Codec JSON das requisições: "orjson", "ujson", "json" ou "auto" (o mais rápido
+# instalado). Veja pyvidesk.codec.
+JSON_CODEC = "auto"
@@ -15,7 +15,6 @@ Exemplo de uso.
 ... 'Assunto'
 """
 
-
 from .api import Api
 from .config import QUERY_PARAMS
 from .exceptions import (
@@ -32,13 +31,41 @@ from .utils import get_property_name
 class Entity:
     """Classe que representa uma entidade do Movidesk (Tickets, Persons...)"""
 
-    def __init__(self, token):
+    def __init__(
+        self,
+        token,
+        session=None,
+        transport=None,
+        hooks=None,
+        circuit_breaker=None,
+        timeout=None,
+        rate_limiter=None,
+    ):
         """
         Args:
             token (str): O token que permitirá o acesso aos dados do Movidesk.
+            session (pyvidesk.session.Session): Sessão opcional que garante uma única
+                instância de Model por id.
+            transport (): Transporte opcional das requisições (veja pyvidesk.transport).
+            hooks (pyvidesk.hooks.Hooks): Eventos opcionais das requisições (veja
+                pyvidesk.hooks).
+            circuit_breaker (pyvidesk.circuit.CircuitBreaker): Disjuntor opcional das
+                requisições (veja pyvidesk.circuit).
+            timeout (tuple): Tempos máximos opcionais (segundos) de conexão e de cada
+                leitura. Por padrão, os definidos em pyvidesk.config.TIMEOUT.
+            rate_limiter (pyvidesk.ratelimit.RateLimiter): Limitador opcional das
+                requisições por token (veja pyvidesk.ratelimit).
         """
         base_url = self.BASE_URL + f"?token={token}"
-        self.api = Api(base_url=base_url)
+        self.api = Api(
+            base_url=base_url,
+            transport=transport,
+            hooks=hooks,
+            circuit_breaker=circuit_breaker,
+            timeout=timeout,
+            rate_limiter=rate_limiter,
+        )
+        self.session = session
 
     @property
     def query(self):
@@ -55,15 +82,35 @@ class Entity:
         Returns:
             properties (dict): Dicionário com as propriedades da entidade.
         """
-        properties = dict()
-        for property_name, property_infos in self.VALID_PARAMS.items():
-            property_class = property_infos["property"]
-            properties[property_name] = property_class(
-                name_=property_name,
-                description_=property_infos["description"],
-                read_only=property_infos["readOnly"],
-            )
-        return properties
+        return dict(self._get_schema()[0])
+
+    @classmethod
+    def _get_schema(cls):
+        """
+        Metodo que obtem as propriedades da entidade e a tabela de tipos usada na validacao
+        dos metodos get_by_*. Ambas sao criadas apenas uma vez por classe.
+
+        Returns:
+            (tuple): Dicionário com as propriedades da entidade e dicionário com o tipo
+                aceito por cada propriedade e opcao da query (select, top, skip...).
+        """
+        schema = cls.__dict__.get("_schema")
+        if schema is None:
+            properties = dict()
+            for property_name, property_infos in cls.VALID_PARAMS.items():
+                property_class = property_infos["property"]
+                properties[property_name] = property_class(
+                    name_=property_name,
+                    description_=property_infos["description"],
+                    read_only=property_infos["readOnly"],
+                )
+            valid_types = {
+                property_name: property_obj.alias
+                for property_name, property_obj in properties.items()
+            }
+            valid_types.update(QUERY_PARAMS)
+            schema = cls._schema = (properties, valid_types)
+        return schema
 
     def describe(self):
         """Metodo que descreve a entidade e suas principais propriedades"""
@@ -136,20 +183,9 @@ class Entity:
         if param not in self.VALID_PARAMS:
             raise PyvideskPropertyNotValidError(param=param, class_=self)
 
-        def wrapper(*args, **kwargs):
-            self._pre_validate_request(param, *args, **kwargs)
-            properties = self.get_properties()
-            param_value = kwargs.pop(param, None) or args[0]
-            query = Query(
-                entity=self,
-                options=_organize_options(options=kwargs),
-            ).filter(properties[param] == param_value)
-
-            if param in ("id", "codeReferenceAdditional"):
-                return query.first()
-            return query
-
-        return wrapper
+        # O metodo é guardado na classe, logo as proximas chamadas nao passam por aqui
+        setattr(self.__class__, attr, _get_by_property(param))
+        return getattr(self, attr)
 
     def _pre_validate_request(self, property_name, *args, **kwargs):
         """
@@ -164,22 +200,18 @@ class Entity:
             PyvideskWrongKwargError: O kwarg usado nao é uma das opcoes da query
                 (select, top, skip...);
         """
-        properties = self.get_properties()
+        valid_types = self._get_schema()[1]
         for arg in args:
-            if not isinstance(arg, properties[property_name].alias):
+            if not isinstance(arg, valid_types[property_name]):
                 raise PyvideskPropertyWithWrongType(
                     param=property_name,
                     value=arg,
-                    correct_type=properties[property_name].alias,
+                    correct_type=valid_types[property_name],
                 )
 
         for key, value in kwargs.items():
             try:
-                valid_params = {**properties, **QUERY_PARAMS}
-                try:
-                    data_type = valid_params[key].alias
-                except AttributeError:
-                    data_type = valid_params[key]
+                data_type = valid_types[key]
             except KeyError as wrong_wkarg_error:
                 raise PyvideskWrongKwargError(
                     param=property_name, kwarg=key
@@ -191,6 +223,43 @@ class Entity:
                 )
 
 
+def _get_by_property(param):
+    """
+    Funcao que cria o metodo get_by_<param> de uma entidade.
+
+    Args:
+        param (str): O nome da propriedade usada no filtro.
+
+    Returns:
+        (function): O metodo.
+    """
+
+    def get_by_property(self, *args, **kwargs):
+        self._pre_validate_request(param, *args, **kwargs)
+        param_value = kwargs.pop(param) if param in kwargs else args[0]
+        options = _organize_options(options=kwargs)
+        if param == "id" and self.session is not None and set(options) <= {"$select"}:
+            model = self.session.lookup(
+                self, param_value, select=options.get("$select")
+            )
+            if model is not None:
+                return model
+
+        query = Query(entity=self, options=options).filter(
+            self._get_schema()[0][param] == param_value
+        )
+
+        if param in ("id", "codeReferenceAdditional"):
+            return query.first()
+        return query
+
+    get_by_property.__name__ = get_by_property.__qualname__ = "get_by_" + param
+    get_by_property.__doc__ = (
+        f"Metodo que obtem os modelos filtrando pela propriedade '{param}'."
+    )
+    return get_by_property
+
+
 def _organize_options(options):
     """Funcao que organiza as opcoes da query de __getattr__"""
 
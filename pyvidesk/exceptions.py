@@ -2,7 +2,6 @@
 Módulo com todas as exceções desta biblioteca.
 """
 
-
 from .config import QUERY_PARAMS
 
 
@@ -18,13 +17,122 @@ class PyvideskRequestsError(PyvideskError):
     pass
 
 
+class PyvideskCassetteError(PyvideskRequestsError):
+    """
+    Erro quando uma requisição não está gravada no cassete (pyvidesk.cassette) em modo
+    de reprodução.
+    """
+
+    pass
+
+
+class PyvideskCircuitOpenError(PyvideskRequestsError):
+    """
+    Erro quando o disjuntor (pyvidesk.circuit) de uma entidade está aberto: a requisição
+    falha imediatamente, sem acessar o servidor.
+
+    Exemplo:
+
+    >>> tickets.query.all()
+    Traceback (most recent call last):
+    ...
+    ...
+    pyvidesk.exceptions.PyvideskCircuitOpenError: O circuito da entidade 'tickets' está
+    aberto (open). Nova tentativa em 12.3 s.
+    """
+
+    def __init__(self, entity, state, retry_in):
+        """
+        Args:
+            entity (str): O nome da entidade.
+            state (str): O estado do circuito ("open" ou "half-open").
+            retry_in (float): Os segundos até as requisições de teste (half-open).
+        """
+        self.entity = entity
+        self.state = state
+        self.retry_in = max(0.0, retry_in)
+        message = f"O circuito da entidade '{entity}' está aberto ({state})."
+        if state == "open":
+            message += f" Nova tentativa em {self.retry_in:.1f} s."
+        else:
+            message += " Aguardando o resultado das requisições de teste."
+        super().__init__(message)
+
+    def __reduce__(self):
+        return self.__class__, (self.entity, self.state, self.retry_in)
+
+
+class PyvideskRateLimitError(PyvideskRequestsError):
+    """
+    Erro quando o limitador de requisições (pyvidesk.ratelimit) não consegue reservar a
+    vaga de uma requisição, como quando o arquivo do SQLiteRateLimiter fica bloqueado
+    por outro processo além do tempo máximo de espera.
+    """
+
+    pass
+
+
+class PyvideskCheckpointError(PyvideskError):
+    """
+    Erro quando um checkpoint (ou manifesto) registra uma janela (ou parte) concluída
+    com outra consulta: outra entidade, outra propriedade de data ou outros filtros,
+    '$select' e '$expand'. Retomar a varredura ignoraria janelas nunca obtidas.
+    """
+
+    pass
+
+
+class PyvideskDeadlineError(PyvideskError):
+    """
+    Erro quando o prazo de uma operação (Query.deadline() ou Backfill.run(deadline=...))
+    termina antes do fim. O atributo 'progress' descreve o que foi concluído; em consultas,
+    'partial' tem as respostas já obtidas por all() e 'resume_query', a consulta que
+    obtem as respostas que faltam (None, se a consulta foi dividida).
+
+    Exemplo:
+
+    >>> tickets.query.deadline(60).all()
+    Traceback (most recent call last):
+    ...
+    ...
+    pyvidesk.exceptions.PyvideskDeadlineError: O prazo da operação terminou. Progresso:
+    items=3000
+    """
+
+    def __init__(self, message="O prazo da operação terminou.", progress=None):
+        """
+        Args:
+            message (str): A mensagem do erro.
+            progress (dict): O progresso da operação até o fim do prazo.
+        """
+        super().__init__(message)
+        self.progress = dict() if progress is None else progress
+        self.partial = None
+        self.resume_query = None
+
+    def __reduce__(self):
+        # 'partial' e 'resume_query' (modelos e consultas) não são enviados a outros
+        # processos
+        return self.__class__, (self.args[0], self.progress)
+
+    def __str__(self):
+        message = super().__str__()
+        if self.progress:
+            message += " Progresso: " + ", ".join(
+                f"{name}={value}" for name, value in self.progress.items()
+            )
+        return message
+
+
 class PyvideskBadResponseError(PyvideskError):
     """
     Erro quando a resposta acusa um HTTPError por meio do método raise_for_status
-    da biblioteca requests.
+    da biblioteca requests. O atributo 'status_code' tem o código HTTP da resposta.
     """
 
-    pass
+    def __init__(self, message="", status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
 
 
 class PyvideskSaveWithoutIdError(PyvideskError):
@@ -152,6 +260,34 @@ class PyvideskWrongKwargError(PyvideskError):
         super().__init__(message)
 
 
+class PyvideskPartitionError(PyvideskError):
+    """
+    Erro quando uma ou mais janelas de uma consulta particionada falham.
+    As demais janelas são obtidas normalmente e, com um checkpoint, apenas as janelas
+    que falharam são obtidas de novo na próxima execução.
+
+    Exemplo:
+
+    >>> for window, models in my_query.partition_by(...).scan(checkpoint=checkpoint):
+    ...     save(models)
+    Traceback (most recent call last):
+    ...
+    ...
+    pyvidesk.exceptions.PyvideskPartitionError: 1 janela(s) falharam: 2020-01-08T00:00:00/...
+    """
+
+    def __init__(self, errors):
+        """
+        Args:
+            errors (dict): O erro de cada janela (pyvidesk.partition.Window) que falhou.
+        """
+        self.errors = errors
+        message = f"{len(errors)} janela(s) falharam: " + ", ".join(
+            f"{window.key} ({error})" for window, error in errors.items()
+        )
+        super().__init__(message)
+
+
 def get_wrong_type_message(param, value, correct_type):
     if isinstance(correct_type, tuple):
         correct_type = ", ".join([f"'{_type.__name__}'" for _type in correct_type])
@@ -0,0 +1,812 @@
+"""
+Módulo com um servidor falso do Movidesk, para testes e benchmarks sem acesso à rede.
+
+O servidor responde às entidades 'tickets', 'persons' e 'services' com dados gerados a
+partir das propriedades de cada entidade (ou com os dados informados) e entende o
+subconjunto do Odata usado pela biblioteca: '$filter' (comparações, 'in', 'and', 'or',
+'not', contains/startswith/endswith e os operadores lambda any/all), '$select', '$expand'
+(inclusive aninhados), '$orderby', '$top', '$skip' e '$count'. Latência, limite de
+requisições e taxa de erros podem ser configurados, para medir o comportamento da
+biblioteca sob carga.
+
+O servidor pode ser usado de duas formas:
+
+- como transporte (pyvidesk.transport), respondendo no próprio processo, sem HTTP. Assim,
+  os benchmarks medem apenas o custo da biblioteca;
+- como servidor HTTP local (serve()), para testes com conexões reais.
+
+Exemplo de uso:
+
+>>> from pyvidesk import Pyvidesk
+>>> from pyvidesk.fake import FakeMovidesk, serve
+>>> from pyvidesk.transport import RequestsTransport
+
+>>> fake = FakeMovidesk(tickets=5000, latency=0.05, rate_limit=(10, 1.0))
+>>> tickets = Pyvidesk(token="my_token", transport=fake).tickets
+>>> tickets.query.filter(tickets.get_properties()["id"] <= 2500).count()
+... 2500
+
+>>> server = serve(fake)
+>>> tickets = Pyvidesk(token="my_token", transport=RequestsTransport(server.url)).tickets
+>>> tickets.get_by_id(1)
+... <Model for Ticket(id=1)>
+>>> server.shutdown()
+"""
+
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import math
+import random
+import re
+from threading import Lock, Thread
+import time
+from urllib.parse import unquote
+
+from dateutil.parser import isoparse
+from requests.exceptions import ReadTimeout
+
+from .codec import get_codec
+from .persons import Persons
+from .properties import (
+    ArrayProperty,
+    BooleanProperty,
+    ComplexProperty,
+    DatetimeProperty,
+    DecimalProperty,
+    FloatProperty,
+    IntegerProperty,
+    TimeProperty,
+)
+from .services import Services
+from .tickets import Tickets
+from .transport import build_response, get_read_timeout
+
+ENTITIES = {"tickets": Tickets, "persons": Persons, "services": Services}
+
+# Propriedades complexas que são um único objeto (as demais são listas de objetos)
+_SINGLE_OBJECTS = frozenset(
+    {
+        "changedBy",
+        "createdBy",
+        "createdByTeam",
+        "organization",
+        "owner",
+        "slaSolutionChangedBy",
+    }
+)
+_WORDS = (
+    "acesso",
+    "boleto",
+    "cadastro",
+    "contrato",
+    "erro",
+    "financeiro",
+    "integração",
+    "nota fiscal",
+    "relatório",
+    "senha",
+    "suporte",
+    "usuário",
+)
+_FIRST_DATE = datetime(2019, 1, 1)
+_DATE_RANGE = int(timedelta(days=730).total_seconds())
+
+
+class FakeMovidesk:
+    """
+    Classe que simula a API do Movidesk. Pode ser usada diretamente como transporte
+    (transport=FakeMovidesk()) ou servida por HTTP com serve().
+    """
+
+    def __init__(
+        self,
+        tickets=100,
+        persons=100,
+        services=20,
+        seed=0,
+        max_items=3,
+        token=None,
+        latency=0.0,
+        jitter=0.0,
+        rate_limit=None,
+        error_rate=0.0,
+        max_top=1000,
+    ):
+        """
+        Args:
+            tickets (int ou list): O número de tickets gerados ou a lista dos dados
+                (dicts) dos tickets. Da mesma forma para 'persons' e 'services'.
+            seed (int): A semente dos dados gerados, da latência e dos erros.
+            max_items (int): O número máximo de itens de cada lista gerada ('actions',
+                'clients'...).
+            token (str): Se informado, requisições com outro token recebem HTTP 401.
+            latency (float): A latência (em segundos) de cada resposta.
+            jitter (float): Latência aleatória (de 0 a 'jitter' segundos) somada à acima.
+            rate_limit (tuple): Opcional. O número máximo de requisições e o período
+                (em segundos): com (10, 60.0), a 11ª requisição em 60 segundos recebe
+                HTTP 429.
+            error_rate (float): A probabilidade (de 0 a 1) de uma requisição receber
+                HTTP 500.
+            max_top (int): O número máximo de respostas por requisição ('$top').
+        """
+        self.data = {
+            "tickets": _get_fixtures(Tickets, tickets, seed, max_items),
+            "persons": _get_fixtures(Persons, persons, seed, max_items),
+            "services": _get_fixtures(Services, services, seed, max_items),
+        }
+        self.token = token
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.max_top = max_top
+        self.request_count = 0
+        self._random = random.Random(seed)
+        self._recent_requests = deque()
+        self._index = dict()
+        self._lock = Lock()
+
+    def __repr__(self):
+        sizes = ", ".join(f"{name}={len(rows)}" for name, rows in self.data.items())
+        return f"<FakeMovidesk({sizes})>"
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def request(self, method, url, data=None, headers=None, stream=False, timeout=None):
+        """
+        Metodo que responde uma requisição no próprio processo (interface dos
+        transportes, veja pyvidesk.transport).
+
+        Returns:
+            (requests.Response): A resposta.
+
+        Raises:
+            requests.exceptions.ReadTimeout: Se a latência simulada passar do tempo
+                máximo de leitura.
+        """
+        # pylint: disable=unused-argument
+        status_code, response_headers, body = self.handle(
+            method, url, data, timeout=get_read_timeout(timeout)
+        )
+        return build_response(status_code, body, headers=response_headers, url=url)
+
+    def handle(self, method, url, body=None, timeout=None):
+        """
+        Metodo que responde uma requisição.
+
+        Args:
+            method (str): O método HTTP (GET, PATCH, POST ou DELETE).
+            url (str): A URL (ou apenas o caminho e os parâmetros) da requisição.
+            body (bytes): O corpo opcional da requisição.
+            timeout (float): O tempo máximo (segundos) de espera pela resposta.
+
+        Returns:
+            (tuple): O código HTTP, os cabeçalhos (dict) e o corpo (bytes) da resposta.
+
+        Raises:
+            requests.exceptions.ReadTimeout: Se a latência simulada passar do timeout.
+        """
+        with self._lock:
+            self.request_count += 1
+            delay = self.latency
+            if self.jitter:
+                delay += self._random.uniform(0, self.jitter)
+            retry_after = self._check_rate_limit()
+            failed = bool(self.error_rate) and self._random.random() < self.error_rate
+
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise ReadTimeout(f"Tempo máximo de leitura excedido ({timeout} s).")
+        if delay:
+            time.sleep(delay)
+        if retry_after is not None:
+            return _error(
+                429,
+                "Limite de requisições excedido.",
+                {"Retry-After": str(math.ceil(retry_after))},
+            )
+        if failed:
+            return _error(500, "Erro interno (simulado).")
+
+        path, _, query_string = url.partition("?")
+        name = path.rstrip("/").rsplit("/", 1)[-1]
+        params = _parse_query_string(query_string)
+        if name not in self.data:
+            return _error(404, f"A entidade '{name}' não existe.")
+        if self.token is not None and params.get("token") != self.token:
+            return _error(401, "Token inválido.")
+
+        handler = getattr(self, "_handle_" + method.lower(), None)
+        if handler is None:
+            return _error(405, f"Método {method} não permitido.")
+        try:
+            return handler(name, params, body)
+        except ValueError as error:
+            return _error(400, f"The query specified in the URI is not valid. {error}")
+
+    def _check_rate_limit(self):
+        """
+        Metodo que registra uma requisição na janela do limite de requisições.
+
+        Returns:
+            (float): Os segundos até a próxima requisição permitida, se o limite foi
+                excedido. None, do contrário.
+        """
+        if self.rate_limit is None:
+            return None
+        max_requests, period = self.rate_limit
+        now = time.monotonic()
+        while self._recent_requests and self._recent_requests[0] <= now - period:
+            self._recent_requests.popleft()
+        if len(self._recent_requests) >= max_requests:
+            return self._recent_requests[0] + period - now
+        self._recent_requests.append(now)
+        return None
+
+    def _handle_get(self, name, params, body):  # pylint: disable=unused-argument
+        properties = ENTITIES[name]._get_schema()[0]
+        select = _parse_select(params.get("$select"))
+        expand = parse_expand(params.get("$expand", ""))
+
+        if "id" in params:
+            data = self._find(name, params["id"])
+            if data is None:
+                return _error(404, f"O id {params['id']} não foi encontrado.")
+            return _json_response(_project(data, properties, select, expand))
+
+        rows = self.data[name]
+        if params.get("$filter"):
+            predicate = parse_filter(params["$filter"])
+            rows = [data for data in rows if predicate(data)]
+        if params.get("$orderby"):
+            rows = _order_by(rows, params["$orderby"])
+
+        top = int(params.get("$top", self.max_top))
+        if top > self.max_top:
+            raise ValueError(f"O valor máximo de '$top' é {self.max_top}.")
+        skip = int(params.get("$skip", 0))
+        result = [
+            _project(data, properties, select, expand)
+            for data in rows[skip : skip + top]
+        ]
+        if params.get("$count") == "true":
+            return _json_response({"@odata.count": len(rows), "value": result})
+        return _json_response(result)
+
+    def _handle_patch(self, name, params, body):
+        data = self._find(name, params.get("id"))
+        if data is None:
+            return _error(404, f"O id {params.get('id')} não foi encontrado.")
+        with self._lock:
+            data.update(json.loads(body))
+        properties = ENTITIES[name]._get_schema()[0]
+        return _json_response(_project(data, properties, None, dict()))
+
+    def _handle_post(self, name, params, body):  # pylint: disable=unused-argument
+        data = json.loads(body)
+        with self._lock:
+            rows = self.data[name]
+            if data.get("id") is None:
+                new_id = max((int(row["id"]) for row in rows), default=0) + 1
+                id_property = ENTITIES[name]._get_schema()[0]["id"]
+                data["id"] = (
+                    new_id if isinstance(id_property, IntegerProperty) else str(new_id)
+                )
+            # uma nova lista, para não alterar a lista de uma consulta em andamento
+            self.data[name] = rows + [data]
+            self._index.pop(name, None)
+        return _json_response({"id": data["id"]})
+
+    def _handle_delete(self, name, params, body):  # pylint: disable=unused-argument
+        if name == "tickets":
+            return _error(405, "A API 'tickets' não tem um método DELETE.")
+        data = self._find(name, params.get("id"))
+        if data is None:
+            return _error(404, f"O id {params.get('id')} não foi encontrado.")
+        with self._lock:
+            self.data[name] = [row for row in self.data[name] if row is not data]
+            self._index.pop(name, None)
+        return 200, dict(), b""
+
+    def _find(self, name, model_id):
+        index = self._index.get(name)
+        if index is None:
+            index = {str(data["id"]): data for data in self.data[name]}
+            self._index[name] = index
+        return index.get(model_id)
+
+
+def serve(fake, host="127.0.0.1", port=0):
+    """
+    Funcao que inicia um servidor HTTP local, numa thread, que responde com o servidor
+    falso. Para usá-lo, passe pyvidesk.transport.RequestsTransport(server.url) como
+    transporte.
+
+    Args:
+        fake (pyvidesk.fake.FakeMovidesk): O servidor falso.
+        host (str): O endereço do servidor.
+        port (int): A porta do servidor. Com 0, uma porta livre é escolhida.
+
+    Returns:
+        (http.server.ThreadingHTTPServer): O servidor, com o atributo 'url'. Use
+            server.shutdown() para encerrá-lo.
+    """
+    server = ThreadingHTTPServer((host, port), _FakeMovideskHandler)
+    server.daemon_threads = True
+    server.fake = fake
+    server.url = "http://{}:{}/public/v1/".format(*server.server_address[:2])
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class _FakeMovideskHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        status_code, headers, response_body = self.server.fake.handle(
+            self.command, self.path, body
+        )
+        self.send_response(status_code)
+        for header, value in headers.items():
+            self.send_header(header, value)
+        self.send_header("Content-Length", str(len(response_body)))
+        self.end_headers()
+        self.wfile.write(response_body)
+
+    do_GET = do_PATCH = do_POST = do_DELETE = _respond
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+def generate_fixtures(entity, count, seed=0, max_items=3):
+    """
+    Funcao que gera dados aleatórios (mas sempre os mesmos para a mesma semente) de uma
+    entidade, a partir das suas propriedades. Os IDs vão de 1 a 'count'.
+
+    Args:
+        entity (type): A classe da entidade (pyvidesk.tickets.Tickets, por exemplo).
+        count (int): O número de respostas.
+        seed (int): A semente dos dados.
+        max_items (int): O número máximo de itens de cada lista.
+
+    Returns:
+        (list): Os dados (dicts), no formato JSON do Movidesk.
+    """
+    generator = _FixtureGenerator(random.Random(seed), max_items)
+    properties = entity._get_schema()[0]
+    string_ids = not isinstance(properties["id"], IntegerProperty)
+    fixtures = []
+    for model_id in range(1, count + 1):
+        data = generator.generate_object(properties)
+        data["id"] = str(model_id) if string_ids else model_id
+        fixtures.append(data)
+    return fixtures
+
+
+def _get_fixtures(entity, value, seed, max_items):
+    if isinstance(value, int):
+        return generate_fixtures(entity, value, seed=seed, max_items=max_items)
+    return [dict(data) for data in value]
+
+
+class _FixtureGenerator:
+    def __init__(self, rng, max_items):
+        self.rng = rng
+        self.max_items = max_items
+
+    def generate_object(self, properties):
+        return {name: self.generate_value(prop) for name, prop in properties.items()}
+
+    def generate_value(self, prop):
+        rng = self.rng
+        if isinstance(prop, ComplexProperty):
+            children = _get_children(prop)
+            if prop.name_ in _SINGLE_OBJECTS:
+                return self.generate_object(children)
+            return [
+                self.generate_object(children)
+                for _ in range(rng.randint(0, self.max_items))
+            ]
+        if rng.random() < 0.05:
+            return None
+        if isinstance(prop, BooleanProperty):
+            return rng.random() < 0.5
+        if isinstance(prop, DatetimeProperty):
+            seconds = rng.randrange(_DATE_RANGE)
+            return (_FIRST_DATE + timedelta(seconds=seconds)).isoformat()
+        if isinstance(prop, TimeProperty):
+            return "{:02d}:{:02d}:00".format(rng.randrange(24), rng.randrange(60))
+        if isinstance(prop, (DecimalProperty, FloatProperty)):
+            return round(rng.uniform(0, 1000), 2)
+        if isinstance(prop, IntegerProperty):
+            return rng.randint(1, 1000)
+        if isinstance(prop, ArrayProperty):
+            return rng.sample(_WORDS, rng.randint(0, 3))
+        if prop.name_ == "id":
+            return str(rng.randint(1, 1000))
+        return f"{rng.choice(_WORDS)} {rng.randint(1, 999)}"
+
+
+_CHILDREN = dict()
+
+
+def _get_children(prop):
+    """Funcao que obtem (uma vez por classe) as propriedades de uma propriedade complexa"""
+    children = _CHILDREN.get(type(prop))
+    if children is None:
+        children = _CHILDREN[type(prop)] = prop.get_properties(as_model=True)
+    return children
+
+
+def _parse_query_string(query_string):
+    """
+    Funcao que obtem os parâmetros da URL. A biblioteca não codifica os valores (o
+    'requests' codifica apenas os caracteres inválidos), então as partes são separadas
+    por '&' antes da decodificação.
+    """
+    params = dict()
+    for part in query_string.split("&"):
+        if part:
+            key, _, value = part.partition("=")
+            params[unquote(key)] = unquote(value)
+    return params
+
+
+def _parse_select(text):
+    if not text:
+        return None
+    return {name.strip() for name in text.split(",")}
+
+
+def parse_expand(text):
+    """
+    Funcao que interpreta o parâmetro '$expand'.
+
+    Args:
+        text (str): O parâmetro: ``clients($expand=organization;$select=id),actions``.
+
+    Returns:
+        (dict): Para cada propriedade expandida, o '$select' (set ou None) e o '$expand'
+            (dict) internos.
+    """
+    expand = dict()
+    for item in _split_top_level(text, ","):
+        match = re.fullmatch(r"\s*(\w+)\s*(?:\((.*)\))?\s*", item, re.DOTALL)
+        if match is None:
+            raise ValueError(f"'$expand' inválido: {item}")
+        name, options = match.groups()
+        select, inner = None, dict()
+        for option in _split_top_level(options or "", ";"):
+            key, _, value = option.partition("=")
+            if key.strip() == "$select":
+                select = _parse_select(value)
+            elif key.strip() == "$expand":
+                inner = parse_expand(value)
+            else:
+                raise ValueError(f"Opção inválida em '$expand': {option}")
+        expand[name] = (select, inner)
+    return expand
+
+
+def _split_top_level(text, separator):
+    """Funcao que divide o texto pelo separador, ignorando os que estão entre parênteses"""
+    parts = []
+    depth = 0
+    start = 0
+    for position, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:position])
+            start = position + 1
+    parts.append(text[start:])
+    return [part for part in parts if part.strip()]
+
+
+def _project(data, properties, select, expand):
+    """
+    Funcao que aplica o '$select' e o '$expand' a uma resposta. Como no Movidesk, as
+    propriedades complexas só são retornadas quando expandidas.
+    """
+    result = dict()
+    for name, value in data.items():
+        prop = properties.get(name)
+        if isinstance(prop, ComplexProperty):
+            if name not in expand:
+                continue
+            inner_select, inner_expand = expand[name]
+            children = _get_children(prop)
+            if isinstance(value, list):
+                value = [
+                    _project(item, children, inner_select, inner_expand)
+                    for item in value
+                ]
+            elif value is not None:
+                value = _project(value, children, inner_select, inner_expand)
+        elif select is not None and name not in select:
+            continue
+        result[name] = value
+    return result
+
+
+def _order_by(rows, text):
+    for clause in reversed(text.split(",")):
+        path, _, direction = clause.strip().partition(" ")
+        rows = sorted(
+            rows,
+            key=lambda data, path=path: _sort_key(_resolve(data, path, dict())),
+            reverse=direction.strip() == "desc",
+        )
+    return rows
+
+
+def _sort_key(value):
+    return (value is None, 0 if value is None else value)
+
+
+def _json_response(value):
+    headers = {"Content-Type": "application/json; charset=utf-8"}
+    return 200, headers, get_codec().dumps(value)
+
+
+def _error(status_code, message, headers=None):
+    headers = dict(headers or {})
+    headers["Content-Type"] = "application/json; charset=utf-8"
+    return status_code, headers, json.dumps({"message": message}).encode("utf-8")
+
+
+# Interpretação do '$filter'
+
+_TOKEN = re.compile(
+    r"\s*(?:"
+    r"(?P<string>'(?:[^']|'')*')"
+    r"|(?P<datetime>\d{4}-\d{2}-\d{2}(?:T[\d:.]+)?(?:Z|[+-]\d{2}:\d{2})?)"
+    r"|(?P<time>\d{2}:\d{2}:\d{2}(?:\.\d+)?)"
+    r"|(?P<number>-?\d+(?:\.\d+)?)"
+    r"|(?P<name>[A-Za-z_]\w*(?:/[A-Za-z_]\w*)*)"
+    r"|(?P<symbol>[(),:])"
+    r")"
+)
+_COMPARISONS = {
+    "eq": lambda left, right: left == right,
+    "ne": lambda left, right: left != right,
+    "gt": lambda left, right: left > right,
+    "ge": lambda left, right: left >= right,
+    "lt": lambda left, right: left < right,
+    "le": lambda left, right: left <= right,
+}
+_FUNCTIONS = {
+    "contains": lambda value, text: text.lower() in value.lower(),
+    "startswith": lambda value, text: value.lower().startswith(text.lower()),
+    "endswith": lambda value, text: value.lower().endswith(text.lower()),
+}
+_LITERALS = {"true": True, "false": False, "null": None}
+
+
+@lru_cache(maxsize=256)
+def parse_filter(text):
+    """
+    Funcao que interpreta o parâmetro '$filter'.
+
+    Args:
+        text (str): O filtro: ``id ge 10 and clients/any(x: x/id eq '1')``.
+
+    Returns:
+        (callable): Funcao que recebe os dados (dict) de uma resposta e retorna True, se
+            a resposta passar pelo filtro.
+
+    Raises:
+        ValueError: Se o filtro for inválido.
+    """
+    parser = _FilterParser(_tokenize(text))
+    node = parser.parse_or()
+    if parser.peek() is not None:
+        raise ValueError(f"'$filter' inválido: '{parser.peek()[1]}' inesperado.")
+    return lambda data: bool(node(data, dict()))
+
+
+def _tokenize(text):
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"'$filter' inválido na posição {position}.")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position = match.end()
+    return tokens
+
+
+class _FilterParser:
+    """Analisador (descendente recursivo) do '$filter', que cria funções de avaliação"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self, offset=0):
+        if self.position + offset < len(self.tokens):
+            return self.tokens[self.position + offset]
+        return None
+
+    def next(self):
+        token = self.peek()
+        if token is None:
+            raise ValueError("'$filter' incompleto.")
+        self.position += 1
+        return token
+
+    def expect(self, value):
+        token = self.next()
+        if token[1] != value:
+            raise ValueError(
+                f"'$filter' inválido: '{value}' esperado, '{token[1]}' obtido."
+            )
+
+    def parse_or(self):
+        operands = [self.parse_and()]
+        while self.peek() == ("name", "or"):
+            self.next()
+            operands.append(self.parse_and())
+        if len(operands) == 1:
+            return operands[0]
+        return lambda data, variables: any(op(data, variables) for op in operands)
+
+    def parse_and(self):
+        operands = [self.parse_unary()]
+        while self.peek() == ("name", "and"):
+            self.next()
+            operands.append(self.parse_unary())
+        if len(operands) == 1:
+            return operands[0]
+        return lambda data, variables: all(op(data, variables) for op in operands)
+
+    def parse_unary(self):
+        if self.peek() == ("name", "not"):
+            self.next()
+            operand = self.parse_unary()
+            return lambda data, variables: not operand(data, variables)
+        return self.parse_primary()
+
+    def parse_primary(self):
+        kind, value = self.peek() or (None, None)
+        if value == "(":
+            self.next()
+            node = self.parse_or()
+            self.expect(")")
+            return node
+
+        is_call = self.peek(1) == ("symbol", "(")
+        if kind == "name" and is_call and value.rsplit("/", 1)[-1] in ("any", "all"):
+            return self.parse_lambda()
+        if kind == "name" and is_call and value in _FUNCTIONS:
+            return self.parse_function()
+
+        left = self.parse_operand()
+        kind, operator = self.next()
+        if operator == "in":
+            self.expect("(")
+            values = [self.parse_operand()]
+            while self.peek() == ("symbol", ","):
+                self.next()
+                values.append(self.parse_operand())
+            self.expect(")")
+            return lambda data, variables: any(
+                _compare(_COMPARISONS["eq"], left(data, variables), v(data, variables))
+                for v in values
+            )
+        if kind != "name" or operator not in _COMPARISONS:
+            raise ValueError(f"'$filter' inválido: operador '{operator}' desconhecido.")
+        compare = _COMPARISONS[operator]
+        right = self.parse_operand()
+        return lambda data, variables: _compare(
+            compare, left(data, variables), right(data, variables)
+        )
+
+    def parse_lambda(self):
+        path, operator = self.next()[1].rsplit("/", 1)
+        self.expect("(")
+        kind, variable = self.next()
+        if kind != "name":
+            raise ValueError(f"'$filter' inválido: variável '{variable}' inválida.")
+        self.expect(":")
+        predicate = self.parse_or()
+        self.expect(")")
+        aggregate = any if operator == "any" else all
+
+        def evaluate(data, variables):
+            items = _resolve(data, path, variables) or ()
+            return aggregate(
+                predicate(data, dict(variables, **{variable: item})) for item in items
+            )
+
+        return evaluate
+
+    def parse_function(self):
+        function = _FUNCTIONS[self.next()[1]]
+        self.expect("(")
+        value = self.parse_operand()
+        self.expect(",")
+        text = self.parse_operand()
+        self.expect(")")
+
+        def evaluate(data, variables):
+            left, right = value(data, variables), text(data, variables)
+            if not isinstance(left, str) or not isinstance(right, str):
+                return False
+            return function(left, right)
+
+        return evaluate
+
+    def parse_operand(self):
+        kind, value = self.next()
+        if kind == "string":
+            literal = value[1:-1].replace("''", "'")
+        elif kind == "datetime":
+            literal = _parse_datetime(value)
+        elif kind == "number":
+            literal = float(value) if "." in value else int(value)
+        elif kind == "time":
+            literal = value
+        elif kind == "name" and value in _LITERALS:
+            literal = _LITERALS[value]
+        elif kind == "name":
+            return lambda data, variables: _resolve(data, value, variables)
+        else:
+            raise ValueError(f"'$filter' inválido: '{value}' inesperado.")
+        return lambda data, variables: literal
+
+
+def _resolve(data, path, variables):
+    """Funcao que obtem o valor de uma propriedade (``owner/id``, ``x/id``...)"""
+    names = path.split("/")
+    if names[0] in variables:
+        value = variables[names[0]]
+        names = names[1:]
+    else:
+        value = data
+    for name in names:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(name)
+    return value
+
+
+def _compare(compare, left, right):
+    if isinstance(right, datetime) and isinstance(left, str):
+        left = _parse_datetime(left)
+    elif isinstance(left, datetime) and isinstance(right, str):
+        right = _parse_datetime(right)
+    if compare is not _COMPARISONS["eq"] and compare is not _COMPARISONS["ne"]:
+        if left is None or right is None:
+            return False
+    try:
+        return compare(left, right)
+    except TypeError:
+        return False
+
+
+def _parse_datetime(text):
+    """Funcao que converte uma data ISO-8601 num datetime (UTC, sem fuso horário)"""
+    if text.endswith("Z"):
+        text = text[:-1]
+    value = isoparse(text)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
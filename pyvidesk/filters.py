@@ -0,0 +1,359 @@
+"""
+Módulo que representa os filtros ($filter) do Odata como uma pequena árvore de expressões.
+
+As comparações das propriedades (``properties["id"] == 1``, ``has()``, ``contains()``...),
+os operadores lambda (pyvidesk.lambdas) e a classe pyvidesk.query.Q criam objetos deste
+módulo, que só são transformados em texto na hora de montar a URL. Assim, os filtros
+podem ser combinados livremente e simplificados antes do envio:
+
+- operadores 'and'/'or' aninhados são achatados: ``(a or (b or c))`` vira ``(a or b or c)``;
+- cláusulas repetidas são removidas: ``(a or a)`` vira ``a``;
+- opcionalmente (pyvidesk.config.FILTER_FOLD_EQ_INTO_IN), vários 'eq' na mesma propriedade
+  dentro de um 'or' viram um único 'in': ``(id eq 1 or id eq 2)`` vira ``id in (1, 2)``.
+
+Exemplo de uso:
+
+>>> from pyvidesk.tickets import Tickets
+>>> from pyvidesk.query import Q
+
+>>> properties = Tickets(token="my_token").get_properties()
+>>> my_filter = (Q(properties["id"] == 1) | Q(properties["id"] == 2)) & Q(
+...     properties["subject"].contains("Teste")
+... )
+>>> print(my_filter)
+... ((id eq 1 or id eq 2) and contains(subject, 'Teste'))
+"""
+
+
+class Expression:
+    """
+    Classe base de todas as expressões.
+
+    Uma expressão é igual a outra expressão (ou a uma string) que tenha o mesmo texto.
+    """
+
+    __slots__ = ("_text",)
+
+    def __init__(self):
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            self._text = self._render()
+        return self._text
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}({self})>"
+
+    def __eq__(self, other):
+        if isinstance(other, (Expression, str)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, (Expression, str)):
+            return str(self) != str(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __and__(self, other):
+        if not isinstance(other, (Expression, str)):
+            return NotImplemented  # Q (pyvidesk.query) combina pelo lado direito
+        return And.combine(self, to_expression(other))
+
+    def __or__(self, other):
+        if not isinstance(other, (Expression, str)):
+            return NotImplemented
+        return Or.combine(self, to_expression(other))
+
+    def __invert__(self):
+        return Not(self)
+
+    def _render(self):
+        """Metodo que transforma a expressão em texto (sintaxe do Odata)"""
+        raise NotImplementedError()
+
+    def _render_operand(self):
+        """
+        Metodo que transforma a expressão em texto quando ela é operando de 'not'.
+        Comparações precisam de parênteses; funções e operadores lambda, não.
+        """
+        return str(self)
+
+    def simplify(self, fold_in=False):
+        """
+        Metodo que simplifica a expressão.
+
+        Args:
+            fold_in (bool): True, para transformar vários 'eq' na mesma propriedade dentro
+                de um 'or' num único 'in'.
+
+        Returns:
+            (Expression): A expressão simplificada.
+        """
+        return self
+
+
+class Raw(Expression):
+    """Expressão "crua", definida diretamente por uma string"""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        super().__init__()
+        self.text = text
+
+    def _render(self):
+        return self.text
+
+
+class Comparison(Expression):
+    """Comparação de uma propriedade com um valor: ``id eq 1``"""
+
+    __slots__ = ("path", "operator", "value")
+
+    def __init__(self, path, operator, value):
+        """
+        Args:
+            path (str): O nome completo da propriedade (``owner/id``, por exemplo).
+            operator (str): O operador (eq, ne, gt, ge, lt ou le).
+            value (str): O valor, já no formato do Odata (``'texto'``, ``true``...).
+        """
+        super().__init__()
+        self.path = path
+        self.operator = operator
+        self.value = value
+
+    def _render(self):
+        return f"{self.path} {self.operator} {self.value}"
+
+    def _render_operand(self):
+        return f"({self})"
+
+
+class In(Expression):
+    """Comparação de uma propriedade com uma lista de valores: ``id in (1, 2)``"""
+
+    __slots__ = ("path", "values")
+
+    def __init__(self, path, values):
+        super().__init__()
+        self.path = path
+        self.values = tuple(values)
+
+    def _render(self):
+        return f"{self.path} in ({', '.join(str(value) for value in self.values)})"
+
+    def _render_operand(self):
+        return f"({self})"
+
+
+class Function(Expression):
+    """Chamada de função do Odata: ``contains(subject, 'texto')``"""
+
+    __slots__ = ("name", "path", "value")
+
+    def __init__(self, name, path, value):
+        super().__init__()
+        self.name = name
+        self.path = path
+        self.value = value
+
+    def _render(self):
+        return f"{self.name}({self.path}, {self.value})"
+
+
+class Lambda(Expression):
+    """Operador lambda do Odata: ``clients/any(x: x/id eq '1')``"""
+
+    __slots__ = ("path", "operator", "variable", "predicate")
+
+    def __init__(self, path, operator, variable, predicate):
+        """
+        Args:
+            path (str): O nome completo da propriedade que é uma lista.
+            operator (str): O operador lambda (any ou all).
+            variable (str): O nome da variável do operador (x, y...).
+            predicate (Expression): A expressão aplicada a cada item da lista.
+        """
+        super().__init__()
+        self.path = path
+        self.operator = operator
+        self.variable = variable
+        self.predicate = predicate
+
+    def _render(self):
+        return f"{self.path}/{self.operator}({self.variable}: {self.predicate})"
+
+    def simplify(self, fold_in=False):
+        return Lambda(
+            self.path,
+            self.operator,
+            self.variable,
+            self.predicate.simplify(fold_in=fold_in),
+        )
+
+
+class Not(Expression):
+    """Negação de uma expressão: ``not tags/any(x: x eq 'tag')``"""
+
+    __slots__ = ("operand",)
+
+    def __init__(self, operand):
+        super().__init__()
+        self.operand = operand
+
+    def _render(self):
+        return f"not {self.operand._render_operand()}"
+
+    def simplify(self, fold_in=False):
+        if isinstance(self.operand, Not):
+            return self.operand.operand.simplify(fold_in=fold_in)
+        return Not(self.operand.simplify(fold_in=fold_in))
+
+
+class _Logical(Expression):
+    """Classe base dos operadores 'and' e 'or'"""
+
+    __slots__ = ("operands",)
+    keyword = None
+
+    def __init__(self, operands):
+        super().__init__()
+        self.operands = tuple(operands)
+
+    @classmethod
+    def combine(cls, left, right):
+        """
+        Metodo que combina duas expressões com este operador. Operandos que já usam o
+        mesmo operador são achatados, para que combinações em sequência
+        (``my_filter |= ...``) não criem árvores muito profundas.
+        """
+        operands = []
+        for operand in (left, right):
+            if type(operand) is cls:
+                operands.extend(operand.operands)
+            else:
+                operands.append(operand)
+        return cls(operands)
+
+    def _render(self):
+        return "(" + f" {self.keyword} ".join(str(op) for op in self.operands) + ")"
+
+    def render_without_parentheses(self):
+        return f" {self.keyword} ".join(str(op) for op in self.operands)
+
+    def simplify(self, fold_in=False):
+        operands = []
+        seen = set()
+        for operand in self._flatten():
+            operand = operand.simplify(fold_in=fold_in)
+            if type(operand) is type(self):
+                simplified = operand.operands
+            else:
+                simplified = (operand,)
+            for op in simplified:
+                if op not in seen:
+                    seen.add(op)
+                    operands.append(op)
+
+        operands = self._fold(operands, fold_in=fold_in)
+        if len(operands) == 1:
+            return operands[0]
+        return self.__class__(operands)
+
+    def _flatten(self):
+        for operand in self.operands:
+            if type(operand) is type(self):
+                yield from operand._flatten()
+            else:
+                yield operand
+
+    def _fold(self, operands, fold_in):  # pylint: disable=unused-argument
+        return operands
+
+
+class And(_Logical):
+    """Conjunção de expressões: ``(a and b)``"""
+
+    __slots__ = ()
+    keyword = "and"
+
+
+class Or(_Logical):
+    """Disjunção de expressões: ``(a or b)``"""
+
+    __slots__ = ()
+    keyword = "or"
+
+    def _fold(self, operands, fold_in):
+        """
+        Metodo que transforma vários 'eq' (ou 'in') na mesma propriedade num único 'in'.
+        O 'in' fica na posição do primeiro operando da propriedade.
+        """
+        if not fold_in:
+            return operands
+
+        values_by_path = dict()
+        for operand in operands:
+            if _is_equality(operand):
+                values = operand.values if isinstance(operand, In) else (operand.value,)
+                values_by_path.setdefault(operand.path, []).extend(values)
+
+        folded = []
+        for operand in operands:
+            if not _is_equality(operand):
+                folded.append(operand)
+            elif operand.path in values_by_path:
+                values = tuple(dict.fromkeys(values_by_path.pop(operand.path)))
+                if len(values) == 1:
+                    folded.append(Comparison(operand.path, "eq", values[0]))
+                else:
+                    folded.append(In(operand.path, values))
+        return folded
+
+
+def _is_equality(expression):
+    return isinstance(expression, In) or (
+        isinstance(expression, Comparison) and expression.operator == "eq"
+    )
+
+
+def to_expression(value):
+    """
+    Funcao que transforma um filtro numa expressão.
+
+    Args:
+        value (Expression ou str): O filtro.
+
+    Returns:
+        (Expression): A expressão.
+    """
+    if isinstance(value, Expression):
+        return value
+    if isinstance(value, str):
+        return Raw(value)
+    raise TypeError(value)
+
+
+def render_filters(filters, fold_in=False):
+    """
+    Funcao que transforma os filtros de uma consulta no texto do parâmetro '$filter'.
+    Os filtros são concatenados com o operador 'and' e simplificados.
+
+    Args:
+        filters (tuple): As expressões (ou strings) dos filtros.
+        fold_in (bool): True, para transformar vários 'eq' na mesma propriedade dentro
+            de um 'or' num único 'in'.
+
+    Returns:
+        (str): O texto do filtro.
+    """
+    expression = And(to_expression(value) for value in filters).simplify(
+        fold_in=fold_in
+    )
+    if isinstance(expression, And):
+        return expression.render_without_parentheses()
+    return str(expression)
@@ -0,0 +1,182 @@
+"""
+Módulo com os eventos (hooks) das requisições feitas pela classe Api.
+
+Os eventos são:
+    before_request: antes de cada tentativa de requisição.
+    after_response: após cada resposta do servidor (bem sucedida ou não).
+    on_error: quando a requisição falha (erro de conexão ou resposta com código de erro
+        que não será repetida).
+    on_retry: quando a requisição falha e será repetida (veja pyvidesk.config.RETRIES).
+
+Cada função registrada recebe um RequestEvent, com a entidade, o método HTTP, a URL (sem
+o token), o código HTTP, a latência, os bytes e o erro, quando houver.
+
+Exemplo de uso:
+
+>>> from pyvidesk import Pyvidesk
+>>> from pyvidesk.hooks import Hooks
+
+>>> hooks = Hooks()
+>>> @hooks.register("after_response")
+... def log(event):
+...     print(event.method, event.url, event.status, f"{event.latency:.3f}s")
+
+>>> Pyvidesk(token="my_token", hooks=hooks).tickets.get_by_id(3)
+... GET https://api.movidesk.com/public/v1/tickets?token=<TOKEN>&id=3 200 0.215s
+"""
+
+from threading import Lock
+
+EVENTS = ("before_request", "after_response", "on_error", "on_retry")
+
+
+class RequestEvent:
+    """Classe com as informações de um evento de uma requisição"""
+
+    __slots__ = (
+        "name",
+        "entity",
+        "method",
+        "url",
+        "attempt",
+        "status",
+        "latency",
+        "bytes",
+        "error",
+        "delay",
+    )
+
+    def __init__(
+        self,
+        name,
+        entity,
+        method,
+        url,
+        attempt=0,
+        status=None,
+        latency=None,
+        bytes=None,  # pylint: disable=redefined-builtin
+        error=None,
+        delay=None,
+    ):
+        """
+        Args:
+            name (str): O nome do evento (veja EVENTS).
+            entity (str): O nome da entidade (tickets, persons...).
+            method (str): O método HTTP.
+            url (str): A URL da requisição, com o token substituído por "<TOKEN>".
+            attempt (int): A tentativa (0, a primeira).
+            status (int): O código HTTP da resposta, se houver.
+            latency (float): A duração da tentativa (segundos), exceto em before_request.
+            bytes (int): Os bytes (descomprimidos) do corpo da resposta, se conhecidos.
+                None em modo "streaming", a menos que o servidor informe o tamanho.
+            error (Exception): O erro de conexão, se houver.
+            delay (float): Em on_retry, a espera (segundos) até a próxima tentativa.
+        """
+        self.name = name
+        self.entity = entity
+        self.method = method
+        self.url = url
+        self.attempt = attempt
+        self.status = status
+        self.latency = latency
+        self.bytes = bytes
+        self.error = error
+        self.delay = delay
+
+    def __repr__(self):
+        return (
+            f"<RequestEvent {self.name}: {self.method} {self.entity} "
+            f"(status={self.status}, latency={self.latency})>"
+        )
+
+
+class Hooks:
+    """Classe com as funções registradas em cada evento das requisições"""
+
+    def __init__(self):
+        self._listeners = {event: () for event in EVENTS}
+        self._lock = Lock()
+
+    def __repr__(self):
+        counts = ", ".join(
+            f"{event}={len(listeners)}" for event, listeners in self._listeners.items()
+        )
+        return f"<Hooks: {counts}>"
+
+    def __bool__(self):
+        return any(self._listeners.values())
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def register(self, event, func=None):
+        """
+        Metodo que registra uma função num evento. Sem a função, retorna um decorator.
+
+        Args:
+            event (str): O nome do evento (veja EVENTS).
+            func (callable): A função, que recebe um RequestEvent.
+
+        Returns:
+            (callable): A função.
+        """
+        if event not in EVENTS:
+            raise ValueError(
+                f"'{event}' não é um evento válido. Eventos válidos: {', '.join(EVENTS)}"
+            )
+        if func is None:
+            return lambda func: self.register(event, func)
+        with self._lock:
+            # tuplas: emit() percorre os registros sem o lock
+            self._listeners[event] += (func,)
+        return func
+
+    def unregister(self, event, func):
+        """Metodo que remove uma função de um evento"""
+        with self._lock:
+            self._listeners[event] = tuple(
+                listener for listener in self._listeners[event] if listener != func
+            )
+
+    def subscribe(self, listener):
+        """
+        Metodo que registra os métodos de um objeto com os nomes dos eventos (como
+        pyvidesk.metrics.MetricsCollector).
+
+        Returns:
+            () O objeto.
+        """
+        for event in EVENTS:
+            func = getattr(listener, event, None)
+            if func is not None:
+                self.register(event, func)
+        return listener
+
+    def unsubscribe(self, listener):
+        """Metodo que remove os métodos registrados com subscribe()"""
+        for event in EVENTS:
+            func = getattr(listener, event, None)
+            if func is not None:
+                self.unregister(event, func)
+
+    def emit(self, event, **infos):
+        """
+        Metodo que chama as funções de um evento.
+
+        Args:
+            event (str): O nome do evento.
+            infos (): Os argumentos de RequestEvent.
+        """
+        listeners = self._listeners[event]
+        if not listeners:
+            return
+        request_event = RequestEvent(event, **infos)
+        for listener in listeners:
+            listener(request_event)
@@ -0,0 +1,119 @@
+"""
+Módulo que decodifica um array JSON à medida que os bytes chegam.
+
+Em vez de esperar toda a resposta e decodificá-la de uma vez, cada elemento do array
+principal é decodificado (e entregue) assim que seus bytes estiverem completos. Cada
+elemento é decodificado pelo decodificador (em C) do módulo json, a partir do ponto em
+que o elemento anterior terminou.
+
+Exemplo de uso:
+
+>>> from pyvidesk.jsonstream import iter_array
+
+>>> chunks = [b'[{"id": 1, "subject": "[a', b']"}, {"id"', b": 2}]"]
+>>> list(iter_array(chunks))
+... [{'id': 1, 'subject': '[a]'}, {'id': 2}]
+"""
+
+import codecs
+import json
+import re
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def iter_array(chunks):
+    """
+    Funcao que decodifica os elementos do array JSON principal à medida que os bytes
+    chegam. Se o JSON não for um array (um único objeto, por exemplo), ele é
+    decodificado inteiro e entregue como um único elemento.
+
+    Args:
+        chunks (iterable): Os pedaços (bytes, em UTF-8) do JSON, na ordem.
+
+    yields:
+        (): Cada elemento do array.
+
+    Raises:
+        ValueError: Se o JSON for inválido ou estiver incompleto.
+    """
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    state = _ArrayState()
+
+    for chunk in chunks:
+        state.feed(text_decoder.decode(chunk))
+        yield from state.parse(final=False)
+
+    state.feed(text_decoder.decode(b"", final=True))
+    yield from state.parse(final=True)
+
+
+class _ArrayState:
+    """Estado da decodificação de um array JSON recebido aos pedaços"""
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.expecting = "start"  # start, first, element, separator, value ou end
+        self.retry_at = 0  # tamanho do buffer para tentar de novo um elemento incompleto
+
+    def feed(self, text):
+        # descarta o que já foi decodificado
+        self.retry_at -= self.pos
+        self.buffer = self.buffer[self.pos :] + text
+        self.pos = 0
+
+    def parse(self, final):
+        if self.expecting == "value":
+            if final:
+                yield json.loads(self.buffer)
+            return
+        if not final and len(self.buffer) < self.retry_at:
+            return
+
+        buffer = self.buffer
+        while True:
+            self.pos = _WHITESPACE.match(buffer, self.pos).end()
+            if self.pos == len(buffer):
+                break
+
+            char = buffer[self.pos]
+            if self.expecting == "end":
+                raise ValueError(f"JSON inválido: dados após o array ({self.pos}).")
+            if self.expecting == "start":
+                if char != "[":
+                    self.expecting = "value"
+                    if final:
+                        yield json.loads(buffer)
+                    return
+                self.expecting = "first"
+                self.pos += 1
+            elif char == "]" and self.expecting in ("first", "separator"):
+                self.expecting = "end"
+                self.pos += 1
+            elif self.expecting == "separator":
+                if char != ",":
+                    raise ValueError(f"JSON inválido: ',' esperada ({self.pos}).")
+                self.expecting = "element"
+                self.pos += 1
+            else:
+                try:
+                    value, end = _DECODER.raw_decode(buffer, self.pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    end = None
+                # um elemento completo é seguido por ',' ou ']'; um número no fim do
+                # buffer pode continuar no próximo pedaço
+                if end is None or (end == len(buffer) and not final):
+                    # só tenta de novo quando o elemento pendente dobrar de tamanho, para
+                    # que elementos muito grandes não sejam decodificados várias vezes
+                    self.retry_at = len(buffer) + (len(buffer) - self.pos)
+                    break
+                yield value
+                self.pos = end
+                self.expecting = "separator"
+
+        if final and self.expecting != "end":
+            raise ValueError("JSON incompleto: o array não foi fechado.")
@@ -3,25 +3,46 @@ Módulo que implementa operadores lambda do Odata.
 http://docs.oasis-open.org/odata/odata/v4.01/odata-v4.01-part2-url-conventions.html#_Toc31361024
 """
 
+from .filters import Comparison, Lambda
+
+
+def _split_comparison(comparison):
+    """
+    Funcao que obtem as propriedades, o operador e o valor de uma comparação.
+
+    Args:
+        comparison (pyvidesk.filters.Comparison ou str): A comparação.
+            Ex.: client/id eq '1'
+
+    Returns:
+        (tuple): A lista com o nome de cada propriedade, o operador e o valor.
+    """
+    if isinstance(comparison, Comparison):
+        return comparison.path.split("/"), comparison.operator, comparison.value
+
+    properties, operator, *value = str(comparison).split()
+    return properties.split("/"), operator, " ".join(value)
+
+
+def _get_path(variable, properties):
+    return "/".join((variable, *properties))
+
 
 def _lambda_operator_base(string, lambda_operator):
     """
     Funcao base que constroi uma consulta usando um operador lambda do Odata.
 
     Args:
-        string (str): String "cru" que serve de base para construir o operador.
-            Ex.: client/id eq '1'
+        string (pyvidesk.filters.Comparison ou str): Comparação que serve de base para
+            construir o operador. Ex.: client/id eq '1'
         lambda_operator (str): O operador lambda.
 
     Returns:
-        (str): A consulta.
+        (pyvidesk.filters.Lambda): A consulta.
     """
-    properties, operator, *value = string.split()
-    value = " ".join(value)
-    properties = properties.split("/")
-    prop = properties.pop(0)
-
-    return f"{prop}/{lambda_operator}(x: x/{'/'.join(properties)} {operator} {value})"
+    (prop, *properties), operator, value = _split_comparison(string)
+    predicate = Comparison(_get_path("x", properties), operator, value)
+    return Lambda(prop, lambda_operator, "x", predicate)
 
 
 def Any(string):
@@ -37,21 +58,19 @@ def _nested_lambda_operator_base(string, lambda_operator1, lambda_operator2):
     Funcao base que constroi uma consulta usando dois operadores lambda do Odata.
 
     Args:
-        string (str): String "cru" que serve de base para construir o operador.
+        string (pyvidesk.filters.Comparison ou str): Comparação que serve de base para
+            construir o operador.
             Ex.: customFieldValues/items/customFieldItem eq 'MGSSUSTR6-06R'
         lambda_operator1 (str): O primeiro operador lambda.
         lambda_operator1 (str): O segundo operador lambda.
 
     Returns:
-        (str): A consulta.
+        (pyvidesk.filters.Lambda): A consulta.
     """
-    properties, operator, *value = string.split()
-    value = " ".join(value)
-    p1, p2, *p3 = properties.split("/")
-    return (
-        f"{p1}/{lambda_operator1}(x: x/{p2}/{lambda_operator2}"
-        f"(y: y/{'/'.join(p3)} {operator} {value}))"
-    )
+    (p1, p2, *p3), operator, value = _split_comparison(string)
+    predicate = Comparison(_get_path("y", p3), operator, value)
+    inner = Lambda(_get_path("x", (p2,)), lambda_operator2, "y", predicate)
+    return Lambda(p1, lambda_operator1, "x", inner)
 
 
 def AnyAny(string):
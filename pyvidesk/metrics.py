@@ -0,0 +1,242 @@
+"""
+Módulo com um coletor de métricas das requisições, em memória, alimentado pelos eventos
+da classe Api (veja pyvidesk.hooks).
+
+Para cada entidade e método HTTP, o coletor conta as requisições (por código HTTP), os
+erros, as repetições e os bytes recebidos, e monta um histograma das latências. As
+métricas podem ser exportadas como dicionário ou no formato de texto do Prometheus, sem
+depender de nenhum serviço externo.
+
+Exemplo de uso:
+
+>>> from pyvidesk import Pyvidesk
+>>> from pyvidesk.hooks import Hooks
+>>> from pyvidesk.metrics import MetricsCollector
+
+>>> hooks = Hooks()
+>>> metrics = MetricsCollector().attach(hooks)
+>>> Pyvidesk(token="my_token", hooks=hooks).tickets.query.top(10).all()
+>>> metrics.as_dict()["tickets"]["GET"]["requests"]
+... 1
+>>> print(metrics.to_prometheus())
+... # TYPE pyvidesk_requests_total counter
+... pyvidesk_requests_total{entity="tickets",method="GET",status="200"} 1
+... ...
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from threading import Lock
+
+# Limites (segundos) das faixas do histograma de latências
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class MetricsCollector:
+    """Classe que acumula as métricas das requisições por entidade e método HTTP"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets (tuple): Os limites (segundos) das faixas do histograma de latências.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._lock = Lock()
+        self.reset()
+
+    def __repr__(self):
+        return f"<MetricsCollector: {sum(self.requests.values())} requests>"
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def reset(self):
+        """Metodo que zera as métricas"""
+        with self._lock:
+            self.requests = Counter()  # (entidade, método, código HTTP)
+            self.errors = Counter()  # (entidade, método, código HTTP ou nome do erro)
+            self.retries = Counter()  # (entidade, método)
+            self.bytes = Counter()  # (entidade, método)
+            # (entidade, método): [contagem de cada faixa + a faixa +Inf, soma]
+            self.latencies = dict()
+
+    def attach(self, hooks):
+        """
+        Metodo que registra o coletor nos eventos.
+
+        Args:
+            hooks (pyvidesk.hooks.Hooks): Os eventos das requisições.
+
+        Returns:
+            (MetricsCollector): O coletor.
+        """
+        return hooks.subscribe(self)
+
+    def after_response(self, event):
+        key = (event.entity, event.method)
+        with self._lock:
+            self.requests[key + (event.status,)] += 1
+            if event.bytes is not None:
+                self.bytes[key] += event.bytes
+            histogram = self.latencies.get(key)
+            if histogram is None:
+                histogram = self.latencies[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            histogram[bisect_left(self.buckets, event.latency)] += 1
+            histogram[-1] += event.latency
+
+    def on_error(self, event):
+        error = event.status if event.error is None else type(event.error).__name__
+        with self._lock:
+            self.errors[(event.entity, event.method, error)] += 1
+
+    def on_retry(self, event):
+        with self._lock:
+            self.retries[(event.entity, event.method)] += 1
+
+    def as_dict(self):
+        """
+        Metodo que exporta as métricas como dicionário.
+
+        Returns:
+            (dict): As métricas de cada entidade e método HTTP:
+                {entidade: {método: {"requests", "statuses", "errors", "retries",
+                "bytes", "latency": {"count", "sum", "buckets"}}}}. As faixas do
+                histograma são cumulativas, como no Prometheus.
+        """
+        metrics = dict()
+
+        def get(entity, method):
+            return metrics.setdefault(entity, dict()).setdefault(
+                method,
+                {
+                    "requests": 0,
+                    "statuses": dict(),
+                    "errors": dict(),
+                    "retries": 0,
+                    "bytes": 0,
+                    "latency": {"count": 0, "sum": 0.0, "buckets": dict()},
+                },
+            )
+
+        with self._lock:
+            for (entity, method, status), count in self.requests.items():
+                values = get(entity, method)
+                values["requests"] += count
+                values["statuses"][status] = count
+            for (entity, method, error), count in self.errors.items():
+                get(entity, method)["errors"][error] = count
+            for (entity, method), count in self.retries.items():
+                get(entity, method)["retries"] = count
+            for (entity, method), count in self.bytes.items():
+                get(entity, method)["bytes"] = count
+            for (entity, method), histogram in self.latencies.items():
+                buckets = self._cumulative(histogram)
+                get(entity, method)["latency"] = {
+                    "count": buckets["+Inf"],
+                    "sum": histogram[-1],
+                    "buckets": buckets,
+                }
+        return metrics
+
+    def to_prometheus(self, prefix="pyvidesk"):
+        """
+        Metodo que exporta as métricas no formato de texto do Prometheus.
+
+        Args:
+            prefix (str): O prefixo dos nomes das métricas.
+
+        Returns:
+            (str): As métricas.
+        """
+        lines = []
+
+        def add(name, kind, help_, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for suffix, labels, value in samples:
+                labels = ",".join(
+                    f'{label}="{_escape(label_value)}"' for label, label_value in labels
+                )
+                lines.append(f"{prefix}_{name}{suffix}{{{labels}}} {value}")
+
+        with self._lock:
+            add(
+                "requests_total",
+                "counter",
+                "Respostas recebidas do servidor.",
+                [
+                    ("", _labels(entity, method, status=status), count)
+                    for (entity, method, status), count in sorted(
+                        self.requests.items(), key=_sort_key
+                    )
+                ],
+            )
+            add(
+                "errors_total",
+                "counter",
+                "Requisições que falharam (código HTTP ou nome do erro).",
+                [
+                    ("", _labels(entity, method, error=error), count)
+                    for (entity, method, error), count in sorted(
+                        self.errors.items(), key=_sort_key
+                    )
+                ],
+            )
+            add(
+                "retries_total",
+                "counter",
+                "Requisições repetidas.",
+                [
+                    ("", _labels(entity, method), count)
+                    for (entity, method), count in sorted(self.retries.items())
+                ],
+            )
+            add(
+                "response_bytes_total",
+                "counter",
+                "Bytes (descomprimidos) recebidos do servidor.",
+                [
+                    ("", _labels(entity, method), count)
+                    for (entity, method), count in sorted(self.bytes.items())
+                ],
+            )
+            samples = []
+            for (entity, method), histogram in sorted(self.latencies.items()):
+                labels = _labels(entity, method)
+                for le, count in self._cumulative(histogram).items():
+                    samples.append(("_bucket", labels + (("le", le),), count))
+                samples.append(("_sum", labels, histogram[-1]))
+                samples.append(("_count", labels, sum(histogram[:-1])))
+            add(
+                "request_duration_seconds",
+                "histogram",
+                "Latência das requisições (segundos).",
+                samples,
+            )
+        return "\n".join(lines) + "\n"
+
+    def _cumulative(self, histogram):
+        buckets = dict()
+        total = 0
+        for bucket, count in zip(self.buckets + ("+Inf",), histogram):
+            total += count
+            buckets[bucket] = total
+        return buckets
+
+
+def _labels(entity, method, **labels):
+    return (("entity", entity), ("method", method)) + tuple(labels.items())
+
+
+def _sort_key(item):
+    return tuple(str(value) for value in item[0])
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -54,6 +54,13 @@ from .exceptions import (
 )
 from .properties import ComplexProperty
 
+_MISSING = object()  # valor de uma propriedade que não está no estado do modelo
+
+_INTERNAL_SLOTS = ("_entity", "_properties", "_name", "_original", "_extra")
+_INTERNAL_ATTRS = frozenset(_INTERNAL_SLOTS)
+
+_MODEL_CLASSES = dict()
+
 
 class Model:
     """
@@ -79,9 +86,21 @@ class Model:
     >>> persons = Persons("my_token")
     >>> person = persons.get_by_id(1)
     >>> person.delete()
+
+    Cada instância é, na verdade, de uma subclasse gerada (e guardada em cache) para a
+    entidade ou propriedade complexa, com um slot para cada propriedade. Assim, ler uma
+    propriedade é uma simples leitura de slot, e os modelos não carregam dicionários
+    por instância.
     """
 
     __is_complex__ = False
+    __slots__ = _INTERNAL_SLOTS
+
+    def __new__(cls, *args, **kwargs):  # pylint: disable=unused-argument
+        if not cls.__dict__.get("_generated", False):
+            entity = kwargs["entity"] if "entity" in kwargs else args[0]
+            cls = _get_model_class(cls, entity)
+        return super().__new__(cls)
 
     def __init__(self, entity, name_=None, **properties):
         """
@@ -94,44 +113,126 @@ class Model:
             properties (kwargs): As propriedades e valores obtidos pela query.
 
 
-            _state (dict): Representa o estado da query no servidor do Movidesk.
+            _original (dict): Os valores do servidor das propriedades alteradas pelo
+                usuário. Os slots guardam sempre o valor atual.
+            _extra (dict): Propriedades retornadas pelo servidor que ainda não são
+                suportadas por esta biblioteca.
         """
         self._entity = entity
-        self._entity_properties = self._entity.get_properties(
-            as_model=self.__is_complex__
-        )
         self._properties = properties
         self._name = name_
-        self._state = dict()
+        self._original = None
+        self._extra = None
+        self._load_state(properties)
+
+    def _load_state(self, properties):
+        """
+        Metodo que desserializa as propriedades obtidas do servidor no estado do modelo.
 
-        for prop, prop_value in self._properties.items():
+        Args:
+            properties (dict): As propriedades e valores obtidos pela query.
+        """
+        for prop, prop_value in properties.items():
             try:
                 property_obj = self._entity_properties[prop]
             except KeyError:
-                self._state[
-                    prop
-                ] = "Propriedade ainda não suportada por esta biblioteca."
+                if self._extra is None:
+                    self._extra = dict()
+                self._extra[prop] = (
+                    "Propriedade ainda não suportada por esta biblioteca."
+                )
                 continue
 
             if isinstance(property_obj, ComplexProperty):
                 if isinstance(prop_value, dict):
-                    self._state[prop] = _ComplexPropertyModel(
-                        entity=property_obj,
-                        name_=prop,
-                        **prop_value,
+                    self._set_state(
+                        prop,
+                        _ComplexPropertyModel(
+                            entity=property_obj,
+                            name_=prop,
+                            **prop_value,
+                        ),
                     )
                 if isinstance(prop_value, list):
-                    self._state[prop] = []
-                    for values in prop_value:
-                        self._state[prop].append(
+                    self._set_state(
+                        prop,
+                        [
                             _ComplexPropertyModel(
                                 entity=property_obj,
                                 name_=prop[:-1],
                                 **values,
                             )
-                        )
+                            for values in prop_value
+                        ],
+                    )
                 continue
-            self._state[prop] = property_obj.deserialize(value=prop_value)
+            self._set_state(prop, property_obj.deserialize(value=prop_value))
+
+    def _merge(self, properties):
+        """
+        Metodo que mescla propriedades obtidas por uma nova consulta neste modelo.
+        Usado pela sessão (pyvidesk.session.Session) para manter uma única instância
+        por (entidade, id).
+
+        Args:
+            properties (dict): As propriedades e valores obtidos pela query.
+        """
+        self._properties.update(properties)
+        self._load_state(properties)
+
+    def _refresh(self, properties):
+        """
+        Metodo que descarta o estado e as alterações do modelo e carrega as propriedades.
+
+        Args:
+            properties (dict): As propriedades e valores obtidos pela query.
+        """
+        for prop in self._entity_properties:
+            try:
+                object.__delattr__(self, prop)
+            except AttributeError:
+                pass
+        self._properties = properties
+        self._original = None
+        self._extra = None
+        self._load_state(properties)
+
+    def _get_slot(self, prop):
+        """Metodo que obtem o valor atual da propriedade, sem passar por __getattr__"""
+        try:
+            return object.__getattribute__(self, prop)
+        except AttributeError:
+            return _MISSING
+
+    def _get_state(self, prop):
+        """Metodo que obtem o valor da propriedade no servidor (sem as alterações)"""
+        if self._original is not None and prop in self._original:
+            return self._original[prop]
+        return self._get_slot(prop)
+
+    def _set_state(self, prop, value):
+        """Metodo que altera o valor da propriedade no servidor, mantendo as alterações"""
+        if self._original is not None and prop in self._original:
+            self._original[prop] = value
+        else:
+            object.__setattr__(self, prop, value)
+
+    @property
+    def _state(self):
+        """
+        Representa o estado da query no servidor do Movidesk.
+
+        Returns:
+            state (dict): Dicionário com os valores (desserializados) das propriedades.
+        """
+        state = dict()
+        for prop in self._entity_properties:
+            value = self._get_state(prop)
+            if value is not _MISSING:
+                state[prop] = value
+        if self._extra:
+            state.update(self._extra)
+        return state
 
     def __repr__(self):
         if "id" in self._properties:
@@ -147,14 +248,8 @@ class Model:
         return f"<{self.__class__.__name__} for {name}({properties_text})>"
 
     def __setattr__(self, attr, value):
-        if attr in (
-            "_entity",
-            "_entity_properties",
-            "_properties",
-            "_name",
-            "_state",
-        ):
-            super().__setattr__(attr, value)
+        if attr in _INTERNAL_ATTRS:
+            object.__setattr__(self, attr, value)
             return
 
         if attr not in self._entity_properties:
@@ -173,43 +268,71 @@ class Model:
                 "que permite apenas leitura!"
             )
 
-        super().__setattr__(attr, value)
+        self._assign(attr, value)
+
+    def _assign(self, attr, value):
+        """
+        Metodo que altera o valor atual da propriedade, guardando o valor do servidor
+        (copy-on-write) para que a alteração possa ser detectada.
+        """
+        if self._original is None:
+            self._original = dict()
+        if attr not in self._original:
+            self._original[attr] = self._get_slot(attr)
+        object.__setattr__(self, attr, value)
 
     def __getattr__(self, attr):
-        if attr in self.__dict__:
-            return getattr(self, attr)
+        """
+        Chamado apenas quando o slot da propriedade não foi preenchido pela query.
+        """
+        if attr.startswith("_"):
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{attr}'"
+            )
+
+        if self._extra is not None and attr in self._extra:
+            return self._extra[attr]
+
         try:
-            return self._state[attr]
+            entity = self._entity_properties[attr]
         except KeyError as wrong_property:
-            if attr in self._entity_properties:
-                entity = self._entity_properties[attr]
-                if isinstance(entity, ComplexProperty):
-                    self._state[attr] = _EmptyComplexPropertyModel(
-                        entity=entity,
-                        name_=attr,
-                    )
-                    return self._state[attr]
-                return
             raise PyvideskPropertyNotValidError(
                 param=attr, class_=self._entity
             ) from wrong_property
 
+        if isinstance(entity, ComplexProperty):
+            value = _EmptyComplexPropertyModel(entity=entity, name_=attr)
+            self._set_state(attr, value)
+            return value
+        return None
+
     @property
     def _state_raw(self):
         """
         Metodo que retorna o estado do modelo no formato JSON. Útil para o método save().
         """
-        state_raw = dict()
-        for prop, prop_value in self._state.items():
+        return self._get_raw(current=False)
+
+    def _get_raw(self, current):
+        """
+        Metodo que retorna os valores do modelo no formato JSON.
+
+        Args:
+            current (bool): True, para os valores atuais (com as alterações do usuário).
+                False, para os valores do servidor.
+        """
+        raw = dict()
+        for prop in self._entity_properties:
+            prop_value = self._get_slot(prop) if current else self._get_state(prop)
+            if prop_value is _MISSING:
+                continue
             if isinstance(prop_value, Model):
-                state_raw[prop] = prop_value._state
-            elif _is_list_of_complex_propeties(prop_value, class_=self.__class__):
-                state_raw[prop] = []
-                for p in prop_value:
-                    state_raw[prop].append(p._state_raw)
+                raw[prop] = prop_value._get_raw(current=current)
+            elif _is_list_of_complex_propeties(prop_value, class_=Model):
+                raw[prop] = [p._get_raw(current=current) for p in prop_value]
             else:
-                state_raw[prop] = prop_value
-        return state_raw
+                raw[prop] = prop_value
+        return raw
 
     def _get_changes(self):
         """
@@ -217,47 +340,64 @@ class Model:
         Ou seja, esse metodo nao obtem as mudancas em propriedades complexas.
         """
         changes = dict()
-        for prop, prop_value in self.__dict__.items():
-            if prop in self._entity_properties:
-                if prop in self._state:
-                    if prop_value != self._state.get(prop, prop_value):
-                        changes[prop] = self.__dict__[prop]
-                else:
-                    changes[prop] = self.__dict__[prop]
+        if self._original:
+            for prop, original_value in self._original.items():
+                prop_value = self._get_slot(prop)
+                if original_value is _MISSING or prop_value != original_value:
+                    changes[prop] = prop_value
         return changes
 
     def _get_all_changes(self):
         """
         Metodo que obtem todas as mudancas do modelo, incluindo as propriedades complexas.
+
+        As mudancas numa lista de propriedades complexas com 'id' (actions,
+        timeAppointments...) são uma lista com apenas os "filhos" alterados, cada um
+        com o seu 'id'. Já as listas sem 'id' (customFieldValues, por exemplo) não
+        permitem identificar o "filho" alterado, logo a lista inteira é a mudanca.
         """
         changes = self._get_changes()
-        for prop, prop_value in self._state.items():
-            if prop in self._entity_properties:
-                if isinstance(prop_value, Model):
-                    _changes = prop_value._get_changes()
-                    if _changes:
-                        changes[prop] = _changes
-                        continue
-
-                if _is_list_of_complex_propeties(prop_value, class_=self.__class__):
-                    _changes = _get_changes_on_children_properties(prop_value)
-                    if _changes:
-                        changes[prop] = _changes
-                        continue
-
-                if prop in self._state:
-                    if prop_value != self._state.get(prop, prop_value):
-                        changes[prop] = self.__dict__[prop]
-                else:
-                    changes[prop] = self.__dict__[prop]
+        for prop in self._entity_properties:
+            prop_value = self._get_state(prop)
+            if isinstance(prop_value, Model):
+                _changes = prop_value._get_all_changes()
+                if _changes:
+                    changes[prop] = _changes
+
+            elif _is_list_of_complex_propeties(prop_value, class_=Model):
+                if prop_value and "id" not in prop_value[0]._entity_properties:
+                    if any(p._get_all_changes() for p in prop_value):
+                        changes[prop] = prop_value
+                    continue
+
+                _changes = _get_changes_on_children_properties(prop_value)
+                if _changes:
+                    changes[prop] = _changes
         return changes
 
+    def _is_assigned(self, prop):
+        """Metodo que checa se o valor da propriedade foi alterado pelo usuário"""
+        return self._original is not None and prop in self._original
+
+    def _commit(self):
+        """
+        Metodo que aplica todas as mudancas do modelo (e dos seus "filhos") ao estado.
+        """
+        self._original = None
+        for prop in self._entity_properties:
+            prop_value = self._get_slot(prop)
+            if isinstance(prop_value, Model):
+                prop_value._commit()
+            elif _is_list_of_complex_propeties(prop_value, class_=Model):
+                for p in prop_value:
+                    p._commit()
+
     def _do_change(self, prop_name, prop_changes):
         """
-        Metodo que prepara as mudancas para a requisicao PATCH e realiza
-        tais mudancas no modelo.
+        Metodo que aplica as mudancas ao estado do modelo, depois de preparadas para a
+        requisicao PATCH.
 
-        Essas mudancas afetam apenas o atributo _state, logo, se chamarmos o metodo
+        Essas mudancas nao afetam o atributo _properties, logo, se chamarmos o metodo
         raw() ainda obteremos os valores do modelo sem as mudancas.
 
         Apos a conclusao do metodo save(), raw() retorna os valores com as mudancas
@@ -265,18 +405,70 @@ class Model:
 
         Args:
             prop_name (str): O nome da propriedade;
-            prop_changes (str, list, int, datetime, _ComplexProperty): As mudancas da propriedade.
+            prop_changes (str, list, int, datetime, dict): As mudancas da propriedade.
         """
-        if _is_list_of_complex_propeties(prop_changes):
-            prop_models = {
-                prop_model.id: prop_model for prop_model in self._state[prop_name]
-            }
+        if self._is_assigned(prop_name):
+            del self._original[prop_name]  # o valor atual passa a ser o do servidor
+            if not self._original:
+                self._original = None
+            return
+
+        prop_value = self._get_state(prop_name)
+        if isinstance(prop_value, Model):
+            for subprop_name, subprop_change in prop_changes.items():
+                prop_value._do_change(subprop_name, subprop_change)
+
+        elif _is_list_of_complex_propeties(prop_changes, class_=Model):
+            for prop_model in prop_changes:
+                prop_model._commit()
+
+        elif _is_list_of_complex_propeties(prop_value, class_=Model):
+            prop_models = {prop_model.id: prop_model for prop_model in prop_value}
             for prop_change in prop_changes:
+                prop_change = dict(prop_change)
                 prop_obj = prop_models[prop_change.pop("id")]
                 for subprop_name, subprop_change in prop_change.items():
                     prop_obj._do_change(subprop_name, subprop_change)
-        else:
-            self._state[prop_name] = prop_changes
+
+    def _serialize_changes(self, changes):
+        """
+        Metodo que serializa as mudancas obtidas por _get_all_changes().
+
+        Nas listas de propriedades complexas com 'id', apenas os "filhos" alterados são
+        serializados, cada um com o seu 'id' e apenas com as propriedades alteradas.
+
+        Args:
+            changes (dict): As mudancas do modelo.
+
+        Returns:
+            data (dict): Dicionario com as mudancas serializadas.
+        """
+        data = dict()
+        for prop, prop_changes in changes.items():
+            property_obj = self._entity_properties[prop]
+            prop_value = self._get_state(prop)
+
+            if not self._is_assigned(prop):
+                if isinstance(prop_value, Model):
+                    data[prop] = prop_value._serialize_changes(prop_changes)
+                    continue
+
+                if _is_list_of_complex_propeties(
+                    prop_value, class_=Model
+                ) and _is_list_of_complex_propeties(prop_changes):
+                    prop_models = {p.id: p for p in prop_value}
+                    data[prop] = [
+                        _serialize_child_changes(prop_models[change["id"]], change)
+                        for change in prop_changes
+                    ]
+                    continue
+
+            if isinstance(prop_changes, Model):
+                prop_changes = prop_changes._get_raw(current=True)
+            elif _is_list_of_complex_propeties(prop_changes, class_=Model):
+                prop_changes = [p._get_raw(current=True) for p in prop_changes]
+            data[prop] = property_obj.serialize(value=prop_changes)
+        return data
 
     def _serialize_all_changes(self):
         """
@@ -286,21 +478,11 @@ class Model:
         Returns:
             changes (dict): Dicionario com as propriedades que serao alteradas
         """
-        changes = dict()
-
-        for prop, prop_changes in self._get_all_changes().items():
+        changes = self._get_all_changes()
+        data = self._serialize_changes(changes)
+        for prop, prop_changes in changes.items():
             self._do_change(prop, prop_changes)
-            prop_value = getattr(self, prop)
-
-            if isinstance(prop_value, Model):
-                prop_value = prop_value._state_raw
-
-            if _is_list_of_complex_propeties(prop_value, class_=self.__class__):
-                prop_value = [p._state_raw for p in prop_value]
-            property_obj = self._entity_properties[prop]
-            changes[prop] = property_obj.serialize(value=prop_value)
-
-        return changes
+        return data
 
     def get_properties(self):
         return self._entity.get_properties()
@@ -316,9 +498,11 @@ class Model:
         changes = self._serialize_all_changes()
         if changes:
             self._entity.api.patch(changes=changes, model_id=self.id)
+            if self._entity.session is not None:
+                self._entity.session.expire(self)
             model = self._entity.get_by_id(self.id)
-            self._properties = model._properties
-            self._state = model._state
+            if model is not self:
+                self._refresh(model._properties)
 
     def delete(self):
         if not self.id:
@@ -327,7 +511,9 @@ class Model:
             )
 
         self._entity.api.delete(model_id=self.id)
-        self._properties = self._state = dict()
+        if self._entity.session is not None:
+            self._entity.session.discard(self)
+        self._refresh(dict())
         return self._entity.get_empty_model()
 
     def raw(self):
@@ -337,6 +523,7 @@ class Model:
 
 class _ComplexPropertyModel(Model):
     __is_complex__ = True
+    __slots__ = ()
 
     def save(self):
         pass
@@ -369,15 +556,11 @@ class EmptyModel(Model):
     >>> ticket.create()
     """
 
+    __slots__ = ()
+
     def __setattr__(self, attr, value):
-        if attr in (
-            "_entity",
-            "_entity_properties",
-            "_properties",
-            "_name",
-            "_state",
-        ):
-            super().__setattr__(attr, value)
+        if attr in _INTERNAL_ATTRS:
+            object.__setattr__(self, attr, value)
             return
 
         if attr not in self._entity_properties:
@@ -390,13 +573,7 @@ class EmptyModel(Model):
                 correct_type=self._entity_properties[attr].alias,
             )
 
-        self.__dict__[attr] = value
-
-    def _do_change(self, prop_name, prop_changes):
-        """
-        Sobscrevendo este método da classe Model.
-        """
-        self._state[prop_name] = prop_changes
+        self._assign(attr, value)
 
     def create(self):
         """
@@ -421,11 +598,47 @@ class EmptyModel(Model):
 
 class _EmptyComplexPropertyModel(EmptyModel):
     __is_complex__ = True
+    __slots__ = ()
 
     def create(self):
         pass
 
 
+def _get_model_class(cls, entity):
+    """
+    Funcao que obtem a subclasse de 'cls' gerada para a entidade (ou propriedade
+    complexa), com um slot para cada uma de suas propriedades.
+    As subclasses são criadas apenas uma vez e guardadas em cache.
+
+    Args:
+        cls (type): Model ou uma de suas subclasses.
+        entity (): A entidade (Tickets, Persons...) ou a propriedade complexa do modelo.
+
+    Returns:
+        (type): A subclasse gerada.
+    """
+    full_name = entity.full_name if isinstance(entity, ComplexProperty) else None
+    key = (cls, entity.__class__, full_name)
+    try:
+        return _MODEL_CLASSES[key]
+    except KeyError:
+        pass
+
+    entity_properties = entity.get_properties(as_model=cls.__is_complex__)
+    model_class = type(
+        cls.__name__,
+        (cls,),
+        {
+            "__slots__": tuple(entity_properties),
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "_entity_properties": entity_properties,
+            "_generated": True,
+        },
+    )
+    return _MODEL_CLASSES.setdefault(key, model_class)
+
+
 def _get_changes_on_children_properties(values):
     """Funcao que obtem as mudancas das propriedades complexas"""
     changes = []
@@ -436,6 +649,17 @@ def _get_changes_on_children_properties(values):
     return changes
 
 
+def _serialize_child_changes(model, changes):
+    """
+    Funcao que serializa as mudancas de um "filho" de uma lista de propriedades
+    complexas, mantendo o seu 'id'.
+    """
+    changes = {prop: value for prop, value in changes.items() if prop != "id"}
+    data = {"id": model._entity_properties["id"].serialize(value=model.id)}
+    data.update(model._serialize_changes(changes))
+    return data
+
+
 def _is_list_of_complex_propeties(property_obj, class_=dict):
     return isinstance(property_obj, list) and all(
         isinstance(p, class_) for p in property_obj
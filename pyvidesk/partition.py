@@ -0,0 +1,325 @@
+"""
+Módulo que divide uma consulta em janelas de datas, obtidas em paralelo.
+
+Cada janela é uma consulta independente (``prop >= início and prop < fim``) e, com um
+checkpoint, as janelas concluídas não são obtidas de novo: se uma janela falhar, basta
+executar a varredura novamente para obter apenas as janelas que faltam. O checkpoint
+guarda a impressão digital da consulta de cada janela e recusa (PyvideskCheckpointError)
+ser retomado com outra consulta.
+
+Exemplo de uso:
+
+>>> from datetime import datetime, timedelta
+>>> from pyvidesk.partition import Checkpoint
+>>> from pyvidesk.tickets import Tickets
+
+>>> tickets = Tickets(token="my_token")
+>>> ticket_properties = tickets.get_properties()
+>>> partitioned_query = tickets.query.select("id", "subject").partition_by(
+...     ticket_properties["createdDate"],
+...     start=datetime(2020, 1, 1),
+...     end=datetime(2021, 1, 1),
+...     window=timedelta(days=7),
+... )
+>>> checkpoint = Checkpoint("tickets_2020.json")
+>>> for window, models in partitioned_query.scan(max_workers=4, checkpoint=checkpoint):
+...     print(window.key, len(models))
+... 2020-01-08T00:00:00/2020-01-15T00:00:00 312
+... 2020-01-01T00:00:00/2020-01-08T00:00:00 287
+"""
+
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import datetime
+import hashlib
+import json
+import os
+from threading import Lock
+import time
+
+from . import config
+from .exceptions import (
+    PyvideskCheckpointError,
+    PyvideskDeadlineError,
+    PyvideskError,
+    PyvideskPartitionError,
+)
+from .properties import DatetimeProperty
+from .records import create_record
+
+
+class Window(namedtuple("Window", ("start", "end", "query"))):
+    """Janela [start, end) de uma consulta particionada"""
+
+    __slots__ = ()
+
+    @property
+    def key(self):
+        """Identificador da janela, usado pelo checkpoint"""
+        return f"{self.start.isoformat()}/{self.end.isoformat()}"
+
+    @property
+    def fingerprint(self):
+        """Impressão digital da consulta da janela, conferida pelo checkpoint"""
+        return query_fingerprint(self.query)
+
+    def fetch(self):
+        """
+        Metodo que obtem os dados "crus" (JSON) de todas as respostas da janela, página
+        a página (a consulta é dividida, se a URL for maior que o tamanho máximo).
+
+        Returns:
+            (list): Os dados de cada resposta.
+        """
+        data = []
+        for page in self.query._start_deadline()._iter_pages_data(config.PAGE_SIZE):
+            data.extend(page)
+        return data
+
+
+class PartitionedQuery:
+    """
+    Classe que representa uma consulta dividida em janelas de datas que não se sobrepõem.
+    Não deve ser usada diretamente, mas por meio do método Query.partition_by().
+    """
+
+    def __init__(self, query, prop, start, end, window):
+        """
+        Args:
+            query (pyvidesk.query.Query): A consulta base. Seus filtros, '$select' e
+                '$expand' valem para todas as janelas.
+            prop (pyvidesk.properties.DatetimeProperty): A propriedade de data usada nas
+                janelas ('createdDate' ou 'lastUpdate', por exemplo).
+            start (datetime.datetime ou datetime.date): O início (inclusive) do período.
+            end (datetime.datetime ou datetime.date): O fim (exclusive) do período.
+            window (datetime.timedelta): O tamanho de cada janela.
+        """
+        if not isinstance(prop, DatetimeProperty):
+            raise TypeError(f"'{prop}' não é uma propriedade de data.")
+        if window <= datetime.timedelta(0):
+            raise ValueError("O tamanho da janela deve ser positivo.")
+
+        self.query = query
+        self.prop = prop
+        self.windows = tuple(
+            _create_windows(query, prop, _as_datetime(start), _as_datetime(end), window)
+        )
+
+    def __iter__(self):
+        return iter(self.windows)
+
+    def __len__(self):
+        return len(self.windows)
+
+    def __repr__(self):
+        return f"<PartitionedQuery for {self.query.entity} ({len(self)} windows)>"
+
+    def scan(self, max_workers=1, checkpoint=None, records=False):
+        """
+        Metodo que obtem as janelas, até 'max_workers' ao mesmo tempo. As janelas são
+        retornadas à medida que são concluídas, não necessariamente em ordem.
+
+        Uma janela só é marcada como concluída no checkpoint depois de processada, ou
+        seja, quando a próxima janela é pedida. Janelas que falham não interrompem as
+        demais; ao final, um erro PyvideskPartitionError lista as janelas que falharam.
+
+        Se a consulta base tiver prazo (Query.deadline()), ele vale para a varredura
+        inteira: quando termina, nenhuma janela nova é iniciada e, ao final, um erro
+        PyvideskDeadlineError informa as janelas concluídas e pendentes. Com o
+        checkpoint, basta executar a varredura novamente para obter as que faltam.
+
+        Args:
+            max_workers (int): O número de janelas obtidas ao mesmo tempo.
+            checkpoint (pyvidesk.partition.Checkpoint): Checkpoint opcional. Janelas já
+                concluídas são ignoradas.
+            records (bool): True, para obter registros imutáveis (pyvidesk.records) em
+                vez de modelos.
+
+        yields:
+            (tuple): A janela (pyvidesk.partition.Window) e a lista de modelos (ou
+                registros) da janela.
+
+        Raises:
+            PyvideskCheckpointError: Se o checkpoint registrar janelas de outra consulta.
+            PyvideskDeadlineError: Se o prazo da consulta terminar antes de todas as
+                janelas serem obtidas.
+            PyvideskPartitionError: Se alguma janela falhar.
+        """
+        deadline = self.query._start_deadline()._settings.get("deadline_at")
+        pending = iter(
+            [
+                window
+                for window in self.windows
+                if checkpoint is None
+                or not checkpoint.is_done(window.key, window.fingerprint)
+            ]
+        )
+        running = dict()
+        errors = dict()
+        expired = []  # janelas interrompidas pelo prazo
+        completed = 0
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+            def submit_next():
+                if deadline is not None and (expired or time.monotonic() >= deadline):
+                    return
+                window = next(pending, None)
+                if window is not None:
+                    fetch = window.fetch
+                    if deadline is not None:
+                        # a chave da janela (checkpoint) não muda, apenas a consulta
+                        fetch = window._replace(
+                            query=window.query._new_setting("deadline_at", deadline)
+                        ).fetch
+                    running[executor.submit(fetch)] = window
+
+            for _ in range(max_workers):
+                submit_next()
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    window = running.pop(future)
+                    submit_next()
+                    try:
+                        data = future.result()
+                    except PyvideskDeadlineError:
+                        expired.append(window)
+                        continue
+                    except PyvideskError as error:
+                        errors[window] = error
+                        continue
+
+                    if records:
+                        items = [create_record(self.query.entity, d) for d in data]
+                    else:
+                        items = [window.query._create_model(d) for d in data]
+                    yield window, items
+                    completed += 1
+                    if checkpoint is not None:
+                        checkpoint.mark_done(window.key, window.fingerprint)
+
+        not_started = sum(1 for _ in pending)
+        if expired or deadline is not None and not_started:
+            raise PyvideskDeadlineError(
+                progress={
+                    "completed": completed,
+                    "pending": len(expired) + not_started,
+                    "failed": len(errors),
+                }
+            )
+        if errors:
+            raise PyvideskPartitionError(errors)
+
+
+class Checkpoint:
+    """
+    Classe que guarda, num arquivo JSON, as chaves das janelas já concluídas e a
+    impressão digital da consulta de cada uma (veja query_fingerprint()).
+    O arquivo é reescrito de forma atômica a cada janela concluída.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): O caminho do arquivo. Se não existir, será criado.
+        """
+        self.path = path
+        self._lock = Lock()
+        self._done = dict()  # chave: impressão digital (None, se desconhecida)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                done = json.load(file)
+            # arquivos antigos têm apenas a lista das chaves
+            self._done.update(dict.fromkeys(done) if isinstance(done, list) else done)
+
+    def __repr__(self):
+        return f"<Checkpoint({self.path}) with {len(self._done)} windows done>"
+
+    def is_done(self, key, fingerprint=None):
+        """
+        Metodo que checa se uma janela foi concluída.
+
+        Args:
+            key (str): A chave da janela.
+            fingerprint (str): A impressão digital da consulta da janela. Se informada,
+                deve ser a mesma registrada na conclusão.
+
+        Returns:
+            (bool): True, se a janela foi concluída.
+
+        Raises:
+            PyvideskCheckpointError: Se a janela foi concluída com outra consulta.
+        """
+        if key not in self._done:
+            return False
+        done_fingerprint = self._done[key]
+        if (
+            None not in (fingerprint, done_fingerprint)
+            and fingerprint != done_fingerprint
+        ):
+            raise PyvideskCheckpointError(
+                f"O checkpoint '{self.path}' registra a janela '{key}' de outra consulta "
+                "(entidade, propriedade ou filtros diferentes). Use outro arquivo ou "
+                "Checkpoint.reset()."
+            )
+        return True
+
+    def mark_done(self, key, fingerprint=None):
+        """
+        Metodo que registra uma janela concluída.
+
+        Args:
+            key (str): A chave da janela.
+            fingerprint (str): A impressão digital opcional da consulta da janela.
+        """
+        with self._lock:
+            self._done[key] = fingerprint
+            self._write()
+
+    def reset(self):
+        """Metodo que esquece todas as janelas concluídas"""
+        with self._lock:
+            self._done.clear()
+            self._write()
+
+    def _write(self):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self._done, file, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+
+def query_fingerprint(query):
+    """
+    Funcao que obtem a impressão digital de uma consulta: um hash da entidade e das
+    opções enviadas ao servidor (filtros, '$select', '$expand'...), sem o token.
+
+    Args:
+        query (pyvidesk.query.Query): A consulta.
+
+    Returns:
+        (str): A impressão digital.
+    """
+    text = json.dumps(
+        [query.entity.api.entity_name, query._get_options()],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _create_windows(query, prop, start, end, window):
+    current = start
+    while current < end:
+        window_end = min(current + window, end)
+        window_query = query.filter(prop >= current).filter(prop < window_end)
+        yield Window(current, window_end, window_query)
+        current = window_end
+
+
+def _as_datetime(value):
+    if isinstance(value, datetime.datetime):
+        return value
+    return datetime.datetime.combine(value, datetime.time.min)
@@ -0,0 +1,328 @@
+"""
+Módulo com o perfil (profiling) das consultas: divide o tempo (e, opcionalmente, a
+memória líquida, alocada menos liberada) entre as fases da obtenção das respostas e
+conta os modelos criados.
+
+As fases são:
+    network: o envio das requisições e a leitura das respostas (pyvidesk.transport).
+    decode: a decodificação do JSON (pyvidesk.codec e pyvidesk.jsonstream).
+    deserialize: a desserialização dos valores das propriedades (datas, decimais...).
+    model: a criação dos modelos (pyvidesk.model) e registros (pyvidesk.records), sem a
+        desserialização.
+    other: o restante (montagem das consultas, código do usuário...).
+
+Os tempos são exclusivos: o tempo da desserialização, por exemplo, não é contado na
+criação dos modelos. Enquanto o perfil está ativo, as funções de cada fase são
+substituídas por versões medidas, em todas as threads; fora dele, não há custo algum.
+
+Exemplo de uso:
+
+>>> import pyvidesk
+>>> tickets = pyvidesk.Pyvidesk(token="my_token").tickets
+
+>>> with pyvidesk.profile(memory=True) as profile:
+...     tickets.query.expand("actions").top(1000).all()
+>>> print(profile.report())
+... Perfil: 2.412 s, 1 requisição(ões)
+... fase                    tempo (s)       %   líquido (KiB)
+... rede                        0.850   35.2%         12001.3
+... decodificação               0.140    5.8%          9876.5
+... desserialização             0.901   37.4%          1020.8
+... construção de modelos       0.480   19.9%         23110.2
+... outros                      0.041    1.7%             3.1
+... modelos: Tickets=1000
+... modelos aninhados: action=4817
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock, local
+import time
+import tracemalloc
+
+from . import api, properties, query
+from .model import Model
+
+PHASES = ("network", "decode", "deserialize", "model", "other")
+_PHASE_LABELS = {
+    "network": "rede",
+    "decode": "decodificação",
+    "deserialize": "desserialização",
+    "model": "construção de modelos",
+    "other": "outros",
+}
+
+_active = None
+_active_lock = Lock()
+
+
+class Profile:
+    """Classe que acumula o tempo e a memória de cada fase e os modelos criados"""
+
+    def __init__(self, memory=False):
+        """
+        Args:
+            memory (bool): True, para medir também a memória líquida (alocada menos
+                liberada) de cada fase com o tracemalloc (mais lento). Pode ser negativa
+                numa fase que libera o que outra alocou.
+        """
+        self.memory = memory
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.allocations = dict.fromkeys(PHASES, 0)
+        self.models = Counter()
+        self.nested_models = Counter()
+        self.records = Counter()
+        self.requests = 0
+        self.wall_time = 0.0
+        self._lock = Lock()
+        self._local = local()
+        self._start = None
+        self._stop_tracing = False
+
+    def __repr__(self):
+        return f"<Profile: {self.wall_time:.3f} s, {self.requests} requests>"
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = [["other", time.perf_counter(), self._traced()]]
+        return stack
+
+    def _traced(self):
+        return tracemalloc.get_traced_memory()[0] if self.memory else 0
+
+    def _charge(self, frame, now, traced):
+        """Metodo que soma o tempo e a memória desde a última marca à fase do frame"""
+        with self._lock:
+            self.times[frame[0]] += now - frame[1]
+            self.allocations[frame[0]] += traced - frame[2]
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Metodo (context manager) que mede uma fase. O tempo da fase em que ela é aberta
+        é pausado até o fim desta.
+
+        Args:
+            name (str): O nome da fase (veja PHASES).
+        """
+        stack = self._stack()
+        now, traced = time.perf_counter(), self._traced()
+        self._charge(stack[-1], now, traced)
+        stack.append([name, now, traced])
+        try:
+            yield
+        finally:
+            now, traced = time.perf_counter(), self._traced()
+            self._charge(stack.pop(), now, traced)
+            stack[-1][1:] = [now, traced]
+
+    def _begin(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._stop_tracing = True
+        self._start = time.perf_counter()
+        self._local.stack = None
+        self._stack()
+
+    def _end(self):
+        now, traced = time.perf_counter(), self._traced()
+        self._charge(self._stack()[-1], now, traced)
+        self.wall_time = now - self._start
+        if self._stop_tracing:
+            tracemalloc.stop()
+        # o tempo das outras threads pode se sobrepor ao desta; "other" é o que sobra
+        measured = sum(value for phase, value in self.times.items() if phase != "other")
+        self.times["other"] = max(0.0, self.wall_time - measured)
+
+    def as_dict(self):
+        """
+        Metodo que exporta o perfil como dicionário.
+
+        Returns:
+            (dict): O tempo total, o número de requisições, o tempo (segundos) e a memória
+                líquida (bytes) de cada fase e os modelos e registros criados.
+        """
+        return {
+            "wall_time": self.wall_time,
+            "requests": self.requests,
+            "times": dict(self.times),
+            "allocations": dict(self.allocations) if self.memory else None,
+            "models": dict(self.models),
+            "nested_models": dict(self.nested_models),
+            "records": dict(self.records),
+        }
+
+    def report(self):
+        """
+        Metodo que monta um relatório legível do perfil.
+
+        Returns:
+            (str): O relatório.
+        """
+        lines = [f"Perfil: {self.wall_time:.3f} s, {self.requests} requisição(ões)"]
+        header = f"{'fase':<24}{'tempo (s)':>10}{'%':>8}"
+        if self.memory:
+            header += f"{'líquido (KiB)':>16}"
+        lines.append(header)
+        for phase in PHASES:
+            seconds = self.times[phase]
+            percent = 100 * seconds / self.wall_time if self.wall_time else 0.0
+            line = f"{_PHASE_LABELS[phase]:<24}{seconds:>10.3f}{percent:>7.1f}%"
+            if self.memory:
+                line += f"{self.allocations[phase] / 1024:>16.1f}"
+            lines.append(line)
+        for label, counter in (
+            ("modelos", self.models),
+            ("modelos aninhados", self.nested_models),
+            ("registros", self.records),
+        ):
+            if counter:
+                counts = ", ".join(f"{name}={count}" for name, count in counter.items())
+                lines.append(f"{label}: {counts}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile(memory=False):
+    """
+    Funcao (context manager) que mede as consultas feitas dentro do bloco.
+
+    Args:
+        memory (bool): True, para medir também a memória líquida de cada fase.
+
+    yields:
+        (Profile): O perfil, completo após o fim do bloco.
+
+    Raises:
+        RuntimeError: Se já houver um perfil ativo.
+    """
+    global _active  # pylint: disable=global-statement
+    with _active_lock:
+        if _active is not None:
+            raise RuntimeError("Já existe um perfil ativo (pyvidesk.profile()).")
+        _active = current = Profile(memory=memory)
+        patches = _patch(current)
+    current._begin()  # pylint: disable=protected-access
+    try:
+        yield current
+    finally:
+        current._end()  # pylint: disable=protected-access
+        with _active_lock:
+            for owner, name, original in patches:
+                setattr(owner, name, original)
+            _active = None
+
+
+def _patch(current):
+    """
+    Funcao que substitui as funções de cada fase por versões medidas.
+
+    Returns:
+        (list): O dono, o nome e a função original de cada substituição.
+    """
+    patches = []
+
+    def replace(owner, name, wrap):
+        original = owner.__dict__[name]
+        patches.append((owner, name, original))
+        setattr(owner, name, wrap(original))
+
+    def timed(phase, wrap_generator=False):
+        wrap = _timed_generator if wrap_generator else _timed
+        return lambda func: wrap(current, phase, func)
+
+    replace(
+        api.Api,
+        "_request",
+        lambda func: _timed(current, "network", _count_requests(current, func)),
+    )
+    replace(api, "_iter_content", timed("network", wrap_generator=True))
+    replace(api.Api, "get", timed("decode"))
+    replace(api.Api, "iter_get", timed("decode", wrap_generator=True))
+    replace(api.Api, "patch", timed("decode"))
+    replace(api.Api, "post", timed("decode"))
+    replace(query.Query, "_create_model", timed("model"))
+    replace(
+        query,
+        "create_record",
+        lambda func: _timed(current, "model", _count_records(current, func)),
+    )
+    replace(Model, "__init__", lambda func: _count_models(current, func))
+    for property_class in _subclasses(properties.PropertyBase):
+        if "deserialize" in property_class.__dict__:
+            replace(property_class, "deserialize", timed("deserialize"))
+    return patches
+
+
+def _timed(current, phase, func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with current.phase(phase):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _timed_generator(current, phase, func):
+    """
+    Funcao que mede um gerador apenas enquanto ele produz cada valor (o tempo de quem o
+    consome fica nas outras fases).
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        iterator = func(*args, **kwargs)
+        try:
+            while True:
+                with current.phase(phase):
+                    try:
+                        value = next(iterator)
+                    except StopIteration:
+                        return
+                yield value
+        finally:
+            with current.phase(phase):
+                iterator.close()
+
+    return wrapper
+
+
+def _count_requests(current, func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with current._lock:  # pylint: disable=protected-access
+            current.requests += 1
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _count_records(current, func):
+    @wraps(func)
+    def wrapper(entity, data):
+        with current._lock:  # pylint: disable=protected-access
+            current.records[type(entity).__name__] += 1
+        return func(entity, data)
+
+    return wrapper
+
+
+def _count_models(current, func):
+    @wraps(func)
+    def wrapper(self, entity, name_=None, **values):
+        with current._lock:  # pylint: disable=protected-access
+            if self.__is_complex__:
+                current.nested_models[name_] += 1
+            else:
+                current.models[type(entity).__name__] += 1
+        func(self, entity, name_, **values)
+
+    return wrapper
+
+
+def _subclasses(cls):
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _subclasses(subclass)
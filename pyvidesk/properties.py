@@ -22,6 +22,8 @@ from decimal import Decimal
 
 from dateutil.parser import parse as dateutil_parse
 
+from .filters import Comparison, Function, Lambda
+
 
 class PropertyBase:
     """
@@ -114,28 +116,22 @@ class PropertyBase:
         return f"{self.full_name} desc"
 
     def __eq__(self, other):
-        value = self.escape_value(other)
-        return f"{self.full_name} eq {value}"
+        return Comparison(self.full_name, "eq", self.escape_value(other))
 
     def __ne__(self, other):
-        value = self.escape_value(other)
-        return f"{self.full_name} ne {value}"
+        return Comparison(self.full_name, "ne", self.escape_value(other))
 
     def __ge__(self, other):
-        value = self.escape_value(other)
-        return f"{self.full_name} ge {value}"
+        return Comparison(self.full_name, "ge", self.escape_value(other))
 
     def __gt__(self, other):
-        value = self.escape_value(other)
-        return f"{self.full_name} gt {value}"
+        return Comparison(self.full_name, "gt", self.escape_value(other))
 
     def __le__(self, other):
-        value = self.escape_value(other)
-        return f"{self.full_name} le {value}"
+        return Comparison(self.full_name, "le", self.escape_value(other))
 
     def __lt__(self, other):
-        value = self.escape_value(other)
-        return f"{self.full_name} lt {value}"
+        return Comparison(self.full_name, "lt", self.escape_value(other))
 
 
 class IntegerProperty(PropertyBase):
@@ -179,7 +175,7 @@ class StringProperty(PropertyBase):
         return f"'{value}'"
 
     def contains(self, value):
-        return f"contains({self.full_name}, {self.escape_value(value)})"
+        return Function("contains", self.full_name, self.escape_value(value))
 
 
 class ArrayProperty(StringProperty):
@@ -198,13 +194,16 @@ class ArrayProperty(StringProperty):
             value (str): A string que será procurada no array.
 
         Returns:
-            (str): Uma string que representa essa query.
+            (pyvidesk.filters.Lambda): A expressão que representa essa query.
         """
 
         if "/" in self.full_name:
             p1, p2 = self.full_name.split("/")
-            return f"{p1}/any(x: x/{p2}/any(y: y eq {self.escape_value(value)}))"
-        return f"{self.full_name}/any(x: x eq {self.escape_value(value)})"
+            predicate = Comparison("y", "eq", self.escape_value(value))
+            return Lambda(p1, "any", "x", Lambda(f"x/{p2}", "any", "y", predicate))
+        return Lambda(
+            self.full_name, "any", "x", Comparison("x", "eq", self.escape_value(value))
+        )
 
     # __contains__ precisa retornar um valor booleano, logo, não podemos aplicar a lógica acima
     # para alterar o operador 'in'
@@ -29,9 +29,24 @@ Exemplo de uso:
 ... <Model for Ticket(id=2336)>
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from queue import Full, Queue
+from threading import Event, Thread
+import time
+
+from . import config
+from .exceptions import PyvideskBadResponseError, PyvideskDeadlineError
+from .filters import And, Not, Or, Raw, render_filters, to_expression
 from .model import Model
+from .partition import PartitionedQuery
 from .properties import ComplexProperty, PropertyBase
-from .utils import get_property_name
+from .records import create_record
+from .utils import get_property_name, get_url_length
+
+_END = object()  # marca o fim de um iterador consumido por _prefetch
+# caracteres reservados na URL para o '$skip' e o '$top' de cada página
+_PAGE_OPTIONS_LENGTH = len("&$skip=9999999999&$top=9999999999")
 
 
 class Query:
@@ -52,16 +67,29 @@ class Query:
     >>> my_query.first()
     """
 
-    def __init__(self, entity, options=None):
+    def __init__(self, entity, options=None, settings=None):
         """
         Args:
             entity (pyvidesk.*.*): Objeto que representa uma entidade do Movidesk
                 (Tickets, Persons ou Services)
             options (dict): As opções ($top, $skip, $select, $filter, $expand, $orderby)
                 da consulta.
+            settings (dict): As configurações da consulta que não são enviadas ao
+                servidor (stream, deadline, max_url_length...).
+
+        As opções com múltiplos valores são guardadas como tuplas, compartilhadas (e não
+        copiadas) entre as consultas criadas pelos métodos construtores. Por isso, uma
+        consulta não deve ser alterada depois de criada, e as opções formatadas e a URL
+        são calculadas apenas uma vez.
         """
         self.entity = entity
-        self.options = options or dict()
+        self.options = {
+            name: tuple(value) if isinstance(value, (list, tuple)) else value
+            for name, value in (options or dict()).items()
+        }
+        self._settings = dict(settings or dict())
+        self._formatted_options = None
+        self._url = None
 
     def __iter__(self):
         """
@@ -70,13 +98,245 @@ class Query:
 
         yields:
             (pyvideks.model.Model): Objeto que representa as respostas do servidor
+
+        Raises:
+            PyvideskDeadlineError: Se o prazo da consulta (veja deadline()) terminar.
+        """
+        query = self._start_deadline()
+        count = 0
+        try:
+            for data in query._iter_data():
+                yield query._create_model(data)
+                count += 1
+        except PyvideskDeadlineError as error:
+            query._add_progress(error, count)
+            raise
+
+    def _iter_data(self):
+        """
+        Método que obtem os dados "crus" (JSON) das respostas do servidor.
+
+        Se a URL da consulta for maior que o tamanho máximo (veja max_url_length()),
+        a consulta é dividida em consultas menores, cujos resultados são unidos sem
+        repetições de ID.
+
+        yields:
+            (dict): Os dados de cada resposta.
+        """
+        top = self.options.get("$top")
+        if top == 0:  # fatia vazia (veja __getitem__()): nenhuma requisição
+            return
+
+        queries = self._split()
+        if queries is not None:
+            yield from _merge_results(
+                queries,
+                top=self.options.get("$top"),
+                max_workers=self._settings.get("max_workers", config.SPLIT_MAX_WORKERS),
+                strip_id=self._hides_id(),
+            )
+            return
+
+        if top is not None and top > config.PAGE_SIZE:
+            if self._settings.get("stream"):
+                yield from self._iter_streamed_pages_data(config.PAGE_SIZE)
+                return
+            for page in self._iter_pages_data(config.PAGE_SIZE):
+                yield from page
+            return
+
+        yield from self._iter_fetch()
+
+    def _fetch(self):
+        """
+        Método que faz uma única requisição ao servidor, sem divisões ou paginação.
+
+        Returns:
+            (list): Os dados de cada resposta.
         """
-        result = self.entity.api.get(options=self._get_options())
-        if isinstance(result, list):
-            for data in result:
-                yield self._create_model(data)
+        return _as_list(
+            self.entity.api.get(options=self._get_options(), **self._deadline_kwargs())
+        )
+
+    def _iter_fetch(self):
+        """
+        Método que faz uma única requisição ao servidor, entregando cada resposta assim
+        que ela é decodificada, se a consulta estiver em modo "streaming" (veja stream()).
+
+        yields:
+            (dict): Os dados de cada resposta.
+        """
+        if self._settings.get("stream"):
+            yield from self.entity.api.iter_get(
+                options=self._get_options(), **self._deadline_kwargs()
+            )
         else:
-            yield self._create_model(result)
+            yield from self._fetch()
+
+    def _iter_pages_data(self, page_size, first_page=None):
+        """
+        Método que obtem os dados "crus" (JSON) das respostas do servidor página a página,
+        respeitando '$skip' e '$top' desta consulta.
+
+        Se a URL da consulta (com o '$skip' e o '$top' das páginas) for maior que o
+        tamanho máximo (veja max_url_length()), cada consulta menor é paginada, e as
+        páginas são unidas sem repetições de ID.
+
+        Args:
+            page_size (int): O número de respostas por página (requisição).
+            first_page (list): A primeira página, se já obtida.
+
+        yields:
+            (list): Os dados das respostas de cada página.
+        """
+        queries = None
+        if first_page is None:
+            queries = self._split(reserve=_PAGE_OPTIONS_LENGTH)
+        if queries is not None:
+            yield from _merge_pages(
+                queries,
+                page_size,
+                top=self.options.get("$top"),
+                strip_id=self._hides_id(),
+            )
+            return
+
+        skip = self.options.get("$skip") or 0
+        top = self.options.get("$top")
+        count = 0
+        page = first_page
+        while top is None or count < top:
+            size = page_size if top is None else min(page_size, top - count)
+            if page is None:
+                page = self.skip(skip + count).top(size)._fetch()
+            if page:
+                yield page
+            count += len(page)
+            if len(page) < size:
+                return
+            page = None
+
+    def _iter_streamed_pages_data(self, page_size):
+        """
+        Método que obtem os dados "crus" (JSON) das respostas do servidor página a página,
+        em modo "streaming" (veja stream()): cada resposta é entregue assim que é
+        decodificada, sem esperar o fim da sua página.
+
+        Args:
+            page_size (int): O número de respostas por página (requisição).
+
+        yields:
+            (dict): Os dados de cada resposta.
+        """
+        skip = self.options.get("$skip") or 0
+        top = self.options.get("$top")
+        count = 0
+        while top is None or count < top:
+            size = page_size if top is None else min(page_size, top - count)
+            received = 0
+            for data in self.skip(skip + count).top(size)._iter_fetch():
+                yield data
+                received += 1
+            count += received
+            if received < size:
+                return
+
+    def _split(self, reserve=0):
+        """
+        Método que divide a consulta em consultas menores, se a URL for maior que o
+        tamanho máximo. A maior disjunção ('or') do filtro é dividida de forma que a URL
+        de cada consulta caiba no tamanho máximo; os demais filtros são mantidos.
+
+        Consultas com '$skip' ou '$orderby' não são divididas, pois não seria possível
+        manter a paginação e a ordem dos resultados. O ID, necessário para remover as
+        repetições, é acrescentado ao '$select' das consultas menores.
+
+        Args:
+            reserve (int): O número de caracteres da URL reservados para outras opções
+                (o '$skip' e o '$top' de cada página, por exemplo).
+
+        Returns:
+            (list): As consultas menores. None, se a consulta não precisar (ou não puder)
+                ser dividida.
+        """
+        max_length = self._settings.get("max_url_length", config.MAX_URL_LENGTH)
+        if max_length:
+            max_length -= reserve
+        filters = self.options.get("$filter")
+        if (
+            not max_length
+            or not filters
+            or self.options.get("$skip") is not None
+            or self.options.get("$orderby")
+            or get_url_length(self.as_url()) <= max_length
+        ):
+            return None
+
+        expression = And(filters).simplify(fold_in=config.FILTER_FOLD_EQ_INTO_IN)
+        operands = expression.operands if isinstance(expression, And) else (expression,)
+        disjunctions = [operand for operand in operands if isinstance(operand, Or)]
+        if not disjunctions:
+            return None
+
+        query = self
+        if self._hides_id():
+            # as repetições são removidas pelo ID (veja _deduplicate)
+            query = self._extend_option("$select", ("id",))
+
+        target = max(disjunctions, key=lambda disjunction: len(str(disjunction)))
+        # URL sem a disjunção, mais os parênteses que a envolvem
+        base_length = (
+            get_url_length(query._replace_filter(operands, target, Raw("")).as_url())
+            + 2
+        )
+        or_length = get_url_length(" or ")
+
+        chunks = [[]]
+        length = base_length
+        for operand in target.operands:
+            operand_length = get_url_length(str(operand))
+            if chunks[-1]:
+                operand_length += or_length
+                if length + operand_length > max_length:
+                    chunks.append([])
+                    length = base_length
+                    operand_length -= or_length
+            chunks[-1].append(operand)
+            length += operand_length
+
+        return [
+            query._replace_filter(
+                operands, target, Or(chunk) if len(chunk) > 1 else chunk[0]
+            )
+            for chunk in chunks
+        ]
+
+    def _hides_id(self):
+        """
+        Método que indica se o '$select' da consulta omite o ID. As consultas menores
+        (veja _split()) obtêm o ID mesmo assim, e ele é removido dos resultados.
+        """
+        select = self.options.get("$select")
+        return bool(select) and "id" not in select
+
+    def _replace_filter(self, operands, target, replacement):
+        """
+        Método que cria uma cópia desta consulta com um dos filtros substituído.
+
+        Args:
+            operands (tuple): Os filtros (já simplificados) da consulta.
+            target (pyvidesk.filters.Expression): O filtro que será substituído.
+            replacement (pyvidesk.filters.Expression): O novo filtro.
+
+        Returns:
+            (pyvidesk.query.Query): Uma instância desta classe.
+        """
+        return self._new_query(
+            "$filter",
+            tuple(
+                replacement if operand is target else operand for operand in operands
+            ),
+        )
 
     def __repr__(self):
         return f"<Query for {self.entity}>"
@@ -84,10 +344,14 @@ class Query:
     def _get_options(self):
         """
         Metodo que formata o dicionário de opções atuais para criação da URL de consulta.
+        O resultado é calculado apenas uma vez e não deve ser alterado.
 
         Returns:
             options (dict): As opções da consulta.
         """
+        if self._formatted_options is not None:
+            return self._formatted_options
+
         options = dict()
 
         top = self.options.get("$top")
@@ -104,7 +368,9 @@ class Query:
 
         _filter = self.options.get("$filter")
         if _filter:
-            options["$filter"] = " and ".join(_filter)
+            options["$filter"] = render_filters(
+                _filter, fold_in=config.FILTER_FOLD_EQ_INTO_IN
+            )
 
         expand = self.options.get("$expand")
         if expand:
@@ -113,35 +379,107 @@ class Query:
         order_by = self.options.get("$orderby")
         if order_by:
             options["$orderby"] = ",".join(order_by)
+
+        if self.options.get("$count"):
+            options["$count"] = "true"
+
+        self._formatted_options = options
         return options
 
+    def _start_deadline(self):
+        """
+        Método que inicia o prazo da consulta (veja deadline()): cria uma cópia com o
+        instante em que o prazo termina, herdado pelas páginas e consultas menores.
+
+        Returns:
+            (pyvidesk.query.Query): A cópia, ou esta consulta, se não houver prazo ou se
+                ele já foi iniciado.
+        """
+        seconds = self._settings.get("deadline")
+        if seconds is None or self._settings.get("deadline_at") is not None:
+            return self
+        return self._new_setting("deadline_at", time.monotonic() + seconds)
+
+    def _deadline_kwargs(self):
+        """
+        Método que obtem os argumentos do prazo para as requisições da Api (nenhum, se a
+        consulta não tiver prazo).
+        """
+        deadline = self._settings.get("deadline_at")
+        return dict() if deadline is None else {"deadline": deadline}
+
+    def _add_progress(self, error, count):
+        """
+        Método que completa um erro de prazo com o progresso da consulta: o número de
+        respostas obtidas e a consulta que obtem as que faltam (se ela não foi dividida).
+        """
+        error.progress.setdefault("items", count)
+        if error.resume_query is not None or self._split() is not None:
+            return
+        options = self.options.copy()
+        options["$skip"] = (options.get("$skip") or 0) + count
+        if options.get("$top") is not None:
+            options["$top"] -= count
+        settings = {
+            name: value
+            for name, value in self._settings.items()
+            if name != "deadline_at"
+        }
+        error.resume_query = Query(
+            entity=self.entity, options=options, settings=settings
+        )
+
     def _create_model(self, data):
+        session = self.entity.session
+        if session is not None and "id" in data:
+            return session.merge(
+                self.entity, data, complete=not self.options.get("$select")
+            )
         return Model(self.entity, **data)
 
-    def _get_or_create_option(self, name):
-        if name not in self.options:
-            self.options[name] = []
-        return self.options[name]
+    def _new_query(self, name, value):
+        """
+        Método que cria uma cópia desta consulta com uma opção alterada.
+        Todos os construtores de consulta devem usar isso.
+
+        Args:
+            name (str): O nome da opção ($top, $select...).
+            value (): O novo valor da opção.
+
+        Returns:
+            (pyvidesk.query.Query): Uma instância desta classe.
+        """
+        options = self.options.copy()
+        options[name] = value
+        return Query(entity=self.entity, options=options, settings=self._settings)
 
-    def _new_query(self):
+    def _new_setting(self, name, value):
         """
-        Método que cria uma cópia desta consulta.
-        Todos os construtores de consulta devem usar isso primeiro.
+        Método que cria uma cópia desta consulta com uma configuração (que não é enviada
+        ao servidor) alterada.
+
+        Args:
+            name (str): O nome da configuração (stream, deadline, max_url_length...).
+            value (): O novo valor da configuração.
 
         Returns:
             (pyvidesk.query.Query): Uma instância desta classe.
         """
-        options = dict()
-        options["$top"] = self.options.get("$top", None)
-        options["$skip"] = self.options.get("$skip", None)
-        options["$select"] = self.options.get("$select", [])[:]
-        options["$filter"] = self.options.get("$filter", [])[:]
-        options["$expand"] = self.options.get("$expand", [])[:]
-        options["$orderby"] = self.options.get("$orderby", [])[:]
-        return Query(entity=self.entity, options=options)
+        settings = self._settings.copy()
+        settings[name] = value
+        return Query(entity=self.entity, options=self.options, settings=settings)
+
+    def _extend_option(self, name, values):
+        """
+        Método que cria uma cópia desta consulta acrescentando valores a uma opção
+        ($select, $filter, $expand ou $orderby).
+        """
+        return self._new_query(name, self.options.get(name, ()) + tuple(values))
 
     def as_url(self):
-        return self.entity.api._get_url(options=self._get_options())
+        if self._url is None:
+            self._url = self.entity.api._get_url(options=self._get_options())
+        return self._url
 
     def select(self, *values):
         """
@@ -157,11 +495,9 @@ class Query:
         Returs:
             new_query (pyvidesk.query.Query): Uma instância desta classe.
         """
-        new_query = self._new_query()
-        option = new_query._get_or_create_option("$select")
-        option.extend((get_property_name(prop) for prop in values))
-
-        return new_query
+        return self._extend_option(
+            "$select", (get_property_name(prop) for prop in values)
+        )
 
     def filter(self, value):
         """
@@ -169,16 +505,16 @@ class Query:
         na construção da consulta. Os múltiplos filtros são concatenados com o operador 'and'.
 
         Args:
-            value (str): Comparação de uma propriedade de self.entity.
-                ``entity_properties["id"] > 1000``, por exemplo.
+            value (pyvidesk.filters.Expression, pyvidesk.query.Q ou str): Comparação de
+                uma propriedade de self.entity. ``entity_properties["id"] > 1000``,
+                por exemplo.
 
         Returs:
             new_query (pyvidesk.query.Query): Uma instância desta classe.
         """
-        new_query = self._new_query()
-        option = new_query._get_or_create_option("$filter")
-        option.append(value)
-        return new_query
+        if isinstance(value, Q):
+            value = value.filter
+        return self._extend_option("$filter", (to_expression(value),))
 
     def expand(self, *values, select=None, inner=None):
         """
@@ -237,12 +573,10 @@ class Query:
             new_query (pyvidesk.query.Query): Uma instância desta classe.
         """
         expand_complex_type = _get_complex_type_expansion(select=select, inner=inner)
-        new_query = self._new_query()
-        option = new_query._get_or_create_option("$expand")
-        for prop in values:
-            option.append(get_property_name(prop) + expand_complex_type)
-
-        return new_query
+        return self._extend_option(
+            "$expand",
+            (get_property_name(prop) + expand_complex_type for prop in values),
+        )
 
     def order_by(self, *values):
         """
@@ -256,11 +590,7 @@ class Query:
         Returs:
             new_query (pyvidesk.query.Query): Uma instância desta classe.
         """
-        values = properties_to_strings(values)
-        new_query = self._new_query()
-        option = new_query._get_or_create_option("$orderby")
-        option.extend(values)
-        return new_query
+        return self._extend_option("$orderby", properties_to_strings(values))
 
     def top(self, value):
         """
@@ -272,10 +602,105 @@ class Query:
         Returs:
             new_query (pyvidesk.query.Query): Uma instância desta classe.
         """
-        new_query = self._new_query()
-        new_query.options["$top"] = value
+        return self._new_query("$top", value)
+
+    def max_url_length(self, value, max_workers=None):
+        """
+        Método que define o tamanho máximo da URL da consulta (por padrão,
+        pyvidesk.config.MAX_URL_LENGTH). Se a URL for maior, a maior disjunção ('or') do
+        filtro é dividida em várias consultas menores, e os resultados são unidos sem
+        repetições de ID.
+
+        Exemplo:
+            >>> ids_filter = Q(tickets_properties["id"] == 1)
+            >>> for ticket_id in range(2, 1000):
+            ...     ids_filter |= Q(tickets_properties["id"] == ticket_id)
+            >>> my_query = tickets.query.filter(ids_filter).max_url_length(
+            ...     2000, max_workers=4
+            ... )
+            >>> len(my_query.all())  # 9 requisições, 4 de cada vez
+            ... 999
+
+        Args:
+            value (int): O tamanho máximo da URL, com os caracteres especiais já
+                codificados. None, para nunca dividir a consulta.
+            max_workers (int): O número de consultas menores feitas simultaneamente.
+                Por padrão, pyvidesk.config.SPLIT_MAX_WORKERS.
+
+        Returs:
+            new_query (pyvidesk.query.Query): Uma instância desta classe.
+        """
+        new_query = self._new_setting("max_url_length", value)
+        if max_workers is not None:
+            new_query = new_query._new_setting("max_workers", max_workers)
         return new_query
 
+    def stream(self, value=True):
+        """
+        Método que define se as respostas devem ser lidas em modo "streaming": o corpo da
+        resposta é lido aos poucos e cada resposta é entregue assim que é decodificada,
+        o que reduz o pico de memória e o tempo até a primeira resposta em páginas grandes
+        (tickets com ações expandidas, por exemplo).
+
+        Args:
+            value (bool): True, para ler as respostas em modo "streaming".
+
+        Returs:
+            new_query (pyvidesk.query.Query): Uma instância desta classe.
+        """
+        return self._new_setting("stream", value)
+
+    def deadline(self, seconds):
+        """
+        Método que define o prazo (em segundos) da consulta, contado a partir do início
+        de cada execução (all(), iteração, count(), scan() das consultas particionadas...).
+        O prazo vale para todas as páginas e consultas menores: os tempos máximos de cada
+        requisição são limitados ao tempo que resta e, quando ele termina, a consulta
+        para com um erro PyvideskDeadlineError, que informa o progresso.
+
+        Exemplo:
+            >>> try:
+            ...     tickets = my_query.deadline(300).all()
+            ... except PyvideskDeadlineError as error:
+            ...     tickets = error.partial  # as respostas obtidas dentro do prazo
+            ...     next_query = error.resume_query  # a consulta das que faltam
+
+        Args:
+            seconds (float): O prazo, em segundos. None, para não ter prazo.
+
+        Returs:
+            new_query (pyvidesk.query.Query): Uma instância desta classe.
+        """
+        if seconds is not None and seconds <= 0:
+            raise ValueError("O prazo deve ser positivo.")
+        return self._new_setting("deadline", seconds)
+
+    def partition_by(self, prop, start, end, window=timedelta(days=7)):
+        """
+        Método que divide a consulta em janelas de datas que não se sobrepõem
+        (``prop >= início and prop < fim``), que podem ser obtidas em paralelo e
+        retomadas individualmente (veja pyvidesk.partition).
+
+        Exemplo:
+            >>> partitioned_query = tickets.query.partition_by(
+            ...     tickets_properties["lastUpdate"],
+            ...     start=date(2020, 1, 1),
+            ...     end=date(2021, 1, 1),
+            ... )
+            >>> for window, models in partitioned_query.scan(max_workers=4):
+            ...     print(window.key, len(models))
+
+        Args:
+            prop (pyvidesk.properties.DatetimeProperty): A propriedade de data.
+            start (datetime.datetime ou datetime.date): O início (inclusive) do período.
+            end (datetime.datetime ou datetime.date): O fim (exclusive) do período.
+            window (datetime.timedelta): O tamanho de cada janela.
+
+        Returns:
+            (pyvidesk.partition.PartitionedQuery): A consulta particionada.
+        """
+        return PartitionedQuery(self, prop, start, end, window)
+
     def skip(self, value):
         """
         Método que define o parâmetro '$skip' da consulta.
@@ -286,9 +711,95 @@ class Query:
         Returs:
             new_query (pyvidesk.query.Query): Uma instância desta classe.
         """
-        new_query = self._new_query()
-        new_query.options["$skip"] = value
-        return new_query
+        return self._new_query("$skip", value)
+
+    def __getitem__(self, key):
+        """
+        Método que permite fatiar a consulta: ``my_query[1000:2000]`` equivale a
+        ``my_query.skip(1000).top(1000)`` e ``my_query[5]``, à sexta resposta.
+
+        Fatias retornam uma nova consulta, sem requisições ao servidor. Fatias maiores que
+        pyvidesk.config.PAGE_SIZE são paginadas na iteração, e fatias vazias
+        (``my_query.top(3)[5:10]``, por exemplo) não fazem requisições.
+
+        Args:
+            key (int ou slice): O índice ou a fatia. Índices negativos e passos
+                diferentes de 1 não são suportados.
+
+        Returns:
+            (pyvidesk.query.Query ou pyvidesk.model.Model): A nova consulta, para fatias;
+                o modelo, para índices.
+
+        Raises:
+            IndexError: Se não houver resposta no índice.
+        """
+        if isinstance(key, slice):
+            if key.step not in (None, 1):
+                raise ValueError("Query não suporta fatias com passo diferente de 1.")
+            start = key.start or 0
+            stop = key.stop
+            if start < 0 or (stop is not None and stop < 0):
+                raise ValueError("Query não suporta índices negativos.")
+
+            skip = self.options.get("$skip") or 0
+            top = self.options.get("$top")
+            if top is not None:
+                stop = top if stop is None else min(stop, top)
+
+            new_query = self
+            if start:
+                new_query = new_query.skip(skip + start)
+            if stop is not None:
+                new_query = new_query.top(max(stop - start, 0))
+            return new_query
+
+        if not isinstance(key, int):
+            raise TypeError(key)
+        if key < 0:
+            raise ValueError("Query não suporta índices negativos.")
+        for model in self[key : key + 1]:
+            return model
+        raise IndexError(key)
+
+    def iter_pages(self, page_size=None, prefetch=0):
+        """
+        Método que obtem as respostas do servidor página a página (uma requisição por
+        página), respeitando '$skip' e '$top' desta consulta.
+
+        Com prefetch, as próximas páginas são obtidas numa thread em segundo plano
+        enquanto a página atual é processada, escondendo a latência da rede.
+
+        Exemplo:
+            >>> for page in tickets.query.select("id").iter_pages(page_size=500):
+            ...     print(len(page))
+            ... 500
+            ... 500
+            ... 137
+
+        Args:
+            page_size (int): O número de respostas por página. Por padrão,
+                pyvidesk.config.PAGE_SIZE.
+            prefetch (int): O número de páginas obtidas antecipadamente. 0, para obter
+                cada página apenas quando a anterior for consumida.
+
+        yields:
+            (list): Os modelos (pyvidesk.models.Model) de cada página.
+
+        Raises:
+            PyvideskDeadlineError: Se o prazo da consulta (veja deadline()) terminar.
+        """
+        query = self._start_deadline()
+        pages = query._iter_pages_data(page_size or config.PAGE_SIZE)
+        if prefetch:
+            pages = _prefetch(pages, size=prefetch)
+        count = 0
+        try:
+            for page in pages:
+                yield [query._create_model(data) for data in page]
+                count += len(page)
+        except PyvideskDeadlineError as error:
+            query._add_progress(error, count)
+            raise
 
     def all(self):
         """
@@ -297,8 +808,18 @@ class Query:
 
         Returs:
             (list): Lista de modelos (pyvidesk.models.Model) das respostas.
+
+        Raises:
+            PyvideskDeadlineError: Se o prazo da consulta (veja deadline()) terminar. As
+                respostas já obtidas ficam no atributo 'partial' do erro.
         """
-        return list(iter(self))
+        results = []
+        try:
+            results.extend(self)
+        except PyvideskDeadlineError as error:
+            error.partial = results
+            raise
+        return results
 
     def first(self):
         """
@@ -308,13 +829,112 @@ class Query:
             (pyvidesk.models.Model): Modelo que representa a resposta, se houver.
                 None, do contrário.
         """
-        old_value = self.options.get("$top", None)
-        self.options["$top"] = 1
-        data = list(iter(self))
-        self.options["$top"] = old_value
+        data = list(iter(self.top(1)))
         if data:
             return data[0]
 
+    def count(self):
+        """
+        Método que obtem o número de respostas da consulta sem baixar os dados.
+
+        Usa o parâmetro '$count' do Odata. Se o servidor não o suportar, as respostas são
+        contadas página a página (pyvidesk.config.PAGE_SIZE), obtendo apenas os IDs.
+
+        Returns:
+            (int): O número de respostas.
+        """
+        query = self._start_deadline()
+        if query is not self:
+            return query.count()
+
+        id_query = self._get_id_query()
+        if id_query._split() is not None:
+            return sum(1 for _ in id_query._iter_data())
+
+        api = self.entity.api
+        if not api.supports_count:
+            return _count_pages(id_query)
+
+        skip = self.options.get("$skip") or 0
+        top = self.options.get("$top")
+        page_size = config.PAGE_SIZE if top is None else min(top, config.PAGE_SIZE)
+        page_query = id_query._new_query("$count", True).skip(skip).top(page_size)
+        try:
+            result = api.get(
+                options=page_query._get_options(), **self._deadline_kwargs()
+            )
+        except PyvideskBadResponseError as error:
+            # apenas "consulta inválida" (400) indica que o '$count' pode não ser
+            # suportado; limites (429), falhas do servidor (5xx) e autenticação (401)
+            # são repassados
+            if error.status_code != 400:
+                raise
+            # se a consulta sem '$count' funcionar, o problema era o '$count'
+            count = _count_pages(id_query)
+            api.supports_count = False
+            return count
+
+        if isinstance(result, dict) and "@odata.count" in result:
+            total = max(result["@odata.count"] - skip, 0)
+            return total if top is None else min(total, top)
+        api.supports_count = False
+        return _count_pages(id_query, first_page=_as_list(result))
+
+    def exists(self):
+        """
+        Método que checa se a consulta tem alguma resposta, obtendo apenas um ID
+        ('$top=1&$select=id').
+
+        Returns:
+            (bool): True, se houver alguma resposta. False, do contrário.
+        """
+        id_query = self._get_id_query()._start_deadline()
+        for _ in id_query.top(1)._iter_data():
+            return True
+        return False
+
+    def _get_id_query(self):
+        """
+        Método que cria uma cópia desta consulta que obtem apenas os IDs das respostas,
+        mantendo os filtros, '$top' e '$skip'.
+        """
+        options = {
+            name: value
+            for name, value in self.options.items()
+            if name not in ("$select", "$expand", "$orderby", "$count")
+        }
+        options["$select"] = ("id",)
+        return Query(entity=self.entity, options=options, settings=self._settings)
+
+    def records(self):
+        """
+        Método que obtem as respostas do servidor como registros imutáveis
+        (pyvidesk.records), sem o controle de alterações e sem o JSON "cru" da classe Model.
+        Indicado para leituras de grandes volumes de dados.
+
+        Exemplo:
+            >>> from pyvidesk.tickets import Tickets
+            >>> tickets = Tickets("my_token")
+            >>> for ticket in tickets.query.select("id", "subject").records():
+            ...     print(ticket.id, ticket.subject)
+            ... 3 Assunto
+
+        yields:
+            (tuple): Registro (namedtuple) que representa cada resposta do servidor.
+
+        Raises:
+            PyvideskDeadlineError: Se o prazo da consulta (veja deadline()) terminar.
+        """
+        query = self._start_deadline()
+        count = 0
+        try:
+            for data in query._iter_data():
+                yield create_record(self.entity, data)
+                count += 1
+        except PyvideskDeadlineError as error:
+            query._add_progress(error, count)
+            raise
+
     def raw(self, query_params):
         """
         Executa uma consulta com parâmetros customizados. Permite consultas que essa
@@ -345,22 +965,187 @@ class Q:
     """
 
     def __init__(self, query_filter):
-        self.filter = query_filter
+        if isinstance(query_filter, Q):
+            query_filter = query_filter.filter
+        self.filter = to_expression(query_filter)
 
-    def _combine(self, other, condition):
-        if not isinstance(other, Q):
-            raise TypeError(other)
+    def __str__(self):
+        return str(self.filter)
 
-        return f"({self.filter} {condition} {other.filter})"
+    def __repr__(self):
+        return f"<Q({self.filter})>"
+
+    def __eq__(self, other):
+        if isinstance(other, Q):
+            other = other.filter
+        return self.filter == other
+
+    def __hash__(self):
+        return hash(self.filter)
+
+    def _combine(self, other, condition, reflected=False):
+        """
+        Metodo que combina este filtro com outro Q, expressão ou string (veja
+        pyvidesk.filters.to_expression).
+        """
+        other = other.filter if isinstance(other, Q) else to_expression(other)
+        if reflected:
+            return Q(condition.combine(other, self.filter))
+        return Q(condition.combine(self.filter, other))
 
     def __or__(self, other):
-        return self._combine(other, condition="or")
+        return self._combine(other, condition=Or)
+
+    def __ror__(self, other):
+        return self._combine(other, condition=Or, reflected=True)
 
     def __and__(self, other):
-        return self._combine(other, condition="and")
+        return self._combine(other, condition=And)
+
+    def __rand__(self, other):
+        return self._combine(other, condition=And, reflected=True)
 
     def __invert__(self):
-        return f"not {self.filter}"
+        return Q(Not(self.filter))
+
+
+def _as_list(result):
+    """Funcao que transforma a resposta do servidor numa lista"""
+    if isinstance(result, list):
+        return result
+    if result is None:
+        return []
+    return [result]
+
+
+def _count_pages(query, first_page=None):
+    """Funcao que conta as respostas de uma consulta página a página"""
+    return sum(
+        len(page) for page in query._iter_pages_data(config.PAGE_SIZE, first_page)
+    )
+
+
+def _prefetch(iterator, size):
+    """
+    Funcao que consome um iterador numa thread em segundo plano, mantendo até 'size'
+    itens prontos à frente do consumidor. Erros do iterador são repassados ao consumidor.
+
+    Args:
+        iterator (): O iterador (as páginas de uma consulta, por exemplo).
+        size (int): O número máximo de itens prontos.
+
+    yields:
+        (): Os itens do iterador, na mesma ordem.
+    """
+    buffer = Queue(maxsize=size)
+    stop = Event()
+
+    def put(item, error=None):
+        while not stop.is_set():
+            try:
+                buffer.put((item, error), timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+        except Exception as error:  # pylint: disable=broad-except
+            put(_END, error)
+        else:
+            put(_END)
+
+    Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if error is not None:
+                raise error
+            if item is _END:
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def _merge_results(queries, top=None, max_workers=1, strip_id=False):
+    """
+    Funcao que une os resultados de várias consultas, sem repetições de ID.
+
+    Args:
+        queries (list): As consultas (pyvidesk.query.Query).
+        top (int): O número máximo de resultados. None, para todos.
+        max_workers (int): O número de consultas feitas simultaneamente.
+        strip_id (bool): True, para remover o ID dos resultados (quando ele foi obtido
+            apenas para remover as repetições).
+
+    yields:
+        (dict): Os dados de cada resposta.
+    """
+    if max_workers and max_workers > 1 and len(queries) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda query: list(query._iter_data()), queries)
+            yield from _deduplicate(results, top=top, strip_id=strip_id)
+    else:
+        yield from _deduplicate(
+            (query._iter_data() for query in queries), top=top, strip_id=strip_id
+        )
+
+
+def _merge_pages(queries, page_size, top=None, strip_id=False):
+    """
+    Funcao que une as páginas de várias consultas, sem repetições de ID. As consultas
+    são paginadas uma após a outra.
+
+    Args:
+        queries (list): As consultas (pyvidesk.query.Query).
+        page_size (int): O número de respostas por página (requisição).
+        top (int): O número máximo de resultados. None, para todos.
+        strip_id (bool): True, para remover o ID dos resultados (quando ele foi obtido
+            apenas para remover as repetições).
+
+    yields:
+        (list): Os dados das respostas de cada página (sem as repetições).
+    """
+    seen = set()
+    count = 0
+    for query in queries:
+        for page in query._iter_pages_data(page_size):
+            page = list(
+                _deduplicate(
+                    (page,),
+                    top=None if top is None else top - count,
+                    strip_id=strip_id,
+                    seen=seen,
+                )
+            )
+            if page:
+                yield page
+            count += len(page)
+            if top is not None and count >= top:
+                return
+
+
+def _deduplicate(results, top=None, strip_id=False, seen=None):
+    seen = set() if seen is None else seen
+    count = 0
+    for result in results:
+        for data in result:
+            model_id = data.get("id")
+            if model_id is not None:
+                if model_id in seen:
+                    continue
+                seen.add(model_id)
+            if strip_id:
+                data = {name: value for name, value in data.items() if name != "id"}
+            yield data
+            count += 1
+            if top is not None and count >= top:
+                return
 
 
 def _get_complex_type_expansion(select, inner, is_inner_expansion=False):
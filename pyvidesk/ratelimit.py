@@ -0,0 +1,239 @@
+"""
+Módulo com os limitadores de requisições por token, que mantêm as requisições dentro da
+cota do Movidesk (um número máximo de requisições por período).
+
+O limite vale por token: todas as entidades (e threads) que usam o mesmo limitador e o
+mesmo token dividem uma única cota. Há dois limitadores:
+    RateLimiter: no próprio processo.
+    SQLiteRateLimiter: compartilhado entre processos (vários workers com o mesmo token)
+        por meio de um arquivo SQLite local.
+
+A fila é justa: cada requisição reserva o próximo horário livre da cota, na ordem de
+chegada, e espera até ele. Assim, nenhum processo (ou thread) fica sem a sua vez enquanto
+os outros disputam cada vaga que se abre. Os tokens não são gravados, apenas um hash.
+
+Exemplo de uso:
+
+>>> from pyvidesk import Pyvidesk
+>>> from pyvidesk.ratelimit import SQLiteRateLimiter
+
+>>> # em cada processo:
+>>> limiter = SQLiteRateLimiter("/tmp/movidesk.sqlite", requests=10, period=60.0)
+>>> pyvidesk = Pyvidesk(token="my_token", rate_limiter=limiter)
+>>> pyvidesk.tickets.query.top(10).all()
+"""
+
+from collections import deque
+import hashlib
+import os
+import sqlite3
+from threading import Lock, local
+import time
+
+from .exceptions import PyvideskRateLimitError
+
+
+class RateLimiter:
+    """Classe que limita as requisições de cada token no próprio processo"""
+
+    def __init__(self, requests=10, period=60.0):
+        """
+        Args:
+            requests (int): O número máximo de requisições de um token no período.
+            period (float): O período (segundos).
+        """
+        if requests < 1 or period <= 0:
+            raise ValueError("O limite e o período devem ser positivos.")
+        self.requests = requests
+        self.period = period
+        self._reservations = dict()  # hash do token: horários reservados, em ordem
+        self._lock = Lock()
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.requests} requests / {self.period} s>"
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def acquire(self, token, deadline=None):
+        """
+        Metodo que reserva a próxima vaga da cota de um token e espera até ela.
+
+        Args:
+            token (str): O token das requisições.
+            deadline (float): O prazo opcional (instante de time.monotonic()). Se a
+                vaga for posterior ao prazo, nada é reservado.
+
+        Returns:
+            (float): A espera (segundos). None, se a vaga seria após o prazo.
+
+        Raises:
+            PyvideskRateLimitError: Se a vaga não puder ser reservada (no
+                SQLiteRateLimiter, se o arquivo ficar bloqueado além do tempo máximo).
+        """
+        now = time.time()  # o relógio do sistema é o mesmo em todos os processos
+        latest = None
+        if deadline is not None:
+            latest = now + deadline - time.monotonic()
+        slot = self._reserve(_hash(token), now, latest)
+        if slot is None:
+            return None
+        wait = max(0.0, slot - now)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def reset(self, token=None):
+        """Metodo que descarta as reservas de um token (ou de todos)"""
+        with self._lock:
+            if token is None:
+                self._reservations = dict()
+            else:
+                self._reservations.pop(_hash(token), None)
+
+    def _reserve(self, key, now, latest):
+        """
+        Metodo que reserva a próxima vaga livre.
+
+        Returns:
+            (float): O horário da vaga (time.time()). None, se for posterior a 'latest'.
+        """
+        with self._lock:
+            reservations = self._reservations.setdefault(key, deque())
+            while reservations and reservations[0] <= now - self.period:
+                reservations.popleft()
+            slot = _next_slot(reservations, now, self.requests, self.period)
+            if latest is not None and slot > latest:
+                return None
+            reservations.append(slot)
+            return slot
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """
+    Classe que limita as requisições de cada token entre processos, com as reservas
+    num arquivo SQLite. Cada processo (ou thread) abre a sua conexão, e a reserva de cada
+    vaga é uma transação curta, exclusiva.
+    """
+
+    def __init__(self, path, requests=10, period=60.0, timeout=30.0):
+        """
+        Args:
+            path (str): O caminho do arquivo SQLite, o mesmo em todos os processos. Se
+                não existir, será criado.
+            requests (int): O número máximo de requisições de um token no período.
+            period (float): O período (segundos).
+            timeout (float): O tempo máximo (segundos) de espera pelo arquivo, quando
+                outro processo está reservando uma vaga.
+        """
+        super().__init__(requests=requests, period=period)
+        self.path = path
+        self.timeout = timeout
+        self._local = local()
+
+    def __repr__(self):
+        return (
+            f"<SQLiteRateLimiter({self.path}): {self.requests} requests / "
+            f"{self.period} s>"
+        )
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._local = local()
+
+    def reset(self, token=None):
+        """Metodo que descarta as reservas de um token (ou de todos)"""
+        connection = self._connection()
+        if token is None:
+            connection.execute("DELETE FROM reservations")
+        else:
+            connection.execute(
+                "DELETE FROM reservations WHERE key = ?", (_hash(token),)
+            )
+
+    def _connection(self):
+        """
+        Metodo que obtem a conexão da thread atual (uma nova, após um fork).
+        """
+        pid = os.getpid()
+        if getattr(self._local, "pid", None) != pid:
+            # isolation_level=None: as transações são abertas manualmente (BEGIN IMMEDIATE)
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS reservations (key TEXT, slot REAL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS reservations_key_slot "
+                "ON reservations (key, slot)"
+            )
+            self._local.connection = connection
+            self._local.pid = pid
+        return self._local.connection
+
+    def _reserve(self, key, now, latest):
+        try:
+            return self._reserve_slot(key, now, latest)
+        except sqlite3.Error as error:
+            raise PyvideskRateLimitError(
+                f"Erro ao reservar a vaga no limitador ({self.path}): {error}"
+            ) from error
+
+    def _reserve_slot(self, key, now, latest):
+        connection = self._connection()
+        # BEGIN IMMEDIATE bloqueia a escrita dos outros processos até o COMMIT
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "DELETE FROM reservations WHERE key = ? AND slot <= ?",
+                (key, now - self.period),
+            )
+            rows = connection.execute(
+                "SELECT slot FROM reservations WHERE key = ? ORDER BY slot DESC LIMIT ?",
+                (key, self.requests),
+            ).fetchall()
+            reservations = [row[0] for row in reversed(rows)]
+            slot = _next_slot(reservations, now, self.requests, self.period)
+            if latest is not None and slot > latest:
+                slot = None
+            else:
+                connection.execute(
+                    "INSERT INTO reservations (key, slot) VALUES (?, ?)", (key, slot)
+                )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        return slot
+
+
+def _next_slot(reservations, now, requests, period):
+    """
+    Funcao que obtem a próxima vaga: depois da última reserva (ordem de chegada) e de
+    forma que nenhum período tenha mais de 'requests' reservas.
+
+    Args:
+        reservations (): Os horários reservados, em ordem (ao menos os 'requests' últimos).
+    """
+    slot = now
+    if reservations:
+        slot = max(slot, reservations[-1])
+    if len(reservations) >= requests:
+        slot = max(slot, reservations[-requests] + period)
+    return slot
+
+
+def _hash(token):
+    return hashlib.sha256(str(token).encode("utf-8")).hexdigest()
@@ -0,0 +1,93 @@
+"""
+Módulo que representa os resultados de uma consulta como registros imutáveis.
+
+Diferente da classe Model, um registro é apenas uma tupla nomeada (namedtuple): não
+guarda o JSON "cru", não controla alterações e não pode ser salvo. É a opção indicada
+para leituras de grandes volumes de dados.
+
+Exemplo de uso:
+
+>>> from pyvidesk.tickets import Tickets
+
+>>> tickets = Tickets(token="my_token")
+>>> ticket_properties = tickets.get_properties()
+>>> my_query = tickets.query.select("id", "subject").expand(ticket_properties["clients"])
+>>> for ticket in my_query.records():
+...     print(ticket.id, ticket.subject, ticket.clients[0].businessName)
+... 3 Assunto Murilo Scarpa Sitonio
+"""
+
+from collections import namedtuple
+
+from .properties import ArrayProperty, ComplexProperty
+
+_RECORD_CLASSES = dict()
+
+
+def create_record(entity, data):
+    """
+    Funcao que cria o registro de uma entidade (ou propriedade complexa).
+
+    Args:
+        entity (): A entidade (Tickets, Persons...) ou a propriedade complexa do registro.
+        data (dict): As propriedades e valores obtidos pela query. Propriedades ainda não
+            suportadas por esta biblioteca são descartadas.
+
+    Returns:
+        (tuple): O registro, uma namedtuple com todas as propriedades da entidade.
+            As propriedades que não vieram na consulta valem None.
+    """
+    record_class, fields = get_record_class(entity)
+    values = []
+    for prop, property_obj, child_entity in fields:
+        value = data.get(prop)
+        if value is not None:
+            if child_entity is not None:
+                if isinstance(value, list):
+                    value = tuple(create_record(child_entity, v) for v in value)
+                else:
+                    value = create_record(child_entity, value)
+            elif isinstance(property_obj, ArrayProperty):
+                value = tuple(value)
+            else:
+                value = property_obj.deserialize(value=value)
+        values.append(value)
+    return record_class._make(values)
+
+
+def get_record_class(entity):
+    """
+    Funcao que obtem a namedtuple da entidade (ou propriedade complexa).
+    As classes são criadas apenas uma vez e guardadas em cache.
+
+    Args:
+        entity (): A entidade (Tickets, Persons...) ou a propriedade complexa do registro.
+
+    Returns:
+        (tuple): A namedtuple e uma tupla com o nome, o objeto da propriedade e
+            (para propriedades complexas) a entidade de cada campo.
+    """
+    is_complex = isinstance(entity, ComplexProperty)
+    key = (entity.__class__, entity.full_name if is_complex else None)
+    try:
+        return _RECORD_CLASSES[key]
+    except KeyError:
+        pass
+
+    properties = entity.get_properties(as_model=is_complex)
+    fields = tuple(
+        (
+            prop,
+            property_obj,
+            property_obj if isinstance(property_obj, ComplexProperty) else None,
+        )
+        for prop, property_obj in properties.items()
+    )
+    if is_complex:
+        name = entity.__class__.__name__ + "Record"
+    else:
+        name = entity.__class__.__name__[:-1] + "Record"
+    record_class = namedtuple(
+        name, properties, defaults=(None,) * len(properties), module=__name__
+    )
+    return _RECORD_CLASSES.setdefault(key, (record_class, fields))
@@ -0,0 +1,135 @@
+"""
+Módulo que implementa um mapa de identidades (identity map) para os modelos.
+
+Com uma sessão, cada par (entidade, id) corresponde a uma única instância de Model,
+independente de quantas consultas retornem o mesmo registro. Consultas posteriores
+apenas mesclam as propriedades recém obtidas no modelo já existente.
+
+Exemplo de uso:
+
+>>> from pyvidesk import Pyvidesk
+>>> from pyvidesk.session import Session
+
+>>> pyvidesk = Pyvidesk(token="my_token", session=Session())
+>>> person = pyvidesk.persons.get_by_id("1", select="businessName")
+>>> same_person = pyvidesk.persons.get_by_isActive(True).first()
+>>> person is same_person  # se a primeira pessoa ativa for a de id "1"
+... True
+>>> pyvidesk.persons.get_by_id("1", select="businessName")  # sem requisição ao servidor
+... <Model for Person(id=1)>
+"""
+
+from threading import RLock
+
+from .model import Model
+
+
+class Session:
+    """Classe que mantém uma única instância de Model por (entidade, id)"""
+
+    def __init__(self):
+        self._identity_map = dict()
+        self._complete = set()  # modelos obtidos sem '$select', ou seja, completos
+        self._expired = set()  # modelos que devem ser obtidos novamente do servidor
+        self._lock = RLock()
+
+    def __len__(self):
+        return len(self._identity_map)
+
+    def __contains__(self, model):
+        return _get_key(model._entity, model.id) in self._identity_map
+
+    def __repr__(self):
+        return f"<Session with {len(self)} models>"
+
+    def get(self, entity, model_id):
+        """
+        Metodo que obtem o modelo da sessão, se existir.
+
+        Args:
+            entity (pyvidesk.entity.Entity): A entidade do modelo.
+            model_id (int ou str): O ID do modelo.
+
+        Returns:
+            (pyvidesk.model.Model): O modelo, se existir. None, do contrário.
+        """
+        return self._identity_map.get(_get_key(entity, model_id))
+
+    def lookup(self, entity, model_id, select=None):
+        """
+        Metodo que obtem o modelo da sessão apenas se ele puder responder a consulta
+        sem uma nova requisição ao servidor.
+
+        Args:
+            entity (pyvidesk.entity.Entity): A entidade do modelo.
+            model_id (int ou str): O ID do modelo.
+            select (list): Os nomes das propriedades que a consulta precisa. Se None,
+                o modelo precisa ter sido obtido sem '$select'.
+
+        Returns:
+            (pyvidesk.model.Model): O modelo, se puder responder a consulta. None, do contrário.
+        """
+        key = _get_key(entity, model_id)
+        with self._lock:
+            model = self._identity_map.get(key)
+            if model is None or key in self._expired:
+                return None
+            if select is None:
+                return model if key in self._complete else None
+            if all(prop in model._properties for prop in select):
+                return model
+            return None
+
+    def merge(self, entity, properties, complete=False):
+        """
+        Metodo que mescla as propriedades obtidas do servidor no modelo da sessão.
+        Se o modelo ainda não existir na sessão, ele é criado.
+
+        Args:
+            entity (pyvidesk.entity.Entity): A entidade do modelo.
+            properties (dict): As propriedades e valores obtidos pela consulta.
+            complete (bool): True, se a consulta foi feita sem '$select'. False, do contrário.
+
+        Returns:
+            (pyvidesk.model.Model): O modelo da sessão.
+        """
+        key = _get_key(entity, properties["id"])
+        with self._lock:
+            model = self._identity_map.get(key)
+            if model is None:
+                model = Model(entity, **properties)
+                self._identity_map[key] = model
+            else:
+                model._merge(properties)
+
+            self._expired.discard(key)
+            if complete:
+                self._complete.add(key)
+            return model
+
+    def expire(self, model):
+        """
+        Metodo que força a próxima consulta do modelo a ser feita ao servidor.
+        O modelo continua na sessão e será atualizado pela próxima consulta.
+        """
+        with self._lock:
+            self._expired.add(_get_key(model._entity, model.id))
+
+    def discard(self, model):
+        """Metodo que remove o modelo da sessão"""
+        key = _get_key(model._entity, model.id)
+        with self._lock:
+            self._identity_map.pop(key, None)
+            self._complete.discard(key)
+            self._expired.discard(key)
+
+    def clear(self):
+        """Metodo que remove todos os modelos da sessão"""
+        with self._lock:
+            self._identity_map.clear()
+            self._complete.clear()
+            self._expired.clear()
+
+
+def _get_key(entity, model_id):
+    return entity.__class__.__name__, model_id
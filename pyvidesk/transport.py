@@ -0,0 +1,123 @@
+"""
+Módulo com os transportes usados pela classe Api para enviar as requisições.
+
+Um transporte é qualquer objeto com o método
+``request(method, url, data=None, headers=None, stream=False, timeout=None)``, que
+retorna um objeto requests.Response. O transporte padrão (RequestsTransport) faz requisições HTTP com a
+biblioteca requests; outros transportes podem responder sem acesso à rede, como o servidor
+falso do Movidesk (pyvidesk.fake.FakeMovidesk), usado em testes e benchmarks.
+
+Exemplo de uso:
+
+>>> from pyvidesk import Pyvidesk
+>>> from pyvidesk.fake import FakeMovidesk
+
+>>> pyvidesk = Pyvidesk(token="my_token", transport=FakeMovidesk(tickets=500))
+>>> pyvidesk.tickets.query.select("id").top(3).all()
+... [<Model for Ticket(id=1)>, <Model for Ticket(id=2)>, <Model for Ticket(id=3)>]
+"""
+
+from io import BytesIO
+import re
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from . import config
+
+REDACTED_TOKEN = "<TOKEN>"
+_TOKEN_PARAM = re.compile(r"([?&]token=)([^&]*)")
+
+
+class RequestsTransport:
+    """Transporte padrão: requisições HTTP feitas com a biblioteca requests"""
+
+    def __init__(self, main_url=None):
+        """
+        Args:
+            main_url (str): URL opcional que substitui pyvidesk.config.MAIN_URL nas
+                requisições, para usar outro servidor (como o servidor local de
+                pyvidesk.fake.serve()).
+        """
+        self.main_url = main_url
+
+    def __repr__(self):
+        return f"<RequestsTransport({self.main_url or config.MAIN_URL})>"
+
+    def request(self, method, url, data=None, headers=None, stream=False, timeout=None):
+        """
+        Metodo que envia uma requisição.
+
+        Args:
+            method (str): O método HTTP (GET, PATCH, POST ou DELETE).
+            url (str): A URL completa da requisição.
+            data (bytes): O corpo opcional da requisição.
+            headers (dict): Os cabeçalhos opcionais da requisição.
+            stream (bool): True, para que o corpo da resposta seja lido aos poucos.
+            timeout (tuple): Os tempos máximos (segundos) de conexão e de cada leitura.
+                None, para esperar indefinidamente.
+
+        Returns:
+            (requests.Response): A resposta do servidor.
+        """
+        if self.main_url and url.startswith(config.MAIN_URL):
+            url = self.main_url.rstrip("/") + "/" + url[len(config.MAIN_URL) :]
+        return requests.request(
+            method, url, data=data, headers=headers, stream=stream, timeout=timeout
+        )
+
+
+def build_response(status_code, body=b"", headers=None, url=None, reason=None):
+    """
+    Funcao que cria um objeto requests.Response sem uma conexão HTTP, para transportes
+    que respondem localmente. O corpo pode ser lido inteiro (response.content) ou aos
+    poucos (response.iter_content()), como numa resposta real.
+
+    Args:
+        status_code (int): O código HTTP da resposta.
+        body (bytes): O corpo da resposta.
+        headers (dict): Os cabeçalhos da resposta.
+        url (str): A URL da requisição.
+        reason (str): O texto do código HTTP. Por padrão, o nome usado pelo requests.
+
+    Returns:
+        (requests.Response): A resposta.
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = reason or _REASONS.get(status_code, "")
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.url = url
+    response.encoding = "utf-8"
+    response.raw = BytesIO(body)
+    return response
+
+
+def get_read_timeout(timeout):
+    """Funcao que obtem o tempo máximo de leitura de um timeout (número ou tupla)"""
+    if isinstance(timeout, tuple):
+        return timeout[1]
+    return timeout
+
+
+def get_token(url):
+    """Funcao que obtem o token (parâmetro 'token') de uma URL, se houver"""
+    match = _TOKEN_PARAM.search(url)
+    return match.group(2) if match else None
+
+
+def redact_url(url):
+    """Funcao que substitui o token de uma URL por "<TOKEN>" (para logs e gravações)"""
+    return _TOKEN_PARAM.sub(r"\g<1>" + REDACTED_TOKEN, url)
+
+
+_REASONS = {
+    200: "OK",
+    204: "No Content",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
@@ -2,6 +2,8 @@
 Módulo com funcoes que são usados em múltiplos módulos desta biblioteca.
 """
 
+from requests.utils import requote_uri
+
 
 def get_property_name(prop):
     try:
@@ -10,3 +12,11 @@ def get_property_name(prop):
         name = prop
 
     return name
+
+
+def get_url_length(url):
+    """
+    Funcao que obtem o tamanho da URL (ou de parte dela) como ela será enviada ao
+    servidor, ou seja, com os caracteres especiais codificados (' ' vira '%20', etc).
+    """
+    return len(requote_uri(url))
@@ -20,6 +20,9 @@ setup(
         "Operating System :: OS Independent",
     ],
     install_requires=["requests>=2.0", "python-dateutil"],
-    extras_require={"dev": ["black", "bandit", "pylint", "python-decouple"]},
+    extras_require={
+        "dev": ["asv", "black", "bandit", "pylint", "python-decouple"],
+        "fast": ["orjson"],
+    },
     python_requires=">=3.7",
 )
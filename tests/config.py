@@ -1,3 +1,21 @@
-from decouple import config as secret
+import atexit
 
-TOKEN = secret("TOKEN")
+from decouple import config as secret, undefined
+
+import pyvidesk.config
+from pyvidesk.cassette import Cassette
+
+# Com a variável PYVIDESK_CASSETTE, as requisições dos testes são gravadas
+# (PYVIDESK_CASSETTE_MODE=record) ou reproduzidas (replay, o padrão) a partir do arquivo
+# informado, sem acesso à rede. Veja pyvidesk.cassette e benchmarks/replay.py.
+CASSETTE = None
+if secret("PYVIDESK_CASSETTE", default=""):
+    CASSETTE = Cassette(
+        secret("PYVIDESK_CASSETTE"),
+        mode=secret("PYVIDESK_CASSETTE_MODE", default="replay"),
+    )
+    pyvidesk.config.TRANSPORT = CASSETTE
+    atexit.register(CASSETTE.save)
+
+# na reprodução, o token não é necessário (ele não é gravado)
+TOKEN = secret("TOKEN", default="token" if CASSETTE is not None else undefined)
@@ -0,0 +1,72 @@
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from threading import Thread
+import unittest
+
+from pyvidesk.api import Api
+
+PAYLOAD = json.dumps(
+    [
+        {"id": i, "htmlDescription": "<p>Descrição repetitiva</p>" * 50}
+        for i in range(50)
+    ]
+).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):  # pylint: disable=invalid-name
+        body = PAYLOAD
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class TestApiCompression(unittest.TestCase):
+    """Classe que testa a compressão das respostas com um servidor local"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        host, port = self.server.server_address
+        self.api = Api(base_url=f"http://{host}:{port}/tickets?token=")
+
+    def test_get_records_compressed_and_uncompressed_bytes(self):
+        result = self.api.get(options={})
+
+        self.assertEqual(len(result), 50)
+        stats = self.api.transfer_stats
+        self.assertEqual(stats.requests, 1)
+        self.assertEqual(stats.uncompressed_bytes, len(PAYLOAD))
+        self.assertEqual(stats.compressed_bytes, len(gzip.compress(PAYLOAD)))
+        self.assertEqual(stats.last["encoding"], "gzip")
+        self.assertLess(stats.ratio, 0.1)
+
+    def test_iter_get_decompresses_while_streaming(self):
+        result = list(self.api.iter_get(options={}))
+
+        self.assertEqual([data["id"] for data in result], list(range(50)))
+        stats = self.api.transfer_stats
+        self.assertEqual(stats.uncompressed_bytes, len(PAYLOAD))
+        self.assertLess(stats.compressed_bytes, stats.uncompressed_bytes)
+        self.assertEqual(stats.as_dict()["saved_bytes"], stats.saved_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import json
+import os
+import re
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pyvidesk.api import Api
+from pyvidesk.backfill import Backfill, JsonLinesSink, shards_by_id
+from pyvidesk.exceptions import (
+    PyvideskBadResponseError,
+    PyvideskCheckpointError,
+    PyvideskPartitionError,
+)
+from pyvidesk.partition import Checkpoint
+from pyvidesk.query import Q
+from pyvidesk.tickets import Tickets
+from pyvidesk.utils import get_url_length
+
+
+class FakeApi(Api):
+    """Api que responde os IDs do filtro 'id ge x and id lt y', sem requisições"""
+
+    failing = ()
+
+    def get(self, options):
+        start, end = map(int, re.findall(r"id [gl][et] (\d+)", options["$filter"]))
+        if start in self.failing:
+            raise PyvideskBadResponseError("HTTP 500")
+        start += options.get("$skip", 0)
+        end = min(end, start + options["$top"])
+        return [{"id": ticket_id} for ticket_id in range(start, end)]
+
+
+def _failing_transform(data):
+    """Funcao que falha na resposta de ID 1500 (uma falha que não é do pyvidesk)"""
+    if data["id"] == 1500:
+        raise KeyError("subject")
+    return data
+
+
+class TestBackfill(unittest.TestCase):
+    """Classe que testa a carga histórica (backfill.py)"""
+
+    def setUp(self):
+        self.tickets = Tickets(token="")
+        self.tickets.api = FakeApi(base_url=self.tickets.api.base_url)
+        self.properties = self.tickets.get_properties()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.shards = shards_by_id(self.tickets.query.select("id"), 0, 2500, 1000)
+
+    def _read(self, key):
+        with open(os.path.join(self.directory, key + ".jsonl"), encoding="utf-8") as f:
+            return [json.loads(line)["id"] for line in f]
+
+    def test_shards_by_id(self):
+        self.assertEqual(
+            [shard.key for shard in self.shards], ["0-1000", "1000-2000", "2000-2500"]
+        )
+
+    def test_run_in_processes(self):
+        backfill = Backfill(
+            self.shards, sink=JsonLinesSink(self.directory), max_workers=2
+        )
+        counts = backfill.run()
+
+        self.assertEqual(counts, {"0-1000": 1000, "1000-2000": 1000, "2000-2500": 500})
+        self.assertEqual(self._read("2000-2500"), list(range(2000, 2500)))
+
+    def test_rerun_only_unfinished_shards(self):
+        manifest_path = os.path.join(self.directory, "manifest.json")
+        FakeApi.failing = (1000,)
+        self.addCleanup(setattr, FakeApi, "failing", ())
+        backfill = Backfill(
+            self.shards,
+            sink=JsonLinesSink(self.directory),
+            manifest=Checkpoint(manifest_path),
+            processes=False,
+        )
+        with self.assertRaises(PyvideskPartitionError):
+            backfill.run()
+        self.assertFalse(
+            os.path.exists(os.path.join(self.directory, "1000-2000.jsonl"))
+        )
+
+        FakeApi.failing = ()
+        backfill = Backfill(
+            self.shards,
+            sink=JsonLinesSink(self.directory),
+            manifest=Checkpoint(manifest_path),
+            processes=False,
+        )
+        self.assertEqual([shard.key for shard in backfill.pending()], ["1000-2000"])
+        self.assertEqual(backfill.run(), {"1000-2000": 1000})
+
+        # o mesmo manifesto com outra consulta (mesmas faixas de IDs)
+        shards = shards_by_id(self.tickets.query.select("id", "subject"), 0, 2500, 1000)
+        backfill = Backfill(
+            shards,
+            sink=JsonLinesSink(self.directory),
+            manifest=Checkpoint(manifest_path),
+            processes=False,
+        )
+        with self.assertRaises(PyvideskCheckpointError):
+            backfill.run()
+
+    def test_failure_outside_pyvidesk(self):
+        backfill = Backfill(
+            self.shards,
+            sink=JsonLinesSink(self.directory),
+            manifest=Checkpoint(os.path.join(self.directory, "manifest.json")),
+            transform=_failing_transform,
+            processes=False,
+        )
+        with self.assertRaises(PyvideskPartitionError) as context:
+            backfill.run()
+        ((shard, error),) = context.exception.errors.items()
+        self.assertEqual(shard.key, "1000-2000")
+        self.assertIsInstance(error, KeyError)
+        self.assertEqual(self._read("2000-2500"), list(range(2000, 2500)))
+        self.assertEqual([shard.key for shard in backfill.pending()], ["1000-2000"])
+
+    def test_long_url_is_split(self):
+        ids_filter = Q(self.properties["id"] == 0)
+        for ticket_id in range(1, 150):
+            ids_filter |= Q(self.properties["id"] == ticket_id)
+        query = self.tickets.query.select("id").filter(ids_filter).max_url_length(500)
+        shards = shards_by_id(query, 0, 200, 100)
+
+        def fake_get(options):
+            start, end = map(int, re.findall(r"id [gl][et] (\d+)", options["$filter"]))
+            ids = map(int, re.findall(r"id eq (\d+)", options["$filter"]))
+            return [{"id": ticket_id} for ticket_id in ids if start <= ticket_id < end]
+
+        backfill = Backfill(shards, sink=JsonLinesSink(self.directory), processes=False)
+        with patch.object(self.tickets.api, "get", side_effect=fake_get) as get:
+            counts = backfill.run()
+
+        self.assertEqual(counts, {"0-100": 100, "100-200": 50})
+        self.assertGreater(get.call_count, 2)
+        for call in get.call_args_list:
+            url = self.tickets.api._get_url(options=call.kwargs["options"])
+            self.assertLessEqual(get_url_length(url), 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
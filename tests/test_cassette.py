@@ -0,0 +1,75 @@
+import gzip
+import os
+import tempfile
+import time
+import unittest
+
+from pyvidesk import Pyvidesk
+from pyvidesk.cassette import Cassette
+from pyvidesk.exceptions import PyvideskCassetteError
+from pyvidesk.fake import FakeMovidesk
+
+TOKEN = "3f2c1a9e-secret-token"
+
+
+class TestCassette(unittest.TestCase):
+    """Classe que testa a gravação e reprodução das requisições (cassette.py)"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "tickets.jsonl.gz")
+        self.fake = FakeMovidesk(tickets=30, persons=5, token=TOKEN, latency=0.02)
+
+    def _record(self):
+        with Cassette(self.path, mode="record", transport=self.fake) as cassette:
+            pyvidesk = Pyvidesk(token=TOKEN, transport=cassette)
+            tickets = pyvidesk.tickets
+            result = tickets.query.select("id", "subject").top(10).all()
+            person = pyvidesk.persons.get_by_id("1")
+            person.businessName = "Novo nome"
+            person.save()
+        return result
+
+    def test_record_redacts_token(self):
+        self._record()
+        with gzip.open(self.path, "rt", encoding="utf-8") as file:
+            content = file.read()
+
+        self.assertEqual(len(content.splitlines()), 4)
+        self.assertNotIn(TOKEN, content)
+        self.assertIn("token=<TOKEN>", content)
+
+    def test_replay(self):
+        expected = self._record()
+        cassette = Cassette(self.path)
+        pyvidesk = Pyvidesk(token="other-token", transport=cassette)
+
+        start = time.perf_counter()
+        result = pyvidesk.tickets.query.select("id", "subject").top(10).all()
+        self.assertLess(time.perf_counter() - start, 0.02)
+        self.assertEqual(
+            [(t.id, t.subject) for t in result], [(t.id, t.subject) for t in expected]
+        )
+        self.assertEqual(self.fake.request_count, 4)
+
+        with self.assertRaises(PyvideskCassetteError):
+            pyvidesk.tickets.query.select("id").top(11).all()
+
+    def test_replay_with_original_timing(self):
+        self._record()
+        cassette = Cassette(self.path, mode="once", speed=1.0)
+        self.assertEqual(cassette.mode, "replay")
+        tickets = Pyvidesk(token=TOKEN, transport=cassette).tickets
+
+        start = time.perf_counter()
+        tickets.query.select("id", "subject").top(10).all()
+        self.assertGreaterEqual(time.perf_counter() - start, 0.02)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            Cassette(self.path, mode="rewind")
+
+
+if __name__ == "__main__":
+    unittest.main()
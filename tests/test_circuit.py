@@ -0,0 +1,132 @@
+import pickle
+import time
+import unittest
+
+from pyvidesk import Pyvidesk
+from pyvidesk.circuit import CircuitBreaker
+from pyvidesk.exceptions import (
+    PyvideskBadResponseError,
+    PyvideskCircuitOpenError,
+    PyvideskRequestsError,
+)
+from pyvidesk.fake import FakeMovidesk
+from pyvidesk.hooks import Hooks
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Classe que testa o disjuntor das requisições (circuit.py)"""
+
+    def setUp(self):
+        self.fake = FakeMovidesk(tickets=5, persons=5, services=0, error_rate=1.0)
+        self.breaker = CircuitBreaker(
+            failure_rate=0.5, min_requests=4, window=60.0, open_timeout=0.05
+        )
+        self.pyvidesk = Pyvidesk(
+            token="x", transport=self.fake, circuit_breaker=self.breaker
+        )
+
+    def _fail(self, entity, times):
+        for _ in range(times):
+            with self.assertRaises(PyvideskBadResponseError):
+                entity.query.all()
+
+    def test_open_and_close(self):
+        tickets = self.pyvidesk.tickets
+        self._fail(tickets, 4)
+        self.assertEqual(self.breaker.state("tickets"), "open")
+        self.assertEqual(self.breaker.state("persons"), "closed")
+
+        requests = self.fake.request_count
+        with self.assertRaises(PyvideskCircuitOpenError) as context:
+            self.pyvidesk.tickets.query.all()
+        self.assertIsInstance(context.exception, PyvideskRequestsError)
+        self.assertEqual(context.exception.entity, "tickets")
+        self.assertEqual(self.fake.request_count, requests)  # sem acessar o servidor
+
+        # a requisição de teste falha e o circuito abre de novo
+        time.sleep(0.06)
+        self.assertEqual(self.breaker.state("tickets"), "half-open")
+        self._fail(tickets, 1)
+        self.assertEqual(self.breaker.state("tickets"), "open")
+
+        time.sleep(0.06)
+        self.fake.error_rate = 0.0
+        self.assertEqual(len(tickets.query.all()), 5)
+        self.assertEqual(self.breaker.state("tickets"), "closed")
+
+    def test_half_open_limits_probes(self):
+        self._fail(self.pyvidesk.tickets, 4)
+        time.sleep(0.06)
+        self.breaker.before_request("tickets")  # a requisição de teste em andamento
+        with self.assertRaisesRegex(PyvideskCircuitOpenError, "half-open"):
+            self.breaker.before_request("tickets")
+
+    def test_interrupted_probe_is_released(self):
+        hooks = Hooks()
+        tickets = Pyvidesk(
+            token="x", transport=self.fake, circuit_breaker=self.breaker, hooks=hooks
+        ).tickets
+        self._fail(tickets, 4)
+        time.sleep(0.06)
+        self.fake.error_rate = 0.0
+
+        @hooks.register("before_request")
+        def interrupt(event):
+            hooks.unregister("before_request", interrupt)
+            raise RuntimeError("evento com erro")
+
+        with self.assertRaises(RuntimeError):  # a requisição de teste é interrompida
+            tickets.query.all()
+        self.assertEqual(self.breaker.state("tickets"), "half-open")
+        self.assertEqual(len(tickets.query.all()), 5)
+        self.assertEqual(self.breaker.state("tickets"), "closed")
+
+    def test_only_probes_take_and_release_slots(self):
+        breaker = CircuitBreaker(min_requests=1, open_timeout=0.05)
+        started_closed = breaker.before_request("tickets")
+        self.assertIsNone(started_closed)
+        breaker.record("tickets", True, 0.001)  # outra requisição abre o circuito
+        time.sleep(0.06)
+        probe = breaker.before_request("tickets")
+        self.assertIsNotNone(probe)
+
+        # a requisição iniciada com o circuito fechado não devolve a vaga de teste
+        breaker.release("tickets", started_closed)
+        breaker.record("tickets", False, 0.001, probe=started_closed)
+        self.assertEqual(breaker.state("tickets"), "half-open")
+        with self.assertRaises(PyvideskCircuitOpenError):
+            breaker.before_request("tickets")
+
+        breaker.release("tickets", probe)
+        probe = breaker.before_request("tickets")
+        breaker.record("tickets", False, 0.001, probe=probe)
+        self.assertEqual(breaker.state("tickets"), "closed")
+
+    def test_failure_rate_and_slow_requests(self):
+        self.fake.error_rate = 0.0
+        persons = self.pyvidesk.persons
+        for _ in range(6):
+            persons.query.all()
+        with self.assertRaises(PyvideskBadResponseError):  # 404 não é uma falha
+            persons.get_by_id("999")
+        self.assertEqual(self.breaker.state("persons"), "closed")
+
+        breaker = CircuitBreaker(min_requests=2, slow_request=0.01, slow_rate=0.5)
+        breaker.record("tickets", False, 0.001)
+        breaker.record("tickets", False, 0.5)
+        self.assertEqual(breaker.state("tickets"), "open")
+        breaker.reset()
+        self.assertEqual(breaker.state("tickets"), "closed")
+
+    def test_can_be_pickled(self):
+        self._fail(self.pyvidesk.tickets, 4)
+        breaker = pickle.loads(pickle.dumps(self.breaker))
+        self.assertEqual(breaker.state("tickets"), "open")
+        error = pickle.loads(
+            pickle.dumps(PyvideskCircuitOpenError("tickets", "open", 1))
+        )
+        self.assertEqual(error.entity, "tickets")
+
+
+if __name__ == "__main__":
+    unittest.main()
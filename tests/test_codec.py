@@ -0,0 +1,51 @@
+import pickle
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pyvidesk.codec import get_codec
+from pyvidesk.persons import Persons
+
+
+class TestCodec(unittest.TestCase):
+    """Classe que testa os codecs JSON (codec.py)"""
+
+    data = {"id": "1", "businessName": "Pessoa ç", "tags": ["a"], "value": 1.5}
+
+    def test_json_codec(self):
+        codec = get_codec("json")
+        encoded = codec.dumps(self.data)
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(codec.loads(encoded), self.data)
+
+    def test_auto_codec(self):
+        codec = get_codec("auto")
+        self.assertIn(codec.name, ("orjson", "ujson", "json"))
+        self.assertEqual(codec.loads(get_codec("json").dumps(self.data)), self.data)
+
+    def test_invalid_codec(self):
+        with self.assertRaises(ValueError):
+            get_codec("yaml")
+
+    def test_codec_can_be_pickled(self):
+        codec = get_codec("json")
+        self.assertIs(pickle.loads(pickle.dumps(codec)), codec)
+
+    def test_api_uses_codec(self):
+        persons = Persons(token="")
+        codec = MagicMock(wraps=get_codec("json"))
+        persons.api.codec = codec
+        response = MagicMock(status_code=200, content=b'{"id": "1"}')
+        with patch(
+            "pyvidesk.transport.requests.request", return_value=response
+        ) as requests_patch:
+            self.assertEqual(persons.api.get(options={}), {"id": "1"})
+            persons.api.patch(changes=self.data, model_id="1")
+
+        codec.loads.assert_called_with(b'{"id": "1"}')
+        self.assertEqual(
+            requests_patch.call_args.kwargs["data"], get_codec("json").dumps(self.data)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+from pyvidesk import Pyvidesk
+from pyvidesk.backfill import Backfill, JsonLinesSink, shards_by_id
+from pyvidesk.exceptions import PyvideskDeadlineError, PyvideskRequestsError
+from pyvidesk.fake import FakeMovidesk
+from pyvidesk.partition import Checkpoint
+
+
+class TestDeadline(unittest.TestCase):
+    """Classe que testa os tempos máximos das requisições e os prazos das operações"""
+
+    def setUp(self):
+        self.fake = FakeMovidesk(tickets=50, persons=0, services=0, latency=0.05)
+        self.tickets = Pyvidesk(token="x", transport=self.fake).tickets
+        patcher = mock.patch("pyvidesk.config.PAGE_SIZE", 5)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_timeout(self):
+        tickets = Pyvidesk(token="x", transport=self.fake, timeout=(1.0, 0.01)).tickets
+        with self.assertRaises(PyvideskRequestsError):
+            tickets.get_by_id(1)
+        self.assertEqual(tickets.api.timeout, (1.0, 0.01))
+
+    def test_query_deadline(self):
+        query = self.tickets.query.select("id").top(50)
+        with self.assertRaises(ValueError):
+            query.deadline(0)
+
+        with self.assertRaises(PyvideskDeadlineError) as context:
+            query.deadline(0.13).all()
+        error = context.exception
+        self.assertTrue(0 < len(error.partial) < 50)
+        self.assertEqual(error.progress["items"], len(error.partial))
+        self.assertIn(f"items={len(error.partial)}", str(error))
+
+        # a consulta que falta, sem prazo, completa as respostas
+        rest = error.resume_query.deadline(None).all()
+        ids = [ticket.id for ticket in error.partial + rest]
+        self.assertEqual(ids, [ticket.id for ticket in query.all()])
+
+        copy = pickle.loads(pickle.dumps(error))
+        self.assertEqual(copy.progress, error.progress)
+
+    def test_no_deadline(self):
+        self.assertEqual(len(self.tickets.query.select("id").deadline(5).all()), 50)
+        self.assertEqual(self.tickets.query.deadline(5).count(), 50)
+
+    def test_scan_deadline(self):
+        properties = self.tickets.get_properties()
+        partitioned_query = (
+            self.tickets.query.select("id")
+            .deadline(0.13)
+            .partition_by(
+                properties["createdDate"],
+                start=date(2019, 1, 1),
+                end=date(2021, 1, 1),
+                window=timedelta(days=90),
+            )
+        )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        checkpoint = Checkpoint(os.path.join(directory.name, "checkpoint.json"))
+
+        scanned = []
+        with self.assertRaises(PyvideskDeadlineError) as context:
+            for window, _ in partitioned_query.scan(checkpoint=checkpoint):
+                scanned.append(window.key)
+        progress = context.exception.progress
+        self.assertEqual(progress["completed"], len(scanned))
+        self.assertEqual(progress["completed"] + progress["pending"], 9)
+        self.assertTrue(all(checkpoint.is_done(key) for key in scanned))
+
+    def test_backfill_deadline(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        shards = shards_by_id(self.tickets.query.select("id"), 1, 51, 10)
+        backfill = Backfill(
+            shards,
+            sink=JsonLinesSink(directory.name),
+            manifest=Checkpoint(os.path.join(directory.name, "manifest.json")),
+            max_workers=1,
+            processes=False,
+        )
+
+        with self.assertRaises(PyvideskDeadlineError) as context:
+            backfill.run(deadline=0.15)
+        error = context.exception
+        self.assertEqual(error.progress["completed"], len(error.partial))
+        self.assertEqual(error.progress["completed"] + error.progress["pending"], 5)
+        self.assertEqual(len(backfill.pending()), error.progress["pending"])
+
+        self.assertEqual(sum(backfill.run().values()), 50 - sum(error.partial.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
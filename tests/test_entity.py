@@ -51,3 +51,27 @@ class TestEntity(unittest.TestCase):
             PyvideskPropertyWithWrongType,
             _test_raise_query_options_with_wrong_type_error,
         )
+
+    def test_get_by_method_is_cached_on_class(self):
+        tickets = Tickets(token=TOKEN)
+        tickets.get_by_ownerTeam
+        self.assertIn("get_by_ownerTeam", Tickets.__dict__)
+        self.assertIs(
+            Tickets.__dict__["get_by_ownerTeam"],
+            Tickets(token="").get_by_ownerTeam.__func__,
+        )
+
+    def test_get_by_method_keeps_instance(self):
+        result = Tickets(token="other_token").get_by_ownerTeam("Suporte").as_url()
+        self.assertTrue(result.startswith(Tickets.BASE_URL + "?token=other_token"))
+
+    def test_get_properties_returns_new_dict(self):
+        properties = self.tickets.get_properties()
+        properties.pop("id")
+        self.assertIn("id", self.tickets.get_properties())
+        self.assertIs(properties["subject"], self.tickets.get_properties()["subject"])
+
+    def test_get_by_falsy_kwarg(self):
+        result = self.tickets.get_by_isDeleted(isDeleted=False).as_url()
+        expected = self.tickets.api.base_url + "&$filter=isDeleted eq false"
+        self.assertEqual(result, expected)
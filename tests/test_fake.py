@@ -0,0 +1,142 @@
+from datetime import date
+import json
+import pickle
+import unittest
+
+from pyvidesk import Pyvidesk
+from pyvidesk.exceptions import PyvideskBadResponseError
+from pyvidesk.fake import FakeMovidesk, generate_fixtures, parse_filter, serve
+from pyvidesk.lambdas import Any
+from pyvidesk.query import Q
+from pyvidesk.tickets import Tickets
+from pyvidesk.transport import RequestsTransport
+
+
+class TestFakeMovidesk(unittest.TestCase):
+    """Classe que testa o servidor falso do Movidesk (fake.py)"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fixtures = generate_fixtures(Tickets, 1500, seed=1)
+
+    def setUp(self):
+        self.fake = FakeMovidesk(tickets=self.fixtures, persons=10, services=0)
+        self.tickets = Pyvidesk(token="x", transport=self.fake).tickets
+        self.properties = self.tickets.get_properties()
+
+    def test_generate_fixtures(self):
+        self.assertEqual(generate_fixtures(Tickets, 3, seed=1), self.fixtures[:3])
+        self.assertEqual([data["id"] for data in self.fixtures[:3]], [1, 2, 3])
+        self.assertIsInstance(self.fixtures[0]["actions"], list)
+        self.assertEqual(self.fake.data["persons"][0]["id"], "1")
+
+    def test_parse_filter(self):
+        data = {
+            "id": 7,
+            "subject": "Nota fiscal",
+            "createdDate": "2020-05-01T10:00:00",
+            "tags": ["a", "b"],
+            "clients": [{"id": "1", "organization": {"id": "9"}}],
+        }
+        filters = {
+            "id eq 7 and subject eq 'Nota fiscal'": True,
+            "(id lt 5 or id in (6, 7)) and not (id eq 6)": True,
+            "contains(subject, 'FISCAL')": True,
+            "createdDate ge 2020-05-01T00:00:00Z and createdDate lt 2020-06-01Z": True,
+            "tags/any(x: x eq 'b') and tags/all(x: x ne 'c')": True,
+            "clients/any(x: x/organization/id eq '9')": True,
+            "clients/any(x: x/id eq '2') or owner eq null": True,
+            "id gt null": False,
+        }
+        for text, expected in filters.items():
+            with self.subTest(text=text):
+                self.assertIs(parse_filter(text)(data), expected)
+
+        with self.assertRaises(ValueError):
+            parse_filter("id eq")
+
+    def test_query(self):
+        query = self.tickets.query.filter(self.properties["id"] > 1000)
+        self.assertEqual(query.count(), 500)
+        self.assertEqual(len(query.select("id").top(1200).all()), 500)
+
+        ticket_filter = Q(self.properties["id"] == 3) | Q(self.properties["id"] == 5)
+        result = self.tickets.query.filter(ticket_filter).select("id", "subject").all()
+        self.assertEqual([ticket.id for ticket in result], [3, 5])
+        self.assertEqual(result[1].subject, self.fixtures[4]["subject"])
+
+        result = self.tickets.query.filter(
+            self.properties["createdDate"] >= date(2020, 1, 1)
+        ).count()
+        expected = sum(
+            1 for data in self.fixtures if (data["createdDate"] or "") >= "2020-01-01"
+        )
+        self.assertEqual(result, expected)
+
+    def test_select_and_expand(self):
+        client_id = next(
+            data["clients"][0]["id"] for data in self.fixtures if data["clients"]
+        )
+        query = (
+            self.tickets.query.filter(Any(self.properties["clients"].id == client_id))
+            .select("id")
+            .expand("clients", select="id")
+        )
+        status_code, _, body = self.fake.handle("GET", query.as_url())
+
+        self.assertEqual(status_code, 200)
+        for data in json.loads(body):
+            self.assertEqual(set(data), {"id", "clients"})
+            self.assertIn({"id": client_id}, data["clients"])
+
+    def test_get_by_id_and_changes(self):
+        self.assertEqual(self.tickets.get_by_id(10).id, 10)
+        with self.assertRaises(PyvideskBadResponseError):
+            self.tickets.get_by_id(5000)
+
+        persons = Pyvidesk(token="x", transport=self.fake).persons
+        person = persons.get_by_id("1")
+        person.businessName = "Novo nome"
+        person.save()
+        self.assertEqual(self.fake.data["persons"][0]["businessName"], "Novo nome")
+        person.delete()
+        self.assertEqual(len(self.fake.data["persons"]), 9)
+
+    def test_token_errors_and_rate_limit(self):
+        fake = FakeMovidesk(tickets=5, token="secret", rate_limit=(2, 60.0))
+        tickets = Pyvidesk(token="secret", transport=fake).tickets
+        self.assertEqual(len(tickets.query.all()), 5)
+        self.assertEqual(len(tickets.query.all()), 5)
+        with self.assertRaisesRegex(PyvideskBadResponseError, "429"):
+            tickets.query.all()
+
+        status_code, _, _ = fake.handle("GET", "/public/v1/tickets?token=other")
+        self.assertEqual(status_code, 429)
+        fake.rate_limit = None
+        status_code, _, _ = fake.handle("GET", "/public/v1/tickets?token=other")
+        self.assertEqual(status_code, 401)
+
+        fake.error_rate = 1.0
+        with self.assertRaisesRegex(PyvideskBadResponseError, "500"):
+            tickets.query.all()
+
+    def test_can_be_pickled(self):
+        fake = pickle.loads(pickle.dumps(self.fake))
+        self.assertEqual(fake.data, self.fake.data)
+
+    def test_serve(self):
+        server = serve(self.fake)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        tickets = Pyvidesk(token="x", transport=RequestsTransport(server.url)).tickets
+
+        self.assertEqual(tickets.get_by_id(2).id, 2)
+        query = tickets.query.filter(self.properties["subject"].contains("nota fiscal"))
+        expected = sum(
+            1 for data in self.fixtures if "nota fiscal" in (data["subject"] or "")
+        )
+        self.assertEqual(query.count(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
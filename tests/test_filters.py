@@ -0,0 +1,93 @@
+import unittest
+
+from pyvidesk.filters import In, Raw, render_filters
+from pyvidesk.lambdas import Any
+from pyvidesk.query import Q
+from pyvidesk.tickets import Tickets
+
+
+class TestFilters(unittest.TestCase):
+    """Classe que testa as expressões do arquivo filters.py"""
+
+    properties = Tickets(token="").get_properties()
+
+    def test_q_objects_compose(self):
+        result = (Q(self.properties["id"] == 1) | Q(self.properties["id"] == 2)) & ~Q(
+            self.properties["tags"].has("Teste")
+        )
+        expected = "((id eq 1 or id eq 2) and not tags/any(x: x eq 'Teste'))"
+        self.assertEqual(str(result), expected)
+
+    def test_q_objects_mix_with_expressions(self):
+        id_property = self.properties["id"]
+        result = Q(id_property == 1) & (id_property == 2)
+        self.assertIsInstance(result, Q)
+        self.assertEqual(str(result), "(id eq 1 and id eq 2)")
+        result = (id_property == 1) | Q(id_property == 2)
+        self.assertIsInstance(result, Q)
+        self.assertEqual(str(result), "(id eq 1 or id eq 2)")
+        self.assertEqual(str(Q(id_property == 1) | "id eq 3"), "(id eq 1 or id eq 3)")
+        with self.assertRaises(TypeError):
+            (id_property == 1) & 2
+
+    def test_not_comparison_uses_parentheses(self):
+        result = ~Q(self.properties["id"] == 1)
+        self.assertEqual(str(result), "not (id eq 1)")
+
+    def test_flatten_nested_operators(self):
+        id_property = self.properties["id"]
+        expression = (id_property == 1) | ((id_property == 2) | (id_property == 3))
+        self.assertEqual(str(expression.simplify()), "(id eq 1 or id eq 2 or id eq 3)")
+
+    def test_remove_duplicated_clauses(self):
+        id_property = self.properties["id"]
+        expression = (id_property == 1) | (id_property == 1)
+        self.assertEqual(expression.simplify(), "id eq 1")
+
+    def test_remove_double_negation(self):
+        expression = ~~(self.properties["id"] == 1)
+        self.assertEqual(expression.simplify(), "id eq 1")
+
+    def test_fold_eq_into_in(self):
+        id_property = self.properties["id"]
+        expression = (
+            (id_property == 1)
+            | (id_property == 2)
+            | (self.properties["subject"] == "Teste")
+            | (id_property == 3)
+            | (id_property == 2)
+        )
+        expected = "(id in (1, 2, 3) or subject eq 'Teste')"
+        self.assertEqual(expression.simplify(fold_in=True), expected)
+        self.assertIsInstance(expression.simplify(fold_in=True).operands[0], In)
+
+    def test_fold_in_only_inside_or(self):
+        id_property = self.properties["id"]
+        expression = (id_property == 1) & (id_property == 2)
+        self.assertEqual(expression.simplify(fold_in=True), "(id eq 1 and id eq 2)")
+
+    def test_render_filters_without_outer_parentheses(self):
+        id_property = self.properties["id"]
+        result = render_filters(
+            (id_property > 1, id_property > 1, Q(id_property < 5).filter)
+        )
+        self.assertEqual(result, "id gt 1 and id lt 5")
+
+    def test_raw_strings_are_kept(self):
+        result = render_filters(("id eq 1", Raw("subject eq 'Teste'")))
+        self.assertEqual(result, "id eq 1 and subject eq 'Teste'")
+
+    def test_lambda_predicate_is_an_expression(self):
+        result = Any(self.properties["clients"].id == "2")
+        self.assertEqual(str(result.predicate), "x/id eq '2'")
+
+    def test_query_filter_accepts_q(self):
+        id_property = self.properties["id"]
+        query = Tickets(token="").query.filter(
+            Q(id_property == 1) | Q(id_property == 2)
+        )
+        self.assertEqual(query._get_options()["$filter"], "(id eq 1 or id eq 2)")
+
+
+if __name__ == "__main__":
+    unittest.main()
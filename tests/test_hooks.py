@@ -0,0 +1,150 @@
+import pickle
+import unittest
+from unittest import mock
+
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from pyvidesk import Pyvidesk
+from pyvidesk.exceptions import PyvideskBadResponseError, PyvideskRequestsError
+from pyvidesk.fake import FakeMovidesk
+from pyvidesk.hooks import Hooks
+from pyvidesk.metrics import MetricsCollector
+from pyvidesk.transport import build_response
+
+
+class _FlakyTransport:
+    """Transporte que responde com os erros (códigos HTTP ou exceções) da lista antes
+    de repassar as requisições ao servidor falso"""
+
+    def __init__(self, fake, failures):
+        self.fake = fake
+        self.failures = list(failures)
+
+    def request(self, method, url, data=None, headers=None, stream=False, timeout=None):
+        if self.failures:
+            failure = self.failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return build_response(failure, headers={"Retry-After": "1"}, url=url)
+        return self.fake.request(
+            method, url, data=data, headers=headers, stream=stream, timeout=timeout
+        )
+
+
+class TestHooks(unittest.TestCase):
+    """Classe que testa os eventos das requisições (hooks.py) e as métricas (metrics.py)"""
+
+    def setUp(self):
+        self.fake = FakeMovidesk(tickets=20, persons=5, services=0)
+        self.hooks = Hooks()
+        self.events = []
+        for event in ("before_request", "after_response", "on_error", "on_retry"):
+            self.hooks.register(event, self.events.append)
+        patcher = mock.patch.multiple(
+            "pyvidesk.config", RETRIES=2, RETRY_BACKOFF=0.0, RETRY_MAX_DELAY=0.0
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _pyvidesk(self, failures=()):
+        transport = _FlakyTransport(self.fake, failures)
+        return Pyvidesk(token="my_secret_token", transport=transport, hooks=self.hooks)
+
+    def test_events(self):
+        self._pyvidesk().tickets.query.select("id").top(5).all()
+
+        before, after = self.events
+        self.assertEqual(before.name, "before_request")
+        self.assertEqual(after.name, "after_response")
+        self.assertEqual(
+            (after.entity, after.method, after.status), ("tickets", "GET", 200)
+        )
+        self.assertIn("token=<TOKEN>", after.url)
+        self.assertNotIn("my_secret_token", after.url)
+        self.assertGreater(after.bytes, 0)
+        self.assertGreaterEqual(after.latency, 0)
+
+    def test_retries(self):
+        error = RequestsConnectionError("conexão recusada")
+        tickets = self._pyvidesk(failures=[error, 503]).tickets
+        self.assertEqual(len(tickets.query.top(5).all()), 5)
+        names = [(event.name, event.attempt) for event in self.events]
+        self.assertEqual(
+            names,
+            [
+                ("before_request", 0),
+                ("on_retry", 0),
+                ("before_request", 1),
+                ("after_response", 1),
+                ("on_retry", 1),
+                ("before_request", 2),
+                ("after_response", 2),
+            ],
+        )
+        self.assertIs(self.events[1].error, error)
+        self.assertEqual(self.events[4].status, 503)
+
+        self.events.clear()
+        tickets = self._pyvidesk(failures=[500, 500, 500]).tickets
+        with self.assertRaisesRegex(PyvideskBadResponseError, "500"):
+            tickets.query.all()
+        self.assertEqual(self.events[-1].name, "on_error")
+        self.assertEqual(self.events[-1].status, 500)
+
+        persons = self._pyvidesk(failures=[error]).persons
+        with self.assertRaises(PyvideskRequestsError):  # POST não é repetido
+            persons.api.post({"businessName": "Nome"})
+
+        tickets = self._pyvidesk(failures=[503]).tickets
+        with self.assertRaisesRegex(PyvideskBadResponseError, "503"):  # nem PATCH
+            tickets.api.patch({"subject": "Assunto"}, model_id=1)
+        tickets = self._pyvidesk(failures=[429]).tickets
+        self.assertEqual(tickets.api.patch({"subject": "Assunto"}, model_id=1)["id"], 1)
+
+    def test_unregister(self):
+        self.hooks.unregister("before_request", self.events.append)
+        self._pyvidesk().tickets.get_by_id(1)
+        self.assertEqual([event.name for event in self.events], ["after_response"])
+        with self.assertRaises(ValueError):
+            self.hooks.register("after_request", print)
+
+    def test_metrics(self):
+        metrics = MetricsCollector(buckets=(0.5, 10.0)).attach(self.hooks)
+        pyvidesk = self._pyvidesk(failures=[429])
+        pyvidesk.tickets.query.top(5).all()
+        pyvidesk.tickets.get_by_id(3)
+        with self.assertRaises(PyvideskBadResponseError):
+            pyvidesk.persons.get_by_id("999")
+
+        values = metrics.as_dict()
+        tickets = values["tickets"]["GET"]
+        self.assertEqual(tickets["requests"], 3)
+        self.assertEqual(tickets["statuses"], {429: 1, 200: 2})
+        self.assertEqual(tickets["retries"], 1)
+        self.assertEqual(tickets["latency"]["count"], 3)
+        self.assertEqual(tickets["latency"]["buckets"]["+Inf"], 3)
+        self.assertEqual(values["persons"]["GET"]["errors"], {404: 1})
+
+        text = metrics.to_prometheus()
+        self.assertIn("# TYPE pyvidesk_requests_total counter", text)
+        self.assertIn(
+            'pyvidesk_requests_total{entity="tickets",method="GET",status="429"} 1',
+            text,
+        )
+        self.assertIn(
+            'pyvidesk_request_duration_seconds_bucket{entity="tickets",method="GET",'
+            'le="+Inf"} 3',
+            text,
+        )
+        self.assertIn(
+            'pyvidesk_errors_total{entity="persons",method="GET",error="404"} 1', text
+        )
+
+        copy = pickle.loads(pickle.dumps(metrics))
+        self.assertEqual(copy.as_dict(), values)
+        metrics.reset()
+        self.assertEqual(metrics.as_dict(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pyvidesk.jsonstream import iter_array
+from pyvidesk.tickets import Tickets
+
+
+def _split(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestJsonStream(unittest.TestCase):
+    """Classe que testa a decodificação em "streaming" (jsonstream.py)"""
+
+    data = [
+        {"id": 1, "subject": 'Colchetes [], chaves {}, vírgulas, e "aspas"'},
+        {"id": 2, "actions": [{"id": 1, "tags": ["a", "b"]}], "empty": {}},
+        {"id": 3, "description": 'barra \\ e " no fim\\'},
+        {"id": 4, "nested": [[1, 2], [], [{"x": None}]], "value": -1.5e3},
+    ]
+
+    def test_any_chunk_size(self):
+        raw = json.dumps(self.data, ensure_ascii=False).encode()
+        for size in (1, 2, 3, 7, 64, len(raw)):
+            self.assertEqual(list(iter_array(_split(raw, size))), self.data, size)
+
+    def test_elements_are_yielded_before_the_end(self):
+        raw = json.dumps(self.data).encode()
+        chunks = iter(_split(raw, 16))
+        elements = iter_array(chunks)
+        self.assertEqual(next(elements), self.data[0])
+        self.assertIsNotNone(next(chunks, None))  # ainda há bytes a serem lidos
+
+    def test_empty_array_and_whitespace(self):
+        self.assertEqual(list(iter_array([b" [ ", b" ]\n"])), [])
+        self.assertEqual(
+            list(iter_array([b'[\n {"id": 1} ,\n', b' {"id": 2}\n]'])),
+            [
+                {"id": 1},
+                {"id": 2},
+            ],
+        )
+
+    def test_single_object(self):
+        self.assertEqual(list(iter_array([b'{"id":', b' "1"}'])), [{"id": "1"}])
+
+    def test_incomplete_array(self):
+        with self.assertRaises(ValueError):
+            list(iter_array([b'[{"id": 1}, {"id": 2}']))
+
+    def test_query_stream(self):
+        tickets = Tickets(token="")
+        response = MagicMock(status_code=200)
+        response.iter_content.return_value = _split(json.dumps(self.data).encode(), 10)
+        with patch("pyvidesk.transport.requests.request", return_value=response) as get:
+            result = list(tickets.query.select("id").stream().records())
+
+        self.assertEqual([ticket.id for ticket in result], [1, 2, 3, 4])
+        self.assertTrue(get.call_args.kwargs["stream"])
+        response.close.assert_called_once()
+
+    def test_paginated_query_stream(self):
+        tickets = Tickets(token="")
+
+        def fake_iter_get(options):
+            skip = options.get("$skip", 0)
+            yield from self.data[skip : skip + options["$top"]]
+
+        with patch("pyvidesk.config.PAGE_SIZE", 2), patch.object(
+            tickets.api, "iter_get", side_effect=fake_iter_get
+        ) as iter_get, patch.object(tickets.api, "get") as get:
+            result = list(tickets.query.select("id").stream()[:3])
+
+        self.assertEqual([ticket.id for ticket in result], [1, 2, 3])
+        self.assertEqual(iter_get.call_count, 2)
+        self.assertEqual(iter_get.call_args.kwargs["options"]["$skip"], 2)
+        self.assertEqual(iter_get.call_args.kwargs["options"]["$top"], 1)
+        get.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
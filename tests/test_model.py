@@ -9,6 +9,7 @@ from pyvidesk.exceptions import (
     PyvideskSaveWithoutIdError,
 )
 from pyvidesk import Pyvidesk
+from pyvidesk.model import Model
 from tests.config import TOKEN
 
 
@@ -274,3 +275,138 @@ class TestModel(unittest.TestCase):
         service = self.pyvidesk.services.get_by_id(service_id)
         service.delete()
         self.assertRaises(PyvideskBadResponseError, _test_delete_service, service_id)
+
+
+class TestModelSlots(unittest.TestCase):
+    """Classe que testa as classes geradas (com __slots__) para cada entidade"""
+
+    tickets = Pyvidesk(token="").tickets
+    ticket_data = {
+        "id": 3,
+        "subject": "Assunto",
+        "createdDate": "2020-01-01T12:00:00",
+        "owner": {"id": "1", "businessName": "Murilo"},
+        "actions": [
+            {
+                "id": 1,
+                "description": "Descrição",
+                "timeAppointments": [{"id": 10, "date": "2020-01-01T00:00:00"}],
+            },
+            {"id": 2, "description": "Outra descrição", "timeAppointments": []},
+        ],
+        "protocol": "123",
+    }
+
+    def test_generated_class_is_cached(self):
+        ticket = Model(self.tickets, **self.ticket_data)
+        other_ticket = Model(Pyvidesk(token="").tickets, **self.ticket_data)
+        self.assertIs(type(ticket), type(other_ticket))
+        self.assertIsInstance(ticket, Model)
+        self.assertIs(type(ticket.actions[0]), type(other_ticket.actions[1]))
+
+    def test_model_has_no_instance_dict(self):
+        ticket = Model(self.tickets, **self.ticket_data)
+        self.assertFalse(hasattr(ticket, "__dict__"))
+        self.assertFalse(hasattr(ticket.actions[0], "__dict__"))
+
+    def test_get_property_values(self):
+        ticket = Model(self.tickets, **self.ticket_data)
+        self.assertEqual(ticket.subject, "Assunto")
+        self.assertEqual(ticket.createdDate, datetime(2020, 1, 1, 12))
+        self.assertEqual(ticket.owner.businessName, "Murilo")
+        self.assertIsNone(ticket.category)
+        self.assertEqual(
+            ticket.protocol, "Propriedade ainda não suportada por esta biblioteca."
+        )
+
+    def test_set_property_keeps_server_state(self):
+        ticket = Model(self.tickets, **self.ticket_data)
+        ticket.subject = "Novo assunto"
+        self.assertEqual(ticket.subject, "Novo assunto")
+        self.assertEqual(ticket._state["subject"], "Assunto")
+        self.assertDictEqual(ticket._get_changes(), {"subject": "Novo assunto"})
+
+    def test_set_property_back_to_server_value_is_not_a_change(self):
+        ticket = Model(self.tickets, **self.ticket_data)
+        ticket.subject = "Novo assunto"
+        ticket.subject = "Assunto"
+        self.assertDictEqual(ticket._get_changes(), {})
+
+    def test_serialize_change_nested_complex_property(self):
+        ticket = Model(self.tickets, **self.ticket_data)
+        today = date.today()
+        ticket.actions[0].timeAppointments[0].date = today
+        result = ticket._serialize_all_changes()
+        self.assertEqual(
+            result["actions"][0]["timeAppointments"][0]["date"],
+            ticket.get_properties()["createdDate"].serialize(today),
+        )
+        self.assertDictEqual(ticket._get_all_changes(), {})
+
+
+class TestModelChanges(unittest.TestCase):
+    """Classe que testa a serialização das mudanças para a requisição PATCH"""
+
+    tickets = Pyvidesk(token="").tickets
+    ticket_data = {
+        "id": 3,
+        "subject": "Assunto",
+        "actions": [
+            {
+                "id": 1,
+                "description": "Descrição",
+                "timeAppointments": [
+                    {"id": 10, "activity": "Teste", "workTypeName": "Normal"},
+                    {"id": 11, "activity": "Teste", "workTypeName": "Normal"},
+                ],
+            },
+            {"id": 2, "description": "Outra descrição", "timeAppointments": []},
+        ],
+        "customFieldValues": [
+            {"customFieldId": 1, "customFieldRuleId": 2, "line": 1, "value": "a"},
+            {"customFieldId": 3, "customFieldRuleId": 2, "line": 1, "value": "b"},
+        ],
+    }
+
+    def test_serialize_only_changed_children(self):
+        ticket = Model(self.tickets, **self.ticket_data)
+        ticket.actions[0].timeAppointments[1].workTypeName = "Extra"
+        result = ticket._serialize_all_changes()
+        expected = {
+            "actions": [
+                {"id": 1, "timeAppointments": [{"id": 11, "workTypeName": "Extra"}]}
+            ]
+        }
+        self.assertDictEqual(result, expected)
+
+    def test_serialize_changed_children_and_parent(self):
+        ticket = Model(self.tickets, **self.ticket_data)
+        ticket.actions[1].description = "Nova descrição"
+        ticket.actions[0].timeAppointments[0].activity = "Outra atividade"
+        result = ticket._serialize_all_changes()
+        expected = {
+            "actions": [
+                {
+                    "id": 1,
+                    "timeAppointments": [{"id": 10, "activity": "Outra atividade"}],
+                },
+                {"id": 2, "description": "Nova descrição"},
+            ]
+        }
+        self.assertDictEqual(result, expected)
+
+    def test_serialize_whole_list_without_id(self):
+        ticket = Model(self.tickets, **self.ticket_data)
+        ticket.customFieldValues[0].value = "c"
+        result = ticket._serialize_all_changes()
+        self.assertEqual(
+            [value["value"] for value in result["customFieldValues"]], ["c", "b"]
+        )
+
+    def test_changes_are_applied_after_serialization(self):
+        ticket = Model(self.tickets, **self.ticket_data)
+        ticket.actions[0].timeAppointments[1].workTypeName = "Extra"
+        ticket.customFieldValues[0].value = "c"
+        ticket._serialize_all_changes()
+        self.assertDictEqual(ticket._get_all_changes(), {})
+        self.assertEqual(ticket.actions[0].timeAppointments[1].workTypeName, "Extra")
@@ -0,0 +1,134 @@
+from datetime import date, datetime, timedelta
+import json
+import os
+import re
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pyvidesk.exceptions import (
+    PyvideskBadResponseError,
+    PyvideskCheckpointError,
+    PyvideskPartitionError,
+)
+from pyvidesk.partition import Checkpoint
+from pyvidesk.query import Q
+from pyvidesk.tickets import Tickets
+from pyvidesk.utils import get_url_length
+
+
+class TestPartition(unittest.TestCase):
+    """Classe que testa as consultas particionadas (partition.py)"""
+
+    def setUp(self):
+        self.tickets = Tickets(token="")
+        self.properties = self.tickets.get_properties()
+        self.partitioned_query = self.tickets.query.select("id").partition_by(
+            self.properties["createdDate"],
+            start=date(2020, 1, 1),
+            end=datetime(2020, 1, 20),
+            window=timedelta(days=7),
+        )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "checkpoint.json")
+
+    def _fake_get(self, options):
+        start = re.search(r"createdDate ge (\S+)", options["$filter"]).group(1)
+        return [{"id": int(start[8:10])}]
+
+    def test_windows_do_not_overlap(self):
+        windows = list(self.partitioned_query)
+        self.assertEqual(
+            [(window.start.day, window.end.day) for window in windows],
+            [(1, 8), (8, 15), (15, 20)],
+        )
+        self.assertEqual(
+            windows[1].query._get_options()["$filter"],
+            "createdDate ge 2020-01-08T00:00:00Z and createdDate lt 2020-01-15T00:00:00Z",
+        )
+
+    def test_scan_in_parallel(self):
+        with patch.object(self.tickets.api, "get", side_effect=self._fake_get):
+            result = list(self.partitioned_query.scan(max_workers=3))
+
+        self.assertEqual(sorted(models[0].id for _, models in result), [1, 8, 15])
+
+    def test_windows_split_long_urls(self):
+        ids_filter = Q(self.properties["id"] == 1)
+        for ticket_id in range(2, 101):
+            ids_filter |= Q(self.properties["id"] == ticket_id)
+        partitioned_query = (
+            self.tickets.query.select("subject")
+            .filter(ids_filter)
+            .max_url_length(500)
+            .partition_by(
+                self.properties["createdDate"],
+                start=date(2020, 1, 1),
+                end=date(2020, 1, 8),
+                window=timedelta(days=7),
+            )
+        )
+
+        def fake_get(options):
+            ids = re.findall(r"id eq (\d+)", options["$filter"])
+            return [{"id": int(ticket_id), "subject": "Teste"} for ticket_id in ids]
+
+        with patch.object(self.tickets.api, "get", side_effect=fake_get) as get:
+            ((_, models),) = list(partitioned_query.scan())
+
+        self.assertGreater(get.call_count, 1)
+        for call in get.call_args_list:
+            url = self.tickets.api._get_url(options=call.kwargs["options"])
+            self.assertLessEqual(get_url_length(url), 500)
+        self.assertEqual(len(models), 100)
+
+    def test_only_property_of_date(self):
+        with self.assertRaises(TypeError):
+            self.tickets.query.partition_by(
+                self.properties["id"], date(2020, 1, 1), date(2020, 2, 1)
+            )
+
+    def test_failed_window_is_retried_with_checkpoint(self):
+        def failing_get(options):
+            if "2020-01-08" in options["$filter"].split(" and ")[0]:
+                raise PyvideskBadResponseError("HTTP 500")
+            return self._fake_get(options)
+
+        with patch.object(self.tickets.api, "get", side_effect=failing_get):
+            scan = self.partitioned_query.scan(checkpoint=Checkpoint(self.path))
+            with self.assertRaises(PyvideskPartitionError) as context:
+                result = [models[0].id for _, models in scan]
+        self.assertEqual(len(context.exception.errors), 1)
+
+        with patch.object(self.tickets.api, "get", side_effect=self._fake_get) as get:
+            scan = self.partitioned_query.scan(checkpoint=Checkpoint(self.path))
+            result = [models[0].id for _, models in scan]
+
+        self.assertEqual(result, [8])
+        self.assertEqual(get.call_count, 1)
+
+    def test_checkpoint_of_another_query(self):
+        with patch.object(self.tickets.api, "get", side_effect=self._fake_get):
+            list(self.partitioned_query.scan(checkpoint=Checkpoint(self.path)))
+
+            # mesmas janelas, outra propriedade de data
+            partitioned_query = self.tickets.query.select("id").partition_by(
+                self.properties["lastUpdate"],
+                start=date(2020, 1, 1),
+                end=datetime(2020, 1, 20),
+                window=timedelta(days=7),
+            )
+            with self.assertRaisesRegex(PyvideskCheckpointError, "outra consulta"):
+                list(partitioned_query.scan(checkpoint=Checkpoint(self.path)))
+
+            # um arquivo antigo (apenas as chaves) ainda é aceito
+            with open(self.path, "w", encoding="utf-8") as file:
+                json.dump([window.key for window in self.partitioned_query], file)
+            self.assertEqual(
+                list(partitioned_query.scan(checkpoint=Checkpoint(self.path))), []
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import pyvidesk
+from pyvidesk.api import Api
+from pyvidesk.fake import FakeMovidesk
+from pyvidesk.model import Model
+from pyvidesk.properties import DatetimeProperty
+
+
+class TestProfile(unittest.TestCase):
+    """Classe que testa o perfil das consultas (profiling.py)"""
+
+    def setUp(self):
+        fake = FakeMovidesk(tickets=50, persons=0, services=0, max_items=2)
+        self.tickets = pyvidesk.Pyvidesk(token="x", transport=fake).tickets
+
+    def test_profile(self):
+        with pyvidesk.profile() as profile:
+            tickets = self.tickets.query.expand("actions").top(20).all()
+            records = list(self.tickets.query.top(5).records())
+
+        nested = sum(len(ticket.actions or []) for ticket in tickets)
+        self.assertEqual(profile.requests, 2)
+        self.assertEqual(profile.models, {"Tickets": 20})
+        self.assertEqual(profile.nested_models.get("action", 0), nested)
+        self.assertEqual(profile.records, {"Tickets": len(records)})
+        for phase in ("network", "decode", "deserialize", "model"):
+            self.assertGreater(profile.times[phase], 0, phase)
+        self.assertAlmostEqual(sum(profile.times.values()), profile.wall_time, places=6)
+        self.assertIsNone(profile.as_dict()["allocations"])
+
+        report = profile.report()
+        self.assertIn("desserialização", report)
+        self.assertIn("modelos: Tickets=20", report)
+
+    def test_memory(self):
+        with pyvidesk.profile(memory=True) as profile:
+            self.tickets.query.top(10).all()
+        self.assertGreater(profile.allocations["decode"], 0)
+        self.assertIn("líquido (KiB)", profile.report())
+
+    def test_restores_functions(self):
+        originals = (
+            Api._request,
+            Api.get,
+            Model.__init__,
+            DatetimeProperty.deserialize,
+        )
+        with self.assertRaises(ValueError):
+            with pyvidesk.profile():
+                with self.assertRaises(RuntimeError):
+                    with pyvidesk.profile():
+                        pass
+                raise ValueError
+        self.assertEqual(
+            (Api._request, Api.get, Model.__init__, DatetimeProperty.deserialize),
+            originals,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
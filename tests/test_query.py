@@ -1,8 +1,14 @@
 from datetime import date
+import re
 import unittest
+from unittest.mock import patch
 
+from pyvidesk import Pyvidesk
+from pyvidesk.exceptions import PyvideskBadResponseError
+from pyvidesk.fake import FakeMovidesk
 from pyvidesk.tickets import Tickets
 from pyvidesk.query import Q
+from pyvidesk.utils import get_url_length
 from tests.config import TOKEN
 
 
@@ -310,3 +316,267 @@ class TestQuery(unittest.TestCase):
             select=self.properties["actions"].id,
         ).as_url()
         self.assertEqual(result, expected)
+
+    def test_builder_does_not_change_original_query(self):
+        query = self.tickets.query.select("id")
+        query.select("subject").filter(self.properties["id"] == 1).top(5)
+        expected = self.tickets.api.base_url + "&$select=id"
+        self.assertEqual(query.as_url(), expected)
+
+    def test_builder_shares_options(self):
+        query = self.tickets.query.select("id").expand(self.properties["clients"])
+        new_query = query.top(5)
+        self.assertIs(new_query.options["$select"], query.options["$select"])
+        self.assertIs(new_query.options["$expand"], query.options["$expand"])
+
+    def test_settings_are_not_options(self):
+        query = self.tickets.query.select("id").stream().deadline(5).max_url_length(100)
+        new_query = query.filter(self.properties["id"] == 1).top(5)
+        self.assertEqual(set(new_query.options), {"$select", "$filter", "$top"})
+        self.assertEqual(
+            new_query._settings, {"stream": True, "deadline": 5, "max_url_length": 100}
+        )
+        self.assertEqual(query.stream(False)._settings["stream"], False)
+        self.assertTrue(query._settings["stream"])
+
+    def test_first_does_not_change_query(self):
+        query = self.tickets.query.select("id").top(10)
+        with patch.object(self.tickets.api, "get", return_value=[{"id": 1}]) as get:
+            query.first()
+        self.assertEqual(get.call_args.kwargs["options"]["$top"], 1)
+        self.assertEqual(query.options["$top"], 10)
+
+    def test_as_url_is_memoized(self):
+        query = self.tickets.query.select("id")
+        self.assertIs(query.as_url(), query.as_url())
+
+    def _get_ids_filter(self, ids):
+        ids_filter = Q(self.properties["id"] == ids[0])
+        for ticket_id in ids[1:]:
+            ids_filter |= Q(self.properties["id"] == ticket_id)
+        return ids_filter
+
+    def _fake_get(self, options):
+        ids = [int(value) for value in re.findall(r"id eq (\d+)", options["$filter"])]
+        return [{"id": ticket_id} for ticket_id in ids]
+
+    def test_long_url_is_split(self):
+        query = self.tickets.query.select("id").filter(
+            self._get_ids_filter(list(range(1, 301)))
+        )
+        with patch.object(self.tickets.api, "get", side_effect=self._fake_get) as get:
+            result = query.all()
+
+        self.assertGreater(get.call_count, 1)
+        self.assertEqual([ticket.id for ticket in result], list(range(1, 301)))
+        for call in get.call_args_list:
+            url = self.tickets.api._get_url(options=call.kwargs["options"])
+            self.assertLessEqual(get_url_length(url), 2000)
+
+    def test_split_keeps_other_filters_and_removes_duplicates(self):
+        query = (
+            self.tickets.query.select("id")
+            .filter(self.properties["subject"] == "Teste")
+            .filter(self._get_ids_filter(list(range(1, 101))))
+            .max_url_length(500, max_workers=4)
+        )
+        responses = []
+
+        def fake_get(options):
+            responses.append(options["$filter"])
+            return self._fake_get(options) + [{"id": 1}]
+
+        with patch.object(self.tickets.api, "get", side_effect=fake_get):
+            result = query.all()
+
+        self.assertEqual([ticket.id for ticket in result], list(range(1, 101)))
+        self.assertTrue(all(f.startswith("subject eq 'Teste' and") for f in responses))
+
+    def test_split_without_id_in_select(self):
+        tickets = Pyvidesk(
+            token="x", transport=FakeMovidesk(tickets=300, persons=0, services=0)
+        ).tickets
+        properties = tickets.get_properties()
+        # as cláusulas se sobrepõem: os IDs 1 a 60 correspondem a duas delas
+        ids_filter = Q(properties["id"] < 200)
+        for ticket_id in range(1, 61):
+            ids_filter |= Q(properties["id"] == ticket_id)
+        query = tickets.query.select("subject").filter(ids_filter)
+
+        with patch.object(tickets.api, "get", side_effect=tickets.api.get) as get:
+            split = query.max_url_length(600).all()
+        self.assertGreater(get.call_count, 1)
+        whole = query.max_url_length(None).all()
+        self.assertEqual(len(whole), 199)
+        self.assertEqual(len(split), len(whole))
+        self.assertEqual(
+            sorted(str(ticket.subject) for ticket in split),
+            sorted(str(ticket.subject) for ticket in whole),
+        )
+        self.assertTrue(all("id" not in ticket._state for ticket in split))
+
+    def test_split_respects_top(self):
+        query = self.tickets.query.filter(
+            self._get_ids_filter(list(range(1, 101)))
+        ).max_url_length(500)
+        with patch.object(self.tickets.api, "get", side_effect=self._fake_get):
+            self.assertEqual(len(query.top(10).all()), 10)
+
+    def test_no_split_with_skip_or_order_by(self):
+        query = self.tickets.query.filter(
+            self._get_ids_filter(list(range(1, 101)))
+        ).max_url_length(500)
+        for new_query in (query.skip(10), query.order_by("id")):
+            with patch.object(self.tickets.api, "get", return_value=[]) as get:
+                new_query.all()
+            self.assertEqual(get.call_count, 1)
+
+    def test_no_split_when_disabled(self):
+        query = self.tickets.query.filter(
+            self._get_ids_filter(list(range(1, 301)))
+        ).max_url_length(None)
+        with patch.object(self.tickets.api, "get", return_value=[]) as get:
+            query.all()
+        self.assertEqual(get.call_count, 1)
+
+    def test_count_with_odata_count(self):
+        query = self.tickets.query.filter(self.properties["id"] > 1).expand("clients")
+        with patch.object(self.tickets.api, "supports_count", True), patch.object(
+            self.tickets.api, "get", return_value={"@odata.count": 42, "value": []}
+        ) as get:
+            self.assertEqual(query.count(), 42)
+            self.assertEqual(query.skip(40).count(), 2)
+            self.assertEqual(query.top(10).count(), 10)
+
+        options = get.call_args_list[0].kwargs["options"]
+        self.assertEqual(options["$count"], "true")
+        self.assertEqual(options["$select"], "id")
+        self.assertEqual(options["$filter"], "id gt 1")
+        self.assertNotIn("$expand", options)
+
+    def test_count_paging_ids(self):
+        pages = [[{"id": i} for i in range(1000)], [{"id": i} for i in range(500)]]
+        with patch.object(self.tickets.api, "supports_count", True), patch.object(
+            self.tickets.api, "get", side_effect=pages
+        ) as get:
+            self.assertEqual(self.tickets.query.count(), 1500)
+            self.assertFalse(self.tickets.api.supports_count)
+        self.assertTrue(Tickets(token="").api.supports_count)
+
+        self.assertEqual(get.call_args_list[1].kwargs["options"]["$skip"], 1000)
+        self.assertNotIn("$count", get.call_args_list[1].kwargs["options"])
+
+    @patch.object(tickets.api, "supports_count", True)
+    def test_count_errors(self):
+        unavailable = PyvideskBadResponseError("HTTP 503", status_code=503)
+        with patch.object(self.tickets.api, "get", side_effect=unavailable):
+            with self.assertRaises(PyvideskBadResponseError):
+                self.tickets.query.count()
+        self.assertTrue(self.tickets.api.supports_count)
+
+        invalid = PyvideskBadResponseError("HTTP 400", status_code=400)
+        with patch.object(
+            self.tickets.api, "get", side_effect=[invalid, [{"id": 1}]]
+        ) as get:
+            self.assertEqual(self.tickets.query.count(), 1)
+        self.assertFalse(self.tickets.api.supports_count)
+        self.assertNotIn("$count", get.call_args.kwargs["options"])
+
+    def test_exists(self):
+        query = self.tickets.query.filter(self.properties["id"] > 1)
+        with patch.object(self.tickets.api, "get", return_value=[{"id": 2}]) as get:
+            self.assertTrue(query.exists())
+        self.assertEqual(
+            get.call_args.kwargs["options"],
+            {"$top": 1, "$select": "id", "$filter": "id gt 1"},
+        )
+        with patch.object(self.tickets.api, "get", return_value=[]):
+            self.assertFalse(query.exists())
+
+    def test_slice_is_lazy(self):
+        with patch.object(self.tickets.api, "get") as get:
+            query = self.tickets.query.select("id")[1000:1500]
+        get.assert_not_called()
+        self.assertEqual(query.options["$skip"], 1000)
+        self.assertEqual(query.options["$top"], 500)
+
+    def test_slice_of_slice(self):
+        query = self.tickets.query[100:200][10:500]
+        self.assertEqual(query.options["$skip"], 110)
+        self.assertEqual(query.options["$top"], 90)
+
+    def test_empty_slice_does_not_request(self):
+        query = self.tickets.query.select("id").top(3)
+        with patch.object(self.tickets.api, "get") as get:
+            self.assertEqual(query[5:10].all(), [])
+            self.assertEqual(list(query[5:10].iter_pages()), [])
+            with self.assertRaises(IndexError):
+                query[5]
+        get.assert_not_called()
+
+    def test_slice_not_supported(self):
+        with self.assertRaises(ValueError):
+            self.tickets.query[::2]
+        with self.assertRaises(ValueError):
+            self.tickets.query[-5:]
+
+    def test_index(self):
+        with patch.object(self.tickets.api, "get", return_value=[{"id": 6}]) as get:
+            ticket = self.tickets.query.select("id")[5]
+        self.assertEqual(ticket.id, 6)
+        self.assertEqual(get.call_args.kwargs["options"]["$skip"], 5)
+        self.assertEqual(get.call_args.kwargs["options"]["$top"], 1)
+
+        with patch.object(self.tickets.api, "get", return_value=[]):
+            with self.assertRaises(IndexError):
+                self.tickets.query.select("id")[5]
+
+    def test_large_slice_is_paginated(self):
+        def fake_get(options):
+            start = options["$skip"]
+            return [{"id": i} for i in range(start, start + options["$top"])]
+
+        with patch.object(self.tickets.api, "get", side_effect=fake_get) as get:
+            result = self.tickets.query.select("id")[500:3000].all()
+
+        self.assertEqual([ticket.id for ticket in result], list(range(500, 3000)))
+        self.assertEqual(
+            [call.kwargs["options"]["$top"] for call in get.call_args_list],
+            [1000, 1000, 500],
+        )
+
+    def test_iter_pages(self):
+        pages = [[{"id": 1}, {"id": 2}], [{"id": 3}, {"id": 4}], [{"id": 5}]]
+        with patch.object(self.tickets.api, "get", side_effect=pages) as get:
+            result = list(self.tickets.query.select("id").iter_pages(page_size=2))
+
+        self.assertEqual(
+            [[ticket.id for ticket in page] for page in result], [[1, 2], [3, 4], [5]]
+        )
+        self.assertEqual(
+            [call.kwargs["options"]["$skip"] for call in get.call_args_list], [0, 2, 4]
+        )
+
+    def test_iter_pages_with_prefetch(self):
+        def fake_get(options):
+            start = options["$skip"]
+            return [{"id": i} for i in range(start, min(start + options["$top"], 25))]
+
+        with patch.object(self.tickets.api, "get", side_effect=fake_get):
+            result = list(self.tickets.query.select("id").iter_pages(10, prefetch=2))
+
+        self.assertEqual(
+            [[ticket.id for ticket in page] for page in result],
+            [list(range(0, 10)), list(range(10, 20)), list(range(20, 25))],
+        )
+
+    def test_iter_pages_with_prefetch_raises_errors(self):
+        with patch.object(
+            self.tickets.api,
+            "get",
+            side_effect=[[{"id": 1}, {"id": 2}], PyvideskBadResponseError("HTTP 500")],
+        ):
+            pages = self.tickets.query.select("id").iter_pages(2, prefetch=1)
+            self.assertEqual(len(next(pages)), 2)
+            with self.assertRaises(PyvideskBadResponseError):
+                next(pages)
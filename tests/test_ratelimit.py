@@ -0,0 +1,129 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
+import pickle
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from pyvidesk import Pyvidesk
+from pyvidesk.circuit import CircuitBreaker
+from pyvidesk.exceptions import (
+    PyvideskBadResponseError,
+    PyvideskCircuitOpenError,
+    PyvideskDeadlineError,
+    PyvideskRateLimitError,
+)
+from pyvidesk.fake import FakeMovidesk
+from pyvidesk.ratelimit import RateLimiter, SQLiteRateLimiter
+
+
+def _acquire_many(limiter, token, count):
+    """Funcao executada em outro processo: os horários (time.time()) de cada vaga"""
+    times = []
+    for _ in range(count):
+        limiter.acquire(token)
+        times.append(time.time())
+    return times
+
+
+class TestRateLimit(unittest.TestCase):
+    """Classe que testa os limitadores de requisições (ratelimit.py)"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "limits.sqlite")
+
+    def assertWithinLimit(self, times, requests, period):
+        times = sorted(times)
+        for first, last in zip(times, times[requests:]):
+            self.assertGreaterEqual(last - first, period - 0.05)
+
+    def test_threads(self):
+        limiter = RateLimiter(requests=2, period=0.2)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(_acquire_many, limiter, "my_token", 2) for _ in range(3)
+            ]
+            times = [t for future in futures for t in future.result()]
+        self.assertWithinLimit(times, 2, 0.2)
+
+        # outro token tem a sua própria cota
+        self.assertEqual(limiter.acquire("other_token"), 0.0)
+        with self.assertRaises(ValueError):
+            RateLimiter(requests=0)
+
+    def test_deadline(self):
+        limiter = RateLimiter(requests=1, period=10.0)
+        self.assertEqual(limiter.acquire("my_token"), 0.0)
+        start = time.monotonic()
+        self.assertIsNone(limiter.acquire("my_token", deadline=start + 0.1))
+        self.assertLess(time.monotonic() - start, 0.1)
+
+        limiter.reset("my_token")
+        self.assertEqual(limiter.acquire("my_token", deadline=start + 0.1), 0.0)
+
+    def test_processes(self):
+        limiter = SQLiteRateLimiter(self.path, requests=3, period=0.3)
+        with ProcessPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(_acquire_many, limiter, "my_token", 3) for _ in range(3)
+            ]
+            times = [t for future in futures for t in future.result()]
+        self.assertEqual(len(times), 9)
+        self.assertWithinLimit(times, 3, 0.3)
+
+        with open(self.path, "rb") as file:
+            self.assertNotIn(b"my_token", file.read())
+
+        copy = pickle.loads(pickle.dumps(limiter))
+        self.assertEqual((copy.path, copy.requests), (self.path, 3))
+        copy.reset()
+        self.assertEqual(copy.acquire("my_token"), 0.0)
+
+    def test_requests(self):
+        fake = FakeMovidesk(tickets=10, persons=0, services=0, rate_limit=(2, 0.3))
+        limiter = SQLiteRateLimiter(self.path, requests=2, period=0.35)
+        pyvidesk = Pyvidesk(token="x", transport=fake, rate_limiter=limiter)
+        for ticket_id in range(1, 6):  # sem o limitador, a 3ª requisição recebe 429
+            self.assertEqual(pyvidesk.tickets.get_by_id(ticket_id).id, ticket_id)
+
+        limiter = RateLimiter(requests=1, period=10.0)
+        tickets = Pyvidesk(token="x", transport=fake, rate_limiter=limiter).tickets
+        tickets.query.top(1).all()
+        with self.assertRaises(PyvideskDeadlineError):
+            tickets.query.top(1).deadline(0.1).all()
+
+    def test_locked_file(self):
+        limiter = SQLiteRateLimiter(self.path, requests=2, period=1.0, timeout=0.05)
+        limiter.reset()  # cria o arquivo
+        other = sqlite3.connect(self.path, isolation_level=None)
+        self.addCleanup(other.close)
+        other.execute("BEGIN IMMEDIATE")  # outro processo reservando uma vaga
+        with self.assertRaises(PyvideskRateLimitError):
+            limiter.acquire("my_token")
+        other.execute("ROLLBACK")
+        self.assertEqual(limiter.acquire("my_token"), 0.0)
+
+    def test_open_circuit_does_not_use_the_quota(self):
+        fake = FakeMovidesk(tickets=5, persons=0, services=0, error_rate=1.0)
+        breaker = CircuitBreaker(min_requests=1, open_timeout=60.0)
+        limiter = RateLimiter(requests=1, period=0.2)
+        tickets = Pyvidesk(
+            token="x", transport=fake, circuit_breaker=breaker, rate_limiter=limiter
+        ).tickets
+        with self.assertRaises(PyvideskBadResponseError):
+            tickets.get_by_id(1)
+
+        time.sleep(0.2)
+        start = time.monotonic()
+        for _ in range(3):
+            with self.assertRaises(PyvideskCircuitOpenError):
+                tickets.get_by_id(1)
+        self.assertLess(time.monotonic() - start, 0.1)  # sem esperar a cota
+        self.assertEqual(limiter.acquire("x"), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
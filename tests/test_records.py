@@ -0,0 +1,62 @@
+from datetime import datetime
+import unittest
+from unittest.mock import patch
+
+from pyvidesk.records import create_record, get_record_class
+from pyvidesk.tickets import Tickets
+
+
+class TestRecords(unittest.TestCase):
+    """Classe que testa os registros imutáveis de records.py"""
+
+    tickets = Tickets(token="")
+    ticket_data = {
+        "id": 3,
+        "subject": "Assunto",
+        "createdDate": "2020-01-01T12:00:00",
+        "tags": ["tag1", "tag2"],
+        "owner": {"id": "1", "businessName": "Murilo"},
+        "actions": [
+            {"id": 1, "timeAppointments": [{"id": 10, "activity": "Teste"}]},
+            {"id": 2, "timeAppointments": []},
+        ],
+        "protocol": "123",
+    }
+
+    def test_record_values(self):
+        record = create_record(self.tickets, self.ticket_data)
+        self.assertEqual(record.id, 3)
+        self.assertEqual(record.subject, "Assunto")
+        self.assertEqual(record.createdDate, datetime(2020, 1, 1, 12))
+        self.assertEqual(record.tags, ("tag1", "tag2"))
+        self.assertEqual(record.owner.businessName, "Murilo")
+        self.assertIsNone(record.category)
+
+    def test_nested_lists_are_tuples_of_records(self):
+        record = create_record(self.tickets, self.ticket_data)
+        self.assertIsInstance(record.actions, tuple)
+        self.assertEqual(record.actions[0].timeAppointments[0].activity, "Teste")
+        self.assertEqual(record.actions[1].timeAppointments, ())
+
+    def test_record_is_immutable(self):
+        record = create_record(self.tickets, self.ticket_data)
+        with self.assertRaises(AttributeError):
+            record.subject = "Novo assunto"
+
+    def test_unsupported_properties_are_discarded(self):
+        record = create_record(self.tickets, self.ticket_data)
+        self.assertFalse(hasattr(record, "protocol"))
+
+    def test_record_class_is_cached(self):
+        self.assertIs(
+            get_record_class(self.tickets)[0],
+            get_record_class(Tickets(token=""))[0],
+        )
+
+    def test_query_records(self):
+        with patch.object(
+            self.tickets.api, "get", return_value=[self.ticket_data, {"id": 4}]
+        ):
+            records = list(self.tickets.query.records())
+
+        self.assertEqual([record.id for record in records], [3, 4])
@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import patch
+
+from pyvidesk import Pyvidesk
+from pyvidesk.session import Session
+
+
+class TestSession(unittest.TestCase):
+    """Classe que testa a classe Session"""
+
+    def setUp(self):
+        self.pyvidesk = Pyvidesk(token="", session=Session())
+        self.persons = self.pyvidesk.persons
+
+    def test_same_instance_for_same_id(self):
+        with patch.object(
+            self.persons.api,
+            "get",
+            side_effect=[
+                {"id": "1", "businessName": "Murilo"},
+                [{"id": "1", "isActive": True}, {"id": "2", "isActive": True}],
+            ],
+        ):
+            person = self.persons.get_by_id("1", select="businessName")
+            people = self.persons.get_by_isActive(True, select="isActive").all()
+
+        self.assertIs(person, people[0])
+        self.assertEqual(person.businessName, "Murilo")
+        self.assertTrue(person.isActive)
+        self.assertEqual(len(self.pyvidesk.session), 2)
+
+    def test_lookup_without_request(self):
+        with patch.object(
+            self.persons.api, "get", return_value={"id": "1", "businessName": "Murilo"}
+        ) as mock_get:
+            person = self.persons.get_by_id("1", select=("id", "businessName"))
+            same_person = self.pyvidesk.persons.get_by_id("1", select="businessName")
+
+        self.assertIs(person, same_person)
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_lookup_with_missing_property_requests_again(self):
+        with patch.object(
+            self.persons.api,
+            "get",
+            side_effect=[
+                {"id": "1", "businessName": "Murilo"},
+                {"id": "1", "userName": "murilo"},
+            ],
+        ) as mock_get:
+            person = self.persons.get_by_id("1", select="businessName")
+            same_person = self.persons.get_by_id("1", select="userName")
+
+        self.assertIs(person, same_person)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(person.businessName, "Murilo")
+        self.assertEqual(person.userName, "murilo")
+
+    def test_expired_model_requests_again(self):
+        with patch.object(
+            self.persons.api,
+            "get",
+            side_effect=[
+                {"id": "1", "businessName": "Murilo"},
+                {"id": "1", "businessName": "Murilo Scarpa"},
+            ],
+        ) as mock_get:
+            person = self.persons.get_by_id("1", select="businessName")
+            self.pyvidesk.session.expire(person)
+            self.persons.get_by_id("1", select="businessName")
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(person.businessName, "Murilo Scarpa")
+
+    def test_without_session_returns_new_instances(self):
+        persons = Pyvidesk(token="").persons
+        with patch.object(
+            persons.api, "get", return_value={"id": "1", "businessName": "Murilo"}
+        ):
+            person = persons.get_by_id("1", select="businessName")
+            same_person = persons.get_by_id("1", select="businessName")
+
+        self.assertIsNot(person, same_person)